@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import sys
+import json
+import timeit
+import base64
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from smartshooter import codec
+from smartshooter.msgbuilder import MSGBuilder
+from smartshooter.selection import CameraSelection
+from smartshooter.enums import Property
+
+def make_camera(index):
+    camera = {}
+    camera["CameraKey"] = "camera-{:04d}".format(index)
+    camera["CameraStatus"] = "Ready"
+    camera["CameraName"] = "Camera {}".format(index)
+    camera["CameraGroup"] = "Group {}".format(index % 8)
+    camera["CameraSerialNumber"] = "{:012d}".format(index)
+    camera["CameraMake"] = "Canon"
+    camera["CameraModel"] = "EOS 2000D"
+    camera["CameraLiveviewIsEnabled"] = False
+    camera["CameraLiveviewNumFrames"] = 0
+    camera["CameraBatterylevel"] = 100
+    camera["CameraPropertyInfo"] = [
+        {"CameraPropertyType": prop.name,
+         "CameraPropertyValue": "1",
+         "CameraPropertyIsWriteable": True,
+         "CameraPropertyRange": [str(i) for i in range(20)]}
+        for prop in Property
+    ]
+    return camera
+
+def make_photo(index):
+    photo = {}
+    photo["PhotoKey"] = "photo-{:08d}".format(index)
+    photo["PhotoLocation"] = "Local Disk"
+    photo["PhotoFilename"] = "C:\\Photos\\IMG_{:06d}.JPG".format(index)
+    photo["PhotoOrigin"] = "api"
+    photo["PhotoFormat"] = "JPEG"
+    photo["PhotoWidth"] = 6000
+    photo["PhotoHeight"] = 4000
+    photo["PhotoFilesize"] = 8000000
+    photo["CameraKey"] = "camera-{:04d}".format(index % 120)
+    return photo
+
+def make_messages(num_cameras, num_photos, liveview_size):
+    camera_updated = make_camera(0)
+    camera_updated["msg_type"] = "Event"
+    camera_updated["msg_id"] = "CameraUpdated"
+    camera_updated["msg_seq_num"] = 1
+    liveview_updated = {}
+    liveview_updated["msg_type"] = "Event"
+    liveview_updated["msg_id"] = "LiveviewUpdated"
+    liveview_updated["msg_seq_num"] = 2
+    liveview_updated["CameraKey"] = "camera-0000"
+    liveview_updated["CameraLiveviewImage"] = base64.b64encode(os.urandom(liveview_size)).decode("ascii")
+    synchronise = {}
+    synchronise["msg_type"] = "Response"
+    synchronise["msg_id"] = "Synchronise"
+    synchronise["msg_seq_num"] = 3
+    synchronise["msg_result"] = True
+    synchronise["CameraInfo"] = [make_camera(i) for i in range(num_cameras)]
+    synchronise["PhotoInfo"] = [make_photo(i) for i in range(num_photos)]
+    messages = {}
+    messages["CameraUpdated"] = json.dumps(camera_updated).encode("utf-8")
+    messages["LiveviewUpdated"] = json.dumps(liveview_updated).encode("utf-8")
+    messages["Synchronise"] = json.dumps(synchronise).encode("utf-8")
+    return messages
+
+def measure(func, repeat):
+    number = max(1, repeat)
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+def main():
+    parser = argparse.ArgumentParser("bench_codec.py")
+    parser.add_argument("--cameras", type=int, default=120,
+                        help="number of cameras in the Synchronise reply")
+    parser.add_argument("--photos", type=int, default=2000,
+                        help="number of photos in the Synchronise reply")
+    parser.add_argument("--liveview-size", type=int, default=200000,
+                        help="size in bytes of the liveview JPEG")
+    args = parser.parse_args()
+
+    messages = make_messages(args.cameras, args.photos, args.liveview_size)
+    selection = CameraSelection()
+    builder = MSGBuilder()
+
+    print("{:<16} {:>10} {:>14} {:>14}".format("message", "bytes", "codec", "usec/msg"))
+    for msg_id, raw in messages.items():
+        repeat = max(1, 2000000 // len(raw))
+        before = measure(lambda: json.loads(raw.decode("utf-8")), repeat)
+        print("{:<16} {:>10} {:>14} {:>14.1f}".format(msg_id, len(raw), "before", before * 1e6))
+        for name in codec.get_codec_names():
+            codec.use_codec(name)
+            after = measure(lambda: codec.loads(raw), repeat)
+            print("{:<16} {:>10} {:>14} {:>14.1f}".format("", "", name, after * 1e6))
+
+    codec.use_codec("json")
+    before = measure(lambda: builder.build_SetProperty(selection, Property.ISO, "100"), 20000)
+    print("{:<16} {:>10} {:>14} {:>14.1f}".format("SetProperty", "", "before", before * 1e6))
+    for name in codec.get_codec_names():
+        codec.use_codec(name)
+        after = measure(lambda: builder.build_SetProperty(selection, Property.ISO, "100"), 20000)
+        print("{:<16} {:>10} {:>14} {:>14.1f}".format("", "", name, after * 1e6))
+    codec.use_codec()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import sys
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from smartshooter import Context
+from smartshooter.enums import Property
+from smartshooter.simulator import Simulator
+
+def percentile(values, q):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[index]
+
+def report(name, latencies, elapsed):
+    print("{:<14} {:>8} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f}".format(
+        name, len(latencies), len(latencies) / elapsed,
+        percentile(latencies, 0.5) * 1e3, percentile(latencies, 0.9) * 1e3,
+        percentile(latencies, 0.99) * 1e3, max(latencies) * 1e3))
+
+def run(name, func, count):
+    latencies = []
+    start = time.perf_counter()
+    for i in range(count):
+        before = time.perf_counter()
+        func(i)
+        latencies.append(time.perf_counter() - before)
+    report(name, latencies, time.perf_counter() - start)
+
+def bench_events(context, simulator, count):
+    # time from asking for a burst until the last event has been processed
+    received = threading.Event()
+    num_received = [0]
+    def on_event(event):
+        num_received[0] += 1
+        if num_received[0] == count:
+            received.set()
+    context.add_event_handler("CameraUpdated", on_event)
+    start = time.perf_counter()
+    simulator.publish_events(count)
+    received.wait(30)
+    elapsed = time.perf_counter() - start
+    context.remove_event_handler("CameraUpdated", on_event)
+    print("{:<14} {:>8} {:>10.1f} {:>10} {:>10} {:>10} {:>10}".format(
+        "events", num_received[0], num_received[0] / elapsed, "-", "-", "-", "-"))
+
+def main():
+    parser = argparse.ArgumentParser("bench_context.py")
+    parser.add_argument("--cameras", type=int, default=120,
+                        help="number of simulated cameras")
+    parser.add_argument("--photos", type=int, default=2000,
+                        help="number of photos known to the simulator")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="simulated reply latency in seconds")
+    parser.add_argument("--count", type=int, default=200,
+                        help="number of requests for each benchmark")
+    parser.add_argument("--events", type=int, default=20000,
+                        help="number of events for the event ingestion benchmark")
+    parser.add_argument("--port", type=int, default=54543,
+                        help="publisher port, request port is the next one")
+    args = parser.parse_args()
+
+    publisher = "tcp://127.0.0.1:{}".format(args.port)
+    reqrep = "tcp://127.0.0.1:{}".format(args.port + 1)
+    simulator = Simulator(reqrep, publisher, args.cameras, latency=args.latency,
+                          capture_time=0, download_time=0, liveview_fps=0,
+                          num_photos=args.photos)
+    simulator.start()
+    context = Context(event_thread=True, reqrep=reqrep, publisher=publisher)
+    try:
+        print("{:<14} {:>8} {:>10} {:>10} {:>10} {:>10} {:>10}".format(
+            "benchmark", "count", "per sec", "p50 ms", "p90 ms", "p99 ms", "max ms"))
+        run("synchronise", lambda i: context.synchronise(), max(1, args.count // 10))
+        run("delta sync", lambda i: context.synchronise(delta=True), max(1, args.count // 10))
+        values = ["100", "200", "400", "800"]
+        context.select_all_cameras()
+        run("set_property", lambda i: context.set_property(Property.ISO, values[i % len(values)]), args.count)
+        context.select_camera(simulator.get_camera_keys()[0])
+        run("shoot", lambda i: context.shoot(), args.count)
+        bench_events(context, simulator, args.events)
+    finally:
+        context.close()
+        simulator.stop()
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,16 @@
 from .context import Context
+from .context import is_embedded
 from .enums import Property
 from .enums import ShutterButton
+from .metrics import Metrics
+from .selection import CameraSelection
+from .selection import PhotoSelection
+from .transfer import TransferManager
+from .validation import ValidationError
+
+if not is_embedded():
+    from .asynccontext import AsyncContext
+    from .pool import ContextPool
+    from .cluster import ClusterContext
+    from .timesync import ShootScheduler
+    from .discovery import Discovery
@@ -0,0 +1,356 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import asyncio
+import logging
+import zmq
+import zmq.asyncio
+from . import codec
+from . import messages
+from .msgbuilder import MSGBuilder
+from .statetracker import StateTracker
+from .selection import CameraSelection
+from .selection import PhotoSelection
+
+logger = logging.getLogger(__name__)
+
+class AsyncContext:
+    def __init__(self, reqrep="tcp://127.0.0.1:54544", publisher="tcp://127.0.0.1:54543",
+                 max_photos=None, max_photo_age=None, validate=False):
+        self.__msgbuilder = MSGBuilder(validate=validate)
+        self.__tracker = StateTracker(max_photos, max_photo_age)
+        self.__camera_selection = CameraSelection()
+        self.__photo_selection = PhotoSelection()
+        self.__ctx = zmq.asyncio.Context()
+        self.__req_socket = self.__ctx.socket(zmq.DEALER)
+        self.__sub_socket = self.__ctx.socket(zmq.SUB)
+        self.__sub_socket.setsockopt(zmq.SUBSCRIBE, b"")
+        self.__req_socket.connect(reqrep)
+        self.__sub_socket.connect(publisher)
+        self.__event_handlers = dict()
+        self.__event_ids = frozenset(self.__tracker.get_event_ids())
+        self.__pending = dict()
+        self.__reply_error = None
+        self.__reply_task = None
+        self.__event_task = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def start(self):
+        self.__reply_task = asyncio.ensure_future(self.__read_replies())
+        self.__event_task = asyncio.ensure_future(self.__read_events())
+        await self.synchronise()
+
+    async def close(self):
+        for task in [self.__reply_task, self.__event_task]:
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.__reply_task = None
+        self.__event_task = None
+        self.__cancel_pending()
+        self.__req_socket.close(linger=0)
+        self.__sub_socket.close(linger=0)
+        self.__ctx.term()
+
+    def __cancel_pending(self):
+        for future in self.__pending.values():
+            if not future.done():
+                future.cancel()
+        self.__pending.clear()
+
+    async def __transact(self, msg):
+        # REP echoes msg_seq_num back, so it is used to match the reply to
+        # this request while other requests are still in flight
+        if self.__reply_error is not None:
+            raise RuntimeError("reply reader stopped") from self.__reply_error
+        seq_num = self.__msgbuilder.get_last_seq_num()
+        future = asyncio.get_running_loop().create_future()
+        self.__pending[seq_num] = future
+        try:
+            await self.__req_socket.send_multipart([b"", msg.encode("utf-8")])
+            return await future
+        finally:
+            self.__pending.pop(seq_num, None)
+
+    def __pop_oldest(self):
+        # replies arrive in request order, so one that can't be matched by
+        # sequence number belongs to the oldest pending request
+        if not self.__pending:
+            return None
+        return self.__pending.pop(next(iter(self.__pending)))
+
+    async def __read_replies(self):
+        try:
+            while True:
+                frames = await self.__req_socket.recv_multipart()
+                # a bad reply fails its own request, and the rest carry on
+                try:
+                    reply = codec.loads(frames[-1])
+                except Exception as e:
+                    logger.exception("Malformed reply")
+                    future = self.__pop_oldest()
+                    if future is not None and not future.done():
+                        future.set_exception(e)
+                    continue
+                if "msg_seq_num" in reply:
+                    future = self.__pending.pop(reply["msg_seq_num"], None)
+                else:
+                    future = self.__pop_oldest()
+                try:
+                    self.__tracker.process_reply(reply)
+                except Exception as e:
+                    logger.exception("Error processing reply")
+                    if future is not None and not future.done():
+                        future.set_exception(e)
+                    continue
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # the socket itself failed, so no more replies will come
+            self.__reply_error = e
+            for future in self.__pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            self.__pending.clear()
+            raise
+
+    async def __read_events(self):
+        while True:
+            raw = await self.__sub_socket.recv()
+            # skip decoding events that neither the tracker nor a handler want
+            msg_id = codec.peek_field(raw, "msg_id")
+            if msg_id is not None and msg_id not in self.__event_ids:
+                continue
+            try:
+                event = codec.loads(raw)
+                self.__tracker.process_event(event)
+                handlers = self.__event_handlers.get(event["msg_id"])
+                if handlers:
+                    for handler in handlers:
+                        handler(event)
+            except Exception:
+                # a failing event handler or a malformed event mustn't stop
+                # the events that keep the tracker up to date
+                logger.exception("Error processing event")
+
+    def add_event_handler(self, msg_id, handler):
+        handlers = self.__event_handlers.get(msg_id, ())
+        self.__event_handlers[msg_id] = handlers + (handler,)
+        self.__event_ids = self.__event_ids | {msg_id}
+
+    def remove_event_handler(self, msg_id, handler):
+        handlers = list(self.__event_handlers.get(msg_id, ()))
+        if handler in handlers:
+            handlers.remove(handler)
+        if handlers:
+            self.__event_handlers[msg_id] = tuple(handlers)
+        else:
+            self.__event_handlers.pop(msg_id, None)
+            self.__event_ids = frozenset(self.__tracker.get_event_ids()) | set(self.__event_handlers)
+
+    def __selection(self, selection):
+        if selection is None:
+            return self.__camera_selection
+        return selection
+
+    def get_num_pending(self):
+        return len(self.__pending)
+
+    async def wait(self, secs):
+        await asyncio.sleep(secs)
+
+    async def request(self, msg_id, selection=None, **fields):
+        if selection is None:
+            names = messages.REQUEST_FIELDS.get(msg_id, ())
+            if "CameraSelection" in names:
+                selection = self.__camera_selection
+            elif "PhotoSelection" in names:
+                selection = self.__photo_selection
+        msg = self.__msgbuilder.build(msg_id, selection, **fields)
+        return await self.__transact(msg)
+
+    async def set_config(self, key, value):
+        msg = self.__msgbuilder.build_SetConfig(key, value)
+        return await self.__transact(msg)
+
+    async def synchronise(self):
+        self.__tracker.invalidate()
+        msg = self.__msgbuilder.build_Synchronise()
+        return await self.__transact(msg)
+
+    def get_camera_list(self):
+        return self.__tracker.get_camera_list()
+
+    def get_photo_list(self):
+        return self.__tracker.get_photo_list()
+
+    def get_camera_info(self, key):
+        return self.__tracker.get_camera_info(key)
+
+    def get_photo_info(self, key):
+        return self.__tracker.get_photo_info(key)
+
+    def set_photo_limits(self, max_photos=None, max_photo_age=None):
+        self.__tracker.set_photo_limits(max_photos, max_photo_age)
+
+    def select_camera(self, key):
+        self.__camera_selection.select_camera(key)
+
+    def select_cameras(self, keys):
+        self.__camera_selection.select_cameras(keys)
+
+    def select_all_cameras(self):
+        self.__camera_selection.select_all_cameras()
+
+    def select_camera_group(self, group):
+        self.__camera_selection.select_camera_group(group)
+
+    def get_selected_cameras(self, selection=None):
+        return self.__tracker.get_selected_cameras(self.__selection(selection))
+
+    def select_photo(self, key):
+        self.__photo_selection.select_photo(key)
+
+    def select_photos(self, keys):
+        self.__photo_selection.select_photos(keys)
+
+    def select_all_photos(self):
+        self.__photo_selection.select_all_photos()
+
+    def get_selected_photos(self):
+        return self.__tracker.get_selected_photos(self.__photo_selection)
+
+    async def connect(self, selection=None):
+        msg = self.__msgbuilder.build_Connect(self.__selection(selection))
+        return await self.__transact(msg)
+
+    async def disconnect(self, selection=None):
+        msg = self.__msgbuilder.build_Disconnect(self.__selection(selection))
+        return await self.__transact(msg)
+
+    async def shoot(self, bulb_timer=None, photo_origin="api", selection=None):
+        msg = self.__msgbuilder.build_Shoot(self.__selection(selection), bulb_timer, photo_origin)
+        return await self.__transact(msg)
+
+    async def download(self, selection=None):
+        msg = self.__msgbuilder.build_Download(self.__photo_selection if selection is None else selection)
+        return await self.__transact(msg)
+
+    async def transfer(self, selection=None):
+        msg = self.__msgbuilder.build_Transfer(self.__photo_selection if selection is None else selection)
+        return await self.__transact(msg)
+
+    async def delete(self, delete_files=False, selection=None):
+        msg = self.__msgbuilder.build_Delete(self.__photo_selection if selection is None else selection, delete_files)
+        return await self.__transact(msg)
+
+    async def autofocus(self, selection=None):
+        msg = self.__msgbuilder.build_Autofocus(self.__selection(selection))
+        return await self.__transact(msg)
+
+    async def set_property(self, prop, value, selection=None):
+        msg = self.__msgbuilder.build_SetProperty(self.__selection(selection), prop, value)
+        return await self.__transact(msg)
+
+    async def set_shutter_button(self, button, selection=None):
+        msg = self.__msgbuilder.build_SetShutterButton(self.__selection(selection), button)
+        return await self.__transact(msg)
+
+    async def enable_liveview(self, enable, selection=None):
+        msg = self.__msgbuilder.build_EnableLiveview(self.__selection(selection), enable)
+        return await self.__transact(msg)
+
+    async def move_focus(self, focus_step, selection=None):
+        msg = self.__msgbuilder.build_LiveviewFocus(self.__selection(selection), focus_step)
+        return await self.__transact(msg)
+
+    async def position_power_zoom(self, position, selection=None):
+        msg = self.__msgbuilder.build_PowerZoomPosition(self.__selection(selection), position)
+        return await self.__transact(msg)
+
+    async def stop_power_zoom(self, selection=None):
+        msg = self.__msgbuilder.build_PowerZoomStop(self.__selection(selection))
+        return await self.__transact(msg)
+
+    async def engage_latch(self, latch_index, selection=None):
+        msg = self.__msgbuilder.build_EngageLatch(self.__selection(selection), latch_index)
+        return await self.__transact(msg)
+
+    async def release_latch(self, latch_index):
+        msg = self.__msgbuilder.build_ReleaseLatch(latch_index)
+        return await self.__transact(msg)
+
+    async def cancel_latch(self, latch_index):
+        msg = self.__msgbuilder.build_CancelLatch(latch_index)
+        return await self.__transact(msg)
+
+    async def engage_trigger(self, selection=None):
+        msg = self.__msgbuilder.build_EngageTrigger(self.__selection(selection))
+        return await self.__transact(msg)
+
+    async def release_trigger(self, trigger_interval):
+        msg = self.__msgbuilder.build_ReleaseTrigger(trigger_interval)
+        return await self.__transact(msg)
+
+    async def cancel_trigger(self):
+        msg = self.__msgbuilder.build_CancelTrigger()
+        return await self.__transact(msg)
+
+    def get_property(self, prop, selection=None):
+        return self.__tracker.get_property(self.__selection(selection), prop)
+
+    def get_property_range(self, prop, selection=None):
+        return self.__tracker.get_property_range(self.__selection(selection), prop)
+
+    def is_camera_connected(self, selection=None):
+        return self.__tracker.is_selection_connected(self.__selection(selection))
+
+    def is_liveview_enabled(self, selection=None):
+        return self.__tracker.is_selection_liveview_enabled(self.__selection(selection))
+
+    async def sync_clocks(self, offset=0):
+        msg = self.__msgbuilder.build_SyncClocks(offset)
+        return await self.__transact(msg)
+
+    async def check_clocks(self):
+        msg = self.__msgbuilder.build_CheckClocks()
+        return await self.__transact(msg)
+
+    async def ping(self):
+        # returns the reply with the local send and receive times added
+        sent = time.time()
+        msg = self.__msgbuilder.build_NetworkPing(int(sent * 1000))
+        reply = await self.__transact(msg)
+        return sent, time.time(), reply
@@ -0,0 +1,50 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+class Batch:
+    def __init__(self):
+        self.__requests = []
+        self.__replies = None
+
+    def add_request(self, seq_num, msg):
+        self.__requests.append((seq_num, msg))
+
+    def get_requests(self):
+        return self.__requests
+
+    def set_replies(self, replies):
+        self.__replies = replies
+
+    def is_complete(self):
+        return self.__replies is not None
+
+    def get_replies(self):
+        return self.__replies
+
+    def get_results(self):
+        if self.__replies is None:
+            return None
+        return [bool(reply and reply.get("msg_result")) for reply in self.__replies]
+
+    def __len__(self):
+        return len(self.__requests)
@@ -0,0 +1,276 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import asyncio
+from collections import defaultdict
+from .asynccontext import AsyncContext
+from .selection import CameraSelection
+
+class NodeStats:
+    def __init__(self):
+        self.num_requests = 0
+        self.num_failures = 0
+        self.last_latency = None
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_error = None
+
+    def add_success(self, latency):
+        self.num_requests += 1
+        self.last_latency = latency
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.last_error = None
+
+    def add_failure(self, error):
+        self.num_requests += 1
+        self.num_failures += 1
+        self.last_error = error
+
+    def to_dict(self):
+        num_succeeded = self.num_requests - self.num_failures
+        mean_latency = None
+        if num_succeeded:
+            mean_latency = self.total_latency / num_succeeded
+        return {
+            "num_requests": self.num_requests,
+            "num_failures": self.num_failures,
+            "last_latency": self.last_latency,
+            "mean_latency": mean_latency,
+            "max_latency": self.max_latency,
+            "last_error": self.last_error,
+        }
+
+class ClusterContext:
+    # Talks to one Smart Shooter instance per node. Commands are sent to all
+    # nodes concurrently and return a dict of node name to reply, or to the
+    # exception if that node failed or timed out, so one slow or missing PC
+    # doesn't hold up the others. Cameras are identified by (node, CameraKey).
+    def __init__(self, nodes=None, timeout=5.0, max_photos=None, max_photo_age=None):
+        self.__timeout = timeout
+        self.__max_photos = max_photos
+        self.__max_photo_age = max_photo_age
+        self.__contexts = dict()
+        self.__endpoints = dict()
+        self.__stats = dict()
+        self.__selections = None
+        self.__event_handlers = []
+        self.__node_handlers = dict()
+        for name, (reqrep, publisher) in (nodes or {}).items():
+            self.__endpoints[name] = (reqrep, publisher)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def start(self):
+        await asyncio.gather(*[self.add_node(name, reqrep, publisher)
+                               for name, (reqrep, publisher) in self.__endpoints.items()])
+
+    async def close(self):
+        await asyncio.gather(*[self.remove_node(name) for name in list(self.__contexts)])
+
+    async def add_node(self, name, reqrep, publisher):
+        # returns False if the node didn't synchronise in time, it is then
+        # left out of the cluster but its failure is kept in the stats
+        self.__endpoints[name] = (reqrep, publisher)
+        stats = self.__stats.setdefault(name, NodeStats())
+        context = AsyncContext(reqrep, publisher, self.__max_photos, self.__max_photo_age)
+        for msg_id, handler in self.__event_handlers:
+            context.add_event_handler(msg_id, self.__node_handler(name, msg_id, handler))
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(context.start(), self.__timeout)
+        except Exception as e:
+            stats.add_failure(e)
+            await context.close()
+            return False
+        stats.add_success(time.perf_counter() - start)
+        self.__contexts[name] = context
+        return True
+
+    async def remove_node(self, name):
+        context = self.__contexts.pop(name, None)
+        self.__endpoints.pop(name, None)
+        if self.__selections is not None:
+            self.__selections.pop(name, None)
+        for key in [key for key in self.__node_handlers if key[0] == name]:
+            del self.__node_handlers[key]
+        if context is not None:
+            await context.close()
+
+    def get_node_names(self):
+        return list(self.__contexts)
+
+    def get_node_context(self, name):
+        return self.__contexts[name]
+
+    def get_node_stats(self):
+        return {name: stats.to_dict() for name, stats in self.__stats.items()}
+
+    def get_failed_nodes(self):
+        return [name for name, stats in self.__stats.items() if stats.last_error is not None]
+
+    def add_event_handler(self, msg_id, handler):
+        # the handler is called as handler(node, event)
+        self.__event_handlers.append((msg_id, handler))
+        for name, context in self.__contexts.items():
+            context.add_event_handler(msg_id, self.__node_handler(name, msg_id, handler))
+
+    def remove_event_handler(self, msg_id, handler):
+        if (msg_id, handler) in self.__event_handlers:
+            self.__event_handlers.remove((msg_id, handler))
+        for name, context in self.__contexts.items():
+            wrapper = self.__node_handlers.pop((name, msg_id, handler), None)
+            if wrapper is not None:
+                context.remove_event_handler(msg_id, wrapper)
+
+    def __node_handler(self, name, msg_id, handler):
+        # the same wrapper object is needed to remove the handler again
+        key = (name, msg_id, handler)
+        if key not in self.__node_handlers:
+            self.__node_handlers[key] = lambda event: handler(name, event)
+        return self.__node_handlers[key]
+
+    def select_all_cameras(self):
+        self.__selections = None
+
+    def select_camera(self, key):
+        self.select_cameras([key])
+
+    def select_cameras(self, keys):
+        by_node = defaultdict(list)
+        for name, key in keys:
+            by_node[name].append(key)
+        self.__selections = dict()
+        for name, node_keys in by_node.items():
+            selection = CameraSelection()
+            selection.select_cameras(node_keys)
+            self.__selections[name] = selection
+
+    def select_camera_group(self, group):
+        self.__selections = dict()
+        for name in self.__contexts:
+            selection = CameraSelection()
+            selection.select_camera_group(group)
+            self.__selections[name] = selection
+
+    def __get_targets(self):
+        if self.__selections is None:
+            return [(name, context, CameraSelection()) for name, context in self.__contexts.items()]
+        return [(name, self.__contexts[name], selection)
+                for name, selection in self.__selections.items() if name in self.__contexts]
+
+    def get_node_selections(self):
+        return {name: selection for name, context, selection in self.__get_targets()}
+
+    async def __call(self, name, coro):
+        stats = self.__stats[name]
+        start = time.perf_counter()
+        try:
+            reply = await asyncio.wait_for(coro, self.__timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            stats.add_failure(e)
+            return e
+        stats.add_success(time.perf_counter() - start)
+        return reply
+
+    async def __broadcast(self, method, *args, select=True):
+        targets = self.__get_targets()
+        calls = []
+        for name, context, selection in targets:
+            func = getattr(context, method)
+            if select:
+                calls.append(self.__call(name, func(*args, selection=selection)))
+            else:
+                calls.append(self.__call(name, func(*args)))
+        results = await asyncio.gather(*calls)
+        return {target[0]: result for target, result in zip(targets, results)}
+
+    def get_camera_list(self):
+        cameras = []
+        for name, context in self.__contexts.items():
+            cameras.extend((name, key) for key in context.get_camera_list())
+        return cameras
+
+    def get_photo_list(self):
+        photos = []
+        for name, context in self.__contexts.items():
+            photos.extend((name, key) for key in context.get_photo_list())
+        return photos
+
+    def get_camera_info(self, key):
+        name, camera_key = key
+        return self.__contexts[name].get_camera_info(camera_key)
+
+    def get_photo_info(self, key):
+        name, photo_key = key
+        return self.__contexts[name].get_photo_info(photo_key)
+
+    def get_selected_cameras(self):
+        cameras = []
+        for name, context, selection in self.__get_targets():
+            cameras.extend((name, key) for key in context.get_selected_cameras(selection))
+        return cameras
+
+    def get_property(self, prop):
+        # per node values, each one as AsyncContext.get_property returns it
+        return {name: context.get_property(prop, selection)
+                for name, context, selection in self.__get_targets()}
+
+    def is_camera_connected(self):
+        return all(context.is_camera_connected(selection)
+                   for name, context, selection in self.__get_targets())
+
+    async def synchronise(self):
+        return await self.__broadcast("synchronise", select=False)
+
+    async def sync_clocks(self, offset=0):
+        return await self.__broadcast("sync_clocks", offset, select=False)
+
+    async def connect(self):
+        return await self.__broadcast("connect")
+
+    async def disconnect(self):
+        return await self.__broadcast("disconnect")
+
+    async def shoot(self, bulb_timer=None, photo_origin="api"):
+        return await self.__broadcast("shoot", bulb_timer, photo_origin)
+
+    async def autofocus(self):
+        return await self.__broadcast("autofocus")
+
+    async def set_property(self, prop, value):
+        return await self.__broadcast("set_property", prop, value)
+
+    async def set_shutter_button(self, button):
+        return await self.__broadcast("set_shutter_button", button)
+
+    async def enable_liveview(self, enable):
+        return await self.__broadcast("enable_liveview", enable)
@@ -0,0 +1,143 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import re
+import json
+
+class StdlibCodec:
+    name = "json"
+    def loads(self, data):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+    def dumps(self, obj):
+        return json.dumps(obj)
+    def dumpb(self, obj):
+        return json.dumps(obj).encode("utf-8")
+
+class OrjsonCodec:
+    name = "orjson"
+    def __init__(self):
+        import orjson
+        self.loads = orjson.loads
+        self.dumpb = orjson.dumps
+    def dumps(self, obj):
+        return self.dumpb(obj).decode("utf-8")
+
+class MsgspecCodec:
+    name = "msgspec"
+    def __init__(self):
+        import msgspec
+        self.loads = msgspec.json.decode
+        self.dumpb = msgspec.json.encode
+    def dumps(self, obj):
+        return self.dumpb(obj).decode("utf-8")
+
+class UjsonCodec:
+    name = "ujson"
+    def __init__(self):
+        import ujson
+        self.__ujson = ujson
+    def loads(self, data):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return self.__ujson.loads(data)
+    def dumps(self, obj):
+        return self.__ujson.dumps(obj, ensure_ascii=False)
+    def dumpb(self, obj):
+        return self.dumps(obj).encode("utf-8")
+
+codec_classes = [OrjsonCodec, MsgspecCodec, UjsonCodec, StdlibCodec]
+
+def create_codec(name=None):
+    for codec_class in codec_classes:
+        if name is not None and codec_class.name != name:
+            continue
+        try:
+            return codec_class()
+        except ImportError:
+            if name is not None:
+                raise
+    raise ValueError("unknown JSON codec: {}".format(name))
+
+def get_codec_names():
+    names = []
+    for codec_class in codec_classes:
+        try:
+            codec_class()
+        except ImportError:
+            continue
+        names.append(codec_class.name)
+    return names
+
+value_pattern = re.compile(r'\s*:\s*"([^"\\]*)"')
+value_pattern_bytes = re.compile(rb'\s*:\s*"([^"\\]*)"')
+
+def find_field(data, needle, pattern, start, end):
+    pos = data.find(needle, start, end)
+    while pos >= 0:
+        match = pattern.match(data, pos + len(needle))
+        if match:
+            return match
+        pos = data.find(needle, pos + 1, end)
+    return None
+
+def peek_field(data, field, window=512):
+    # Extracts a top level string field without decoding the whole message,
+    # returns None if it can't be found this way. Only plain strings without
+    # escape sequences are matched, which holds for msg_id and CameraKey.
+    # The header fields are written either first or (with sorted keys) last,
+    # so both ends are searched before falling back to the whole message.
+    if isinstance(data, str):
+        needle = '"' + field + '"'
+        pattern = value_pattern
+    else:
+        needle = b'"' + field.encode("utf-8") + b'"'
+        pattern = value_pattern_bytes
+    size = len(data)
+    match = find_field(data, needle, pattern, 0, window)
+    if match is None and size > window:
+        match = find_field(data, needle, pattern, max(window, size - window), size)
+        if match is None and size > 2 * window:
+            match = find_field(data, needle, pattern, 0, size)
+    if match is None:
+        return None
+    value = match.group(1)
+    if not isinstance(value, str):
+        value = value.decode("utf-8")
+    return value
+
+def use_codec(name=None):
+    # callers reference codec.loads/codec.dumps through the module, so
+    # rebinding them here switches every user of the codec at once
+    global current, loads, dumps, dumpb
+    current = create_codec(name)
+    loads = current.loads
+    dumps = current.dumps
+    dumpb = current.dumpb
+    return current.name
+
+def get_codec_name():
+    return current.name
+
+use_codec()
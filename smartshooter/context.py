@@ -23,10 +23,23 @@
 
 import os
 import sys
-import json
 import time
+import uuid
+import logging
+import threading
+import contextlib
+from . import codec
+from . import messages
 from .msgbuilder import MSGBuilder
 from .statetracker import StateTracker
+from .eventhub import EventHub
+from .metrics import TimedMSGBuilder
+from .batch import Batch
+from .trace import ShootTrace
+from .validation import check_property_value
+from . import snapshot
+from .liveview import LiveviewFrames
+from .liveview import decode_liveview_image
 from .enums import CameraSelectionMode
 from .enums import PhotoSelectionMode
 from .selection import CameraSelection
@@ -41,155 +54,505 @@ if is_embedded():
 else:
     import zmq
 
+DEFAULT_REQREP = "tcp://127.0.0.1:54544"
+DEFAULT_PUBLISHER = "tcp://127.0.0.1:54543"
+
+logger = logging.getLogger(__name__)
+
 class EmbeddedSocket:
     def __init__(self):
         pass
+    def check_status(self):
+        return apphooks.check_status()
+    def can_pipeline(self):
+        return False
     def send_request(self, msg):
         apphooks.send_request(msg)
     def recv_reply(self):
         return apphooks.recv_reply()
-    def recv_event(self):
-        return apphooks.recv_event()
+    def close(self):
+        pass
+    def recv_event(self, timeout=0):
+        jstr = apphooks.recv_event()
+        if not jstr and timeout:
+            time.sleep(timeout / 1000)
+        return jstr
 
 class ZMQSocket:
-    def __init__(self):
-        self.__ctx = zmq.Context()
-        self.__req_socket = self.__ctx.socket(zmq.REQ)
-        self.__sub_socket = self.__ctx.socket(zmq.SUB)
-        self.__sub_socket.setsockopt(zmq.SUBSCRIBE, b"")
-        self.__req_socket.connect("tcp://127.0.0.1:54544")
-        self.__sub_socket.connect("tcp://127.0.0.1:54543")
+    def __init__(self, reqrep=DEFAULT_REQREP, publisher=DEFAULT_PUBLISHER, zmq_ctx=None):
+        if zmq_ctx is None:
+            zmq_ctx = zmq.Context.instance()
+        # either end can be left out, e.g. pooled request sockets don't
+        # subscribe to events
+        self.__req_socket = None
+        self.__sub_socket = None
+        if reqrep:
+            # DEALER rather than REQ, so several requests can be in flight
+            self.__req_socket = zmq_ctx.socket(zmq.DEALER)
+            self.__req_socket.connect(reqrep)
+        if publisher:
+            self.__sub_socket = zmq_ctx.socket(zmq.SUB)
+            self.__sub_socket.setsockopt(zmq.SUBSCRIBE, b"")
+            self.__sub_socket.connect(publisher)
+    def close(self):
+        if self.__req_socket is not None:
+            self.__req_socket.close(0)
+            self.__req_socket = None
+        if self.__sub_socket is not None:
+            self.__sub_socket.close(0)
+            self.__sub_socket = None
+    def check_status(self):
+        return True
+    def can_pipeline(self):
+        return True
     def send_request(self, msg):
-        self.__req_socket.send_string(msg)
+        self.__req_socket.send_multipart([b"", msg.encode("utf-8")])
     def recv_reply(self):
-        return self.__req_socket.recv_string()
-    def recv_event(self):
-        return self.__sub_socket.recv().decode("utf-8")
+        return self.__req_socket.recv_multipart()[-1]
+    def recv_event(self, timeout=0):
+        if self.__sub_socket is None or not self.__sub_socket.poll(timeout):
+            return b""
+        return self.__sub_socket.recv()
 
 class Context:
-    def __init__(self):
+    def __init__(self, event_thread=False, max_photos=None, max_photo_age=None,
+                 snapshot_path=None, background_refresh=True,
+                 reqrep=DEFAULT_REQREP, publisher=DEFAULT_PUBLISHER, pool=None,
+                 discovery=None, discovery_timeout=None, metrics=None, validate=False):
         self.__is_embedded = is_embedded()
-        self.__msgbuilder = MSGBuilder()
-        self.__tracker = StateTracker()
+        self.__pool = pool
+        self.__validate = validate
         self.__camera_selection = CameraSelection()
         self.__photo_selection = PhotoSelection()
-        if self.__is_embedded:
-            self.__socket = EmbeddedSocket()
+        self.__batch = None
+        self.__batch_thread = None
+        self.__request_lock = threading.RLock()
+        if pool is not None:
+            # a lightweight handle on the pool's shared tracker and events
+            self.__msgbuilder = pool.create_msgbuilder(validate)
+            self.__socket = pool.acquire_socket()
+            self.__hub = pool.get_hub()
+            metrics = self.__hub.get_metrics()
+        else:
+            self.__msgbuilder = MSGBuilder(validate=validate)
+            if self.__is_embedded:
+                self.__socket = EmbeddedSocket()
+            else:
+                if discovery is not None:
+                    node = discovery.wait_for_node(discovery_timeout)
+                    if node is None:
+                        raise RuntimeError("No Smart Shooter node discovered")
+                    reqrep = node["reqrep"]
+                    publisher = node["publisher"]
+                self.__socket = ZMQSocket(reqrep, publisher)
+            tracker = StateTracker(max_photos, max_photo_age)
+            self.__hub = EventHub(self.__socket, tracker, event_thread, metrics)
+        self.__metrics = metrics
+        if metrics is not None:
+            self.__msgbuilder = TimedMSGBuilder(self.__msgbuilder, metrics)
+        self.__tracker = self.__hub.get_tracker()
+        self.__lock = self.__hub.get_lock()
+        self.__snapshot_path = snapshot_path
+        self.__refresh_thread = None
+        self.__refresh_error = None
+        try:
+            self.__start(background_refresh)
+        except BaseException:
+            self.__release()
+            raise
+
+    def __start(self, background_refresh):
+        snapshot_path = self.__snapshot_path
+        if self.__pool is not None:
+            if not self.is_synchronised():
+                self.synchronise()
+        elif snapshot_path and os.path.exists(snapshot_path) and self.__load_cached_snapshot(snapshot_path):
+            # usable straight away, but possibly stale until refreshed
+            if background_refresh:
+                self.__refresh_thread = threading.Thread(target=self.__refresh, name="smartshooter-refresh")
+                self.__refresh_thread.daemon = True
+                self.__refresh_thread.start()
+            else:
+                self.synchronise(delta=True)
+        else:
+            self.synchronise()
+            if snapshot_path:
+                self.save_snapshot(snapshot_path)
+
+    def __load_cached_snapshot(self, path):
+        # the snapshot is only a cache, so if it can't be read the state is
+        # synchronised in full instead and the file overwritten
+        try:
+            self.load_snapshot(path)
+        except Exception:
+            logger.exception("Ignoring unreadable snapshot %s", path)
+            return False
+        return True
+
+    def __refresh(self):
+        try:
+            self.synchronise(delta=True)
+        except Exception as e:
+            with self.__lock:
+                self.__refresh_error = e
+                self.__hub.notify_changed()
+
+    def close(self, refresh_timeout=5.0):
+        if self.__refresh_thread:
+            self.__refresh_thread.join(refresh_timeout)
+            if self.__refresh_thread.is_alive():
+                # the node never replied; the refresh thread is still using
+                # the socket, so it's left for the process to clean up
+                logger.warning("Background refresh still running, not saving snapshot")
+                self.__refresh_thread = None
+                self.__snapshot_path = None
+                self.__hub.stop()
+                self.__socket = None
+                return
+            self.__refresh_thread = None
+        if self.__snapshot_path:
+            self.save_snapshot(self.__snapshot_path)
+            self.__snapshot_path = None
+        self.__release()
+
+    def __release(self):
+        if self.__socket is None:
+            return
+        if self.__pool is not None:
+            self.__pool.release_socket(self.__socket)
         else:
-            self.__socket = ZMQSocket()
-        self.synchronise()
+            self.__hub.stop()
+            if not self.__is_embedded:
+                self.__socket.close()
+        self.__socket = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def is_stale(self):
+        return not self.is_synchronised()
+
+    def wait_until_synchronised(self, timeout=None):
+        def is_done():
+            return self.__tracker.is_synchronised() or self.__refresh_error is not None
+        if not self.wait_for(is_done, timeout):
+            return False
+        if self.__refresh_error is not None:
+            error = self.__refresh_error
+            self.__refresh_error = None
+            raise error
+        return True
 
     def __transact(self, msg):
+        if self.__batch is not None and self.__batch_thread == threading.get_ident():
+            self.__batch.add_request(self.__msgbuilder.get_last_seq_num(), msg)
+            return None
+        if self.__metrics is not None:
+            return self.__transact_timed(msg)
         self.check_status()
-        self.__socket.send_request(msg)
-        self.__read_events()
-        jstr = self.__socket.recv_reply()
-        reply = json.loads(jstr)
-        self.__tracker.process_reply(reply)
+        seq_num = self.__msgbuilder.get_last_seq_num()
+        with self.__request_lock:
+            self.__socket.send_request(msg)
+            self.__hub.read_events()
+            while True:
+                reply = codec.loads(self.__socket.recv_reply())
+                # a pooled socket may still hold the reply to an abandoned request
+                if reply.get("msg_seq_num", seq_num) == seq_num:
+                    break
+        with self.__lock:
+            self.__tracker.process_reply(reply)
+            self.__hub.notify_changed()
         return reply
 
-    def __read_events(self):
-        while True:
-            self.check_status()
-            jstr = self.__socket.recv_event()
-            if not jstr:
-                return
-            event = json.loads(jstr)
-            self.__tracker.process_event(event)
+    def __transact_timed(self, msg):
+        metrics = self.__metrics
+        msg_id = codec.peek_field(msg, "msg_id")
+        self.check_status()
+        seq_num = self.__msgbuilder.get_last_seq_num()
+        with self.__request_lock:
+            start = time.perf_counter()
+            self.__socket.send_request(msg)
+            sent = time.perf_counter()
+            # only counts requests actually sent, not threads waiting for the lock
+            metrics.add_gauge("requests_in_flight", 1)
+            try:
+                self.__hub.read_events()
+                metrics.observe_request("drain", msg_id, time.perf_counter() - sent)
+                while True:
+                    jstr = self.__socket.recv_reply()
+                    received = time.perf_counter()
+                    reply = codec.loads(jstr)
+                    parsed = time.perf_counter()
+                    if reply.get("msg_seq_num", seq_num) == seq_num:
+                        break
+            finally:
+                metrics.add_gauge("requests_in_flight", -1)
+        metrics.observe_request("rtt", msg_id, received - start)
+        metrics.observe_request("parse", msg_id, parsed - received)
+        with self.__lock:
+            start = time.perf_counter()
+            self.__tracker.process_reply(reply)
+            metrics.observe_request("tracker", msg_id, time.perf_counter() - start)
+            self.__hub.notify_changed()
+        return reply
+
+    def get_stats(self):
+        if self.__metrics is None:
+            return None
+        return self.__metrics.get_stats()
+
+    @contextlib.contextmanager
+    def batch(self):
+        batch = Batch()
+        # other threads wait for the batch to be sent before their requests
+        with self.__request_lock:
+            self.__batch = batch
+            self.__batch_thread = threading.get_ident()
+            try:
+                yield batch
+            finally:
+                self.__batch = None
+                self.__batch_thread = None
+            self.__transact_batch(batch)
+
+    def __transact_batch(self, batch):
+        requests = batch.get_requests()
+        if not self.__socket.can_pipeline():
+            batch.set_replies([self.__transact(msg) for seq_num, msg in requests])
+            return
+        self.check_status()
+        metrics = self.__metrics
+        sent = dict()
+        for seq_num, msg in requests:
+            self.__socket.send_request(msg)
+            sent[seq_num] = time.perf_counter()
+        pending = [seq_num for seq_num, msg in requests]
+        replies = dict()
+        if metrics is not None:
+            metrics.add_gauge("requests_in_flight", len(requests))
+        try:
+            self.__hub.read_events()
+            while pending:
+                jstr = self.__socket.recv_reply()
+                received = time.perf_counter()
+                reply = codec.loads(jstr)
+                # replies come back in request order if there's no sequence number
+                seq_num = reply.get("msg_seq_num", pending[0])
+                if seq_num in pending:
+                    pending.remove(seq_num)
+                    replies[seq_num] = reply
+                    if metrics is not None:
+                        metrics.add_gauge("requests_in_flight", -1)
+                        msg_id = reply.get("msg_id")
+                        metrics.observe_request("rtt", msg_id, received - sent[seq_num])
+                        metrics.observe_request("parse", msg_id, time.perf_counter() - received)
+        finally:
+            if metrics is not None and pending:
+                metrics.add_gauge("requests_in_flight", -len(pending))
+        results = []
+        with self.__lock:
+            start = time.perf_counter()
+            for seq_num, msg in requests:
+                reply = replies.get(seq_num)
+                if reply is not None:
+                    self.__tracker.process_reply(reply)
+                results.append(reply)
+            if metrics is not None:
+                metrics.observe_request("tracker", "batch", time.perf_counter() - start)
+            self.__hub.notify_changed()
+        batch.set_replies(results)
+
+    def add_liveview_sink(self, sink, cameras=None):
+        self.__hub.add_liveview_sink(sink, cameras)
+
+    def remove_liveview_sink(self, sink):
+        self.__hub.remove_liveview_sink(sink)
+
+    def export_liveview(self, ring, cameras=None):
+        self.add_liveview_sink(ring.write, cameras)
+
+    def iter_liveview(self, cameras=None, max_fps=None, timeout=None):
+        frames = LiveviewFrames(cameras)
+        self.__hub.add_liveview_stream(frames)
+        try:
+            next_time = 0
+            while True:
+                if max_fps:
+                    # newer frames replace pending ones while waiting
+                    delay = next_time - time.time()
+                    if delay > 0:
+                        self.wait(delay)
+                if not self.wait_for(frames.has_frames, timeout):
+                    return
+                if max_fps:
+                    next_time = time.time() + 1.0 / max_fps
+                with self.__lock:
+                    latest = frames.take()
+                for key, raw in latest.items():
+                    image = decode_liveview_image(raw)
+                    if image is not None:
+                        yield key, image
+        finally:
+            self.__hub.remove_liveview_stream(frames)
+
+    def add_event_handler(self, msg_id, handler):
+        self.__hub.add_event_handler(msg_id, handler)
+
+    def remove_event_handler(self, msg_id, handler):
+        self.__hub.remove_event_handler(msg_id, handler)
+
+    def has_event_thread(self):
+        return self.__hub.has_event_thread()
 
     def check_status(self):
-        ok = apphooks.check_status()
+        ok = self.__socket.check_status()
         if not ok:
             sys.exit()
 
+    def wait_for(self, predicate, timeout=None):
+        return self.__hub.wait_for(predicate, timeout)
+
     def wait_until(self, target):
-        while True:
-            self.check_status()
-            self.__read_events()
-            now = time.time()
-            if now >= target:
-                return
-            diff = target - now
-            if diff > 2:
-                time.sleep(1)
-            else:
-                time.sleep(0.01)
+        self.wait_for(lambda: False, max(0, target - time.time()))
 
     def wait(self, secs):
         target = time.time() + secs
         self.wait_until(target)
 
-    def __wait_for_liveview_enabled(self):
-        self.__read_events()
-        cameras = []
+    def __wait_for_liveview_enabled(self, timeout):
+        self.__hub.read_events()
+        pending = set()
         for camera in self.get_selected_cameras():
             info = self.get_camera_info(camera)
             status = info["CameraStatus"]
             if status in ["Ready", "Busy"] and not info["CameraLiveviewIsEnabled"]:
-                cameras.append(camera)
-        num_pending = len(cameras)
-        while num_pending > 0:
-            self.__read_events()
-            for i in range(len(cameras)):
-                if cameras[i]:
-                    info = self.get_camera_info(cameras[i])
-                    status = info["CameraStatus"]
-                    if status not in ["Ready", "Busy"]:
-                        num_pending -= 1
-                        cameras[i] = None
-                    elif status == "Ready" and info["CameraLiveviewIsEnabled"]:
-                        num_pending -= 1
-                        cameras[i] = None
-
-    def __wait_for_liveview_frame(self):
-        self.__read_events()
-        cameras = []
-        markers = []
+                pending.add(camera)
+        def is_enabled():
+            for camera in list(pending):
+                info = self.get_camera_info(camera)
+                status = info["CameraStatus"]
+                if status not in ["Ready", "Busy"]:
+                    pending.discard(camera)
+                elif status == "Ready" and info["CameraLiveviewIsEnabled"]:
+                    pending.discard(camera)
+            return not pending
+        return self.wait_for(is_enabled, timeout)
+
+    def __wait_for_liveview_frame(self, timeout):
+        self.__hub.read_events()
+        markers = dict()
         for camera in self.get_selected_cameras():
             info = self.get_camera_info(camera)
             status = info["CameraStatus"]
             if status in ["Ready", "Busy"] and info["CameraLiveviewIsEnabled"]:
-                cameras.append(camera)
-                markers.append(info["CameraLiveviewNumFrames"] + 10)
-        num_pending = len(cameras)
-        while num_pending > 0:
-            self.__read_events()
-            for i in range(len(cameras)):
-                if cameras[i]:
-                    info = self.get_camera_info(cameras[i])
-                    status = info["CameraStatus"]
-                    if status not in ["Ready", "Busy"] or not info["CameraLiveviewIsEnabled"]:
-                        num_pending -= 1
-                        cameras[i] = None
-                    elif status == "Ready" and info["CameraLiveviewNumFrames"] > markers[i]:
-                        num_pending -= 1
-                        cameras[i] = None
-
-
-    def wait_for_liveview(self):
-        self.__wait_for_liveview_enabled()
-        self.__wait_for_liveview_frame()
+                markers[camera] = info["CameraLiveviewNumFrames"] + 10
+        def has_frame():
+            for camera in list(markers):
+                info = self.get_camera_info(camera)
+                status = info["CameraStatus"]
+                if status not in ["Ready", "Busy"] or not info["CameraLiveviewIsEnabled"]:
+                    del markers[camera]
+                elif status == "Ready" and info["CameraLiveviewNumFrames"] > markers[camera]:
+                    del markers[camera]
+            return not markers
+        return self.wait_for(has_frame, timeout)
+
+    def wait_for_liveview(self, timeout=None):
+        start = time.time()
+        if not self.__wait_for_liveview_enabled(timeout):
+            return False
+        if timeout is not None:
+            timeout = max(0, timeout - (time.time() - start))
+        return self.__wait_for_liveview_frame(timeout)
+
+    def request(self, msg_id, selection=None, **fields):
+        # sends any request in external_api.json, e.g.
+        # request("IncrementProperty", CameraPropertyType=Property.ISO, CameraPropertyStep=1)
+        if selection is None:
+            selection = self.__default_selection(msg_id)
+        msg = self.__msgbuilder.build(msg_id, selection, **fields)
+        return self.__transact(msg)
+
+    def __default_selection(self, msg_id):
+        names = messages.REQUEST_FIELDS.get(msg_id, ())
+        if "CameraSelection" in names:
+            return self.__camera_selection
+        if "PhotoSelection" in names:
+            return self.__photo_selection
+        return None
 
     def set_config(self, key, value):
         msg = self.__msgbuilder.build_SetConfig(key, value)
         self.__transact(msg)
 
-    def synchronise(self):
-        self.__tracker.invalidate()
+    def synchronise(self, delta=False):
+        if delta and self.__synchronise_cameras():
+            return
+        with self.__lock:
+            self.__tracker.invalidate()
         msg = self.__msgbuilder.build_Synchronise()
         self.__transact(msg)
 
+    def __synchronise_cameras(self):
+        # The API has no way to query individual photos, so cameras are
+        # refreshed with GetCamera and the full Synchronise is only needed
+        # if the set of cameras changed, a camera's photo/download counters
+        # moved since last time, or the tracked photos don't fit the counters.
+        with self.__lock:
+            counters = self.__tracker.get_photo_counters()
+        if not counters:
+            return False
+        msg = self.__msgbuilder.build_GetCamera(CameraSelection())
+        reply = self.__transact(msg)
+        if not reply or not reply.get("msg_result", True):
+            return False
+        with self.__lock:
+            keys = [camera["CameraKey"] for camera in reply.get("CameraInfo", [])]
+            if self.__tracker.retain_cameras(keys):
+                return False
+            if self.__tracker.get_photo_counters() != counters:
+                return False
+            if not self.__tracker.photos_match_counters():
+                return False
+            self.__tracker.mark_synchronised()
+        return True
+
+    def is_synchronised(self):
+        with self.__lock:
+            return self.__tracker.is_synchronised()
+
+    def save_snapshot(self, path):
+        with self.__lock:
+            data = self.__tracker.get_snapshot()
+        snapshot.save_snapshot(path, data)
+
+    def load_snapshot(self, path):
+        data = snapshot.load_snapshot(path)
+        with self.__lock:
+            self.__tracker.load_snapshot(data)
+
     def get_camera_list(self):
-        return self.__tracker.get_camera_list()
+        with self.__lock:
+            return self.__tracker.get_camera_list()
 
     def get_photo_list(self):
-        return self.__tracker.get_photo_list()
+        with self.__lock:
+            return self.__tracker.get_photo_list()
 
     def get_camera_info(self, key):
-        return self.__tracker.get_camera_info(key)
+        with self.__lock:
+            return self.__tracker.get_camera_info(key)
 
     def get_photo_info(self, key):
-        return self.__tracker.get_photo_info(key)
+        with self.__lock:
+            return self.__tracker.get_photo_info(key)
+
+    def set_photo_limits(self, max_photos=None, max_photo_age=None):
+        with self.__lock:
+            self.__tracker.set_photo_limits(max_photos, max_photo_age)
 
     def select_camera(self, key):
         self.__camera_selection.select_camera(key)
@@ -203,8 +566,11 @@ class Context:
     def select_camera_group(self, group):
         self.__camera_selection.select_camera_group(group)
 
-    def get_selected_cameras(self):
-        return self.__tracker.get_selected_cameras(self.__camera_selection);
+    def get_selected_cameras(self, selection=None):
+        if selection is None:
+            selection = self.__camera_selection
+        with self.__lock:
+            return self.__tracker.get_selected_cameras(selection)
 
     def select_photo(self, key):
         self.__photo_selection.select_photo(key)
@@ -216,7 +582,8 @@ class Context:
         self.__photo_selection.select_all_photos()
 
     def get_selected_photos(self):
-        return self.__tracker.get_selected_photos(self.__photo_selection);
+        with self.__lock:
+            return self.__tracker.get_selected_photos(self.__photo_selection)
 
     def connect(self):
         msg = self.__msgbuilder.build_Connect(self.__camera_selection)
@@ -226,17 +593,64 @@ class Context:
         msg = self.__msgbuilder.build_Disconnect(self.__camera_selection)
         self.__transact(msg)
 
-    def shoot(self, bulb_timer=None, photo_origin="api"):
+    def shoot(self, bulb_timer=None, photo_origin=None, trace=False, trace_timeout=60.0):
+        # with trace, returns a ShootTrace following the photos onto disk. A
+        # traced shoot gets its own photo_origin unless one is given, so late
+        # photos from earlier shoots aren't counted.
+        if not trace:
+            if photo_origin is None:
+                photo_origin = "api"
+            msg = self.__msgbuilder.build_Shoot(self.__camera_selection, bulb_timer, photo_origin)
+            self.__transact(msg)
+            return None
+        if photo_origin is None:
+            photo_origin = "api-" + uuid.uuid4().hex[:12]
         msg = self.__msgbuilder.build_Shoot(self.__camera_selection, bulb_timer, photo_origin)
-        self.__transact(msg)
+        trace = ShootTrace(self.__msgbuilder.get_last_seq_num(), photo_origin,
+                           self.get_selected_cameras(), trace_timeout)
+        trace.attach(self)
+        try:
+            reply = self.__transact(msg)
+        except BaseException:
+            trace.detach()
+            raise
+        trace.set_reply(reply)
+        return trace
+
+    def download(self, selection=None):
+        if selection is None:
+            selection = self.__photo_selection
+        msg = self.__msgbuilder.build_Download(selection)
+        return self.__transact(msg)
+
+    def transfer(self, selection=None):
+        if selection is None:
+            selection = self.__photo_selection
+        msg = self.__msgbuilder.build_Transfer(selection)
+        return self.__transact(msg)
+
+    def delete(self, delete_files=False, selection=None):
+        if selection is None:
+            selection = self.__photo_selection
+        msg = self.__msgbuilder.build_Delete(selection, delete_files)
+        return self.__transact(msg)
 
     def autofocus(self):
         msg = self.__msgbuilder.build_Autofocus(self.__camera_selection)
         self.__transact(msg)
 
-    def set_property(self, prop, value):
-        msg = self.__msgbuilder.build_SetProperty(self.__camera_selection, prop, value)
-        self.__transact(msg)
+    def set_property(self, prop, value, selection=None):
+        if selection is None:
+            selection = self.__camera_selection
+        if self.__validate:
+            self.__check_property_value(prop, value, selection)
+        msg = self.__msgbuilder.build_SetProperty(selection, prop, value)
+        return self.__transact(msg)
+
+    def __check_property_value(self, prop, value, selection):
+        with self.__lock:
+            for key in self.__tracker.get_selected_cameras(selection):
+                check_property_value(prop, value, self.__tracker.get_camera_property_range(key, prop))
 
     def set_shutter_button(self, button):
         msg = self.__msgbuilder.build_SetShutterButton(self.__camera_selection, button)
@@ -282,24 +696,30 @@ class Context:
         msg = self.__msgbuilder.build_CancelTrigger()
         self.__transact(msg)
 
+    def sync_clocks(self, offset=0):
+        msg = self.__msgbuilder.build_SyncClocks(offset)
+        self.__transact(msg)
+
+    def check_clocks(self):
+        msg = self.__msgbuilder.build_CheckClocks()
+        self.__transact(msg)
+
     def get_property(self, prop):
-        return self.__tracker.get_property(self.__camera_selection, prop)
+        with self.__lock:
+            return self.__tracker.get_property(self.__camera_selection, prop)
+
+    def get_camera_property(self, key, prop):
+        with self.__lock:
+            return self.__tracker.get_camera_property(key, prop)
 
     def get_property_range(self, prop):
-        return self.__tracker.get_property_range(self.__camera_selection, prop)
+        with self.__lock:
+            return self.__tracker.get_property_range(self.__camera_selection, prop)
 
     def is_camera_connected(self):
-        for camera in self.get_selected_cameras():
-            info = self.get_camera_info(camera)
-            status = info["CameraStatus"]
-            if status not in ["Ready", "Busy"]:
-                return False
-        return True
+        with self.__lock:
+            return self.__tracker.is_selection_connected(self.__camera_selection)
 
     def is_liveview_enabled(self):
-        for camera in self.get_selected_cameras():
-            info = self.get_camera_info(camera)
-            status = info["CameraStatus"]
-            if status not in ["Ready", "Busy"] or not info["CameraLiveviewIsEnabled"]:
-                return False
-        return True
+        with self.__lock:
+            return self.__tracker.is_selection_liveview_enabled(self.__camera_selection)
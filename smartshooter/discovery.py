@@ -0,0 +1,300 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import socket
+import logging
+import threading
+import zmq
+from . import codec
+from .msgbuilder import MSGBuilder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DISCOVERY_PORT = 54545
+
+class NodeInfo:
+    # The API only documents NetworkAddress and NetworkPort. The publisher is
+    # taken to be on NetworkPort and the request socket on the port after it,
+    # as with the default 54543/54544 pair.
+    __slots__ = ("address", "port", "version", "first_seen", "last_seen", "rtt", "num_pings",
+                 "socket", "ping_seq_num", "ping_sent")
+
+    def __init__(self, address, port):
+        self.address = address
+        self.port = port
+        self.version = None
+        self.first_seen = time.time()
+        self.last_seen = self.first_seen
+        self.rtt = None
+        self.num_pings = 0
+        self.socket = None
+        self.ping_seq_num = None
+        self.ping_sent = None
+
+    def get_key(self):
+        return (self.address, self.port)
+
+    def get_publisher(self):
+        return "tcp://{0}:{1}".format(self.address, self.port)
+
+    def get_reqrep(self):
+        return "tcp://{0}:{1}".format(self.address, self.port + 1)
+
+    def to_dict(self):
+        return {
+            "NetworkAddress": self.address,
+            "NetworkPort": self.port,
+            "NetworkVersion": self.version,
+            "publisher": self.get_publisher(),
+            "reqrep": self.get_reqrep(),
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "rtt": self.rtt,
+            "num_pings": self.num_pings,
+        }
+
+class Discovery:
+    # Builds a registry of reachable nodes from NetworkDiscovery datagrams
+    # and from NetworkPing messages on any publishers it is given. Each node
+    # is sent a NetworkPing request every ping_interval seconds, and rtt is
+    # the smoothed round trip time of those, measured on the local clock
+    # only, which is what the nearest node is chosen by.
+    def __init__(self, port=DEFAULT_DISCOVERY_PORT, publishers=(), expiry=10.0,
+                 smoothing=0.2, poll_interval=100, ping_interval=1.0):
+        self.__port = port
+        self.__publishers = list(publishers)
+        self.__expiry = expiry
+        self.__smoothing = smoothing
+        self.__poll_interval = poll_interval
+        self.__ping_interval = ping_interval
+        self.__lock = threading.Lock()
+        self.__changed = threading.Condition(self.__lock)
+        self.__nodes = dict()
+        self.__msgbuilder = MSGBuilder()
+        self.__poller = None
+        self.__running = False
+        self.__thread = None
+        self.__error = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        if self.__thread:
+            return
+        self.__running = True
+        self.__error = None
+        self.__thread = threading.Thread(target=self.__run, name="smartshooter-discovery")
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        self.__running = False
+        if self.__thread:
+            self.__thread.join()
+            self.__thread = None
+
+    def get_error(self):
+        # the exception that stopped the discovery thread, if any
+        return self.__error
+
+    def __run(self):
+        try:
+            self.__listen()
+        except Exception as e:
+            logger.exception("Discovery stopped")
+            with self.__lock:
+                self.__error = e
+                self.__changed.notify_all()
+
+    def __listen(self):
+        zmq_ctx = zmq.Context.instance()
+        self.__poller = poller = zmq.Poller()
+        udp_socket = None
+        udp_fd = None
+        sub_sockets = []
+        try:
+            if self.__port:
+                udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                udp_socket.bind(("", self.__port))
+                udp_socket.setblocking(False)
+                # the poller reports plain sockets by file descriptor
+                udp_fd = udp_socket.fileno()
+                poller.register(udp_fd, zmq.POLLIN)
+            for publisher in self.__publishers:
+                sub_socket = zmq_ctx.socket(zmq.SUB)
+                sub_sockets.append(sub_socket)
+                sub_socket.setsockopt(zmq.SUBSCRIBE, b"")
+                sub_socket.connect(publisher)
+                poller.register(sub_socket, zmq.POLLIN)
+            while self.__running:
+                for sock, event in poller.poll(self.__poll_interval):
+                    try:
+                        if sock == udp_fd:
+                            data, address = udp_socket.recvfrom(65536)
+                            self.process_message(data, address[0])
+                        elif sock in sub_sockets:
+                            self.process_message(sock.recv())
+                        else:
+                            self.__process_reply(sock, sock.recv_multipart()[-1])
+                    except Exception:
+                        # e.g. a malformed datagram from something else on the port
+                        logger.exception("Ignoring bad discovery message")
+                self.__send_pings()
+        finally:
+            if udp_socket is not None:
+                udp_socket.close()
+            for sub_socket in sub_sockets:
+                sub_socket.close(0)
+            with self.__lock:
+                for node in self.__nodes.values():
+                    if node.socket is not None:
+                        node.socket.close(0)
+                        node.socket = None
+            self.__poller = None
+
+    def __send_pings(self):
+        # runs on the discovery thread, which owns the ping sockets. A node
+        # only ever has one ping outstanding, and if that goes unanswered for
+        # ping_interval the socket is replaced, dropping the queued ping, so
+        # an unreachable node can't fill the socket's queue.
+        now = time.perf_counter()
+        with self.__lock:
+            alive = self.__get_alive()
+            for node in self.__nodes.values():
+                if node.socket is not None and node not in alive:
+                    self.__close_socket(node)
+            for node in alive:
+                if node.ping_sent is not None and now - node.ping_sent < self.__ping_interval:
+                    continue
+                if node.ping_seq_num is not None:
+                    self.__close_socket(node)
+                try:
+                    if node.socket is None:
+                        node.socket = zmq.Context.instance().socket(zmq.DEALER)
+                        node.socket.setsockopt(zmq.LINGER, 0)
+                        node.socket.connect(node.get_reqrep())
+                        self.__poller.register(node.socket, zmq.POLLIN)
+                    msg = self.__msgbuilder.build_NetworkPing(int(time.time() * 1000))
+                    # a reply to an earlier ping that arrives late is ignored
+                    node.ping_seq_num = self.__msgbuilder.get_last_seq_num()
+                    node.ping_sent = now
+                    node.socket.send_multipart([b"", msg.encode("utf-8")], zmq.NOBLOCK)
+                except zmq.ZMQError:
+                    logger.exception("Failed to ping %s", node.get_reqrep())
+                    self.__close_socket(node)
+
+    def __close_socket(self, node):
+        if node.socket is not None:
+            self.__poller.unregister(node.socket)
+            node.socket.close(0)
+            node.socket = None
+        node.ping_seq_num = None
+
+    def __process_reply(self, sock, data):
+        received = time.perf_counter()
+        reply = codec.loads(data)
+        with self.__lock:
+            for node in self.__nodes.values():
+                if node.socket is sock:
+                    break
+            else:
+                return
+            if reply.get("msg_seq_num") != node.ping_seq_num:
+                return
+            rtt = received - node.ping_sent
+            if node.rtt is None:
+                node.rtt = rtt
+            else:
+                node.rtt += self.__smoothing * (rtt - node.rtt)
+            node.num_pings += 1
+            node.ping_seq_num = None
+            self.__changed.notify_all()
+
+    def process_message(self, data, sender=None):
+        received = time.time()
+        msg_id = codec.peek_field(data, "msg_id")
+        if msg_id not in ("NetworkDiscovery", "NetworkPing"):
+            return False
+        msg = codec.loads(data)
+        address = msg.get("NetworkAddress") or sender
+        port = msg.get("NetworkPort")
+        if not address or port is None:
+            return False
+        with self.__lock:
+            key = (address, int(port))
+            node = self.__nodes.get(key)
+            if node is None:
+                node = self.__nodes[key] = NodeInfo(address, int(port))
+            node.last_seen = received
+            if "NetworkVersion" in msg:
+                node.version = msg["NetworkVersion"]
+            self.__changed.notify_all()
+        return True
+
+    def __get_alive(self):
+        cutoff = time.time() - self.__expiry
+        return [node for node in self.__nodes.values() if node.last_seen >= cutoff]
+
+    def get_nodes(self):
+        with self.__lock:
+            return [node.to_dict() for node in self.__get_alive()]
+
+    def __get_nearest(self):
+        nodes = self.__get_alive()
+        if not nodes:
+            return None
+        # nodes that haven't answered a ping yet go last
+        def distance(node):
+            if node.rtt is None:
+                return (1, -node.last_seen)
+            return (0, node.rtt)
+        return min(nodes, key=distance).to_dict()
+
+    def get_nearest_node(self):
+        with self.__lock:
+            return self.__get_nearest()
+
+    def wait_for_node(self, timeout=None):
+        # returns the nearest node, waiting for one to be seen if necessary
+        if timeout is not None:
+            deadline = time.time() + timeout
+        with self.__lock:
+            while True:
+                if self.__error is not None:
+                    raise RuntimeError("discovery stopped") from self.__error
+                node = self.__get_nearest()
+                if node is not None:
+                    return node
+                remaining = None
+                if timeout is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return None
+                self.__changed.wait(remaining)
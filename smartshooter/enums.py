@@ -24,18 +24,21 @@
 from enum import Enum
 
 class Property(Enum):
-    Aperture     = 1
-    ShutterSpeed = 2
-    ISO          = 3
-    Exposure     = 4
-    Quality      = 5
-    ProgramMode  = 6
-    MeteringMode = 7
-    FocusMode    = 8
-    DriveMode    = 9
-    WhiteBalance = 10
-    Storage      = 11
-    MirrorLockup = 12
+    Aperture          = 1
+    ShutterSpeed      = 2
+    ISO               = 3
+    Exposure          = 4
+    Quality           = 5
+    ProgramMode       = 6
+    MeteringMode      = 7
+    FocusMode         = 8
+    DriveMode         = 9
+    WhiteBalance      = 10
+    Storage           = 11
+    MirrorLockup      = 12
+    ColourTemperature = 13
+    PixelShiftMode    = 14
+    ControlMode       = 15
 
 class CameraSelectionMode(Enum):
     All      = 1
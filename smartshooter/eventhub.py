@@ -0,0 +1,252 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import sys
+import time
+import threading
+from . import codec
+from .eventpump import EventPump
+from .liveview import decode_liveview_image
+
+class EventHub:
+    # Owns the state tracker and everything fed by the event subscription,
+    # so several contexts can share one subscriber socket and one tracker.
+    def __init__(self, socket, tracker, event_thread=False, metrics=None):
+        self.__socket = socket
+        self.__tracker = tracker
+        self.__lock = threading.RLock()
+        self.__state_changed = threading.Condition(self.__lock)
+        self.__generation = 0
+        self.__event_lock = threading.Lock()
+        self.__event_handlers = dict()
+        self.__event_ids = frozenset(self.__tracker.get_event_ids())
+        self.__liveview_streams = ()
+        self.__liveview_sinks = ()
+        self.__metrics = metrics
+        if metrics is not None:
+            self.process_event = self.__process_event_timed
+        self.__event_pump = None
+        if event_thread:
+            self.__event_pump = EventPump(self.__socket, self.process_event, on_failed=self.__on_pump_failed)
+            self.__event_pump.start()
+
+    def stop(self):
+        if self.__event_pump:
+            self.__event_pump.stop()
+            self.__event_pump = None
+
+    def get_tracker(self):
+        return self.__tracker
+
+    def get_lock(self):
+        return self.__lock
+
+    def get_metrics(self):
+        return self.__metrics
+
+    def has_event_thread(self):
+        return self.__event_pump is not None
+
+    def __on_pump_failed(self):
+        # wakes up waiters, so check_status can raise the error
+        with self.__lock:
+            self.notify_changed()
+
+    def notify_changed(self):
+        # must be called with the lock held
+        self.__generation += 1
+        self.__state_changed.notify_all()
+
+    def process_event(self, jstr):
+        # skip decoding events that neither the tracker nor a handler want
+        msg_id = codec.peek_field(jstr, "msg_id")
+        if msg_id == "LiveviewUpdated" and (self.__liveview_streams or self.__liveview_sinks):
+            return self.__process_liveview(jstr)
+        if msg_id is not None and msg_id not in self.__event_ids:
+            return False
+        event = codec.loads(jstr)
+        with self.__lock:
+            changed = self.__tracker.process_event(event)
+            if changed:
+                self.notify_changed()
+            handlers = self.__event_handlers.get(event["msg_id"])
+        if handlers:
+            for handler in handlers:
+                handler(event)
+        return changed
+
+    def __process_event_timed(self, jstr):
+        metrics = self.__metrics
+        msg_id = codec.peek_field(jstr, "msg_id")
+        if msg_id is not None:
+            metrics.count_event(msg_id)
+        if msg_id == "LiveviewUpdated" and (self.__liveview_streams or self.__liveview_sinks):
+            return self.__process_liveview(jstr)
+        if msg_id is not None and msg_id not in self.__event_ids:
+            return False
+        start = time.perf_counter()
+        event = codec.loads(jstr)
+        parsed = time.perf_counter()
+        if msg_id is None:
+            msg_id = event["msg_id"]
+            metrics.count_event(msg_id)
+        metrics.observe_event("parse", msg_id, parsed - start)
+        with self.__lock:
+            changed = self.__tracker.process_event(event)
+            metrics.observe_event("tracker", msg_id, time.perf_counter() - parsed)
+            if changed:
+                self.notify_changed()
+            handlers = self.__event_handlers.get(event["msg_id"])
+        if handlers:
+            for handler in handlers:
+                handler(event)
+        return changed
+
+    def __process_liveview(self, jstr):
+        key = codec.peek_field(jstr, "CameraKey")
+        if key is None:
+            key = codec.loads(jstr).get("CameraKey")
+        changed = False
+        with self.__lock:
+            for frames in self.__liveview_streams:
+                changed = frames.put(key, jstr) or changed
+            if changed:
+                self.notify_changed()
+            sinks = self.__liveview_sinks
+            handlers = self.__event_handlers.get("LiveviewUpdated")
+        image = None
+        for cameras, sink in sinks:
+            if cameras is None or key in cameras:
+                if image is None:
+                    image = decode_liveview_image(jstr)
+                    if image is None:
+                        break
+                sink(key, image)
+        if handlers:
+            event = codec.loads(jstr)
+            for handler in handlers:
+                handler(event)
+        return changed
+
+    def add_liveview_sink(self, sink, cameras=None):
+        if cameras is not None:
+            cameras = frozenset(cameras)
+        with self.__lock:
+            self.__liveview_sinks = self.__liveview_sinks + ((cameras, sink),)
+
+    def remove_liveview_sink(self, sink):
+        with self.__lock:
+            self.__liveview_sinks = tuple(entry for entry in self.__liveview_sinks if entry[1] != sink)
+
+    def add_liveview_stream(self, frames):
+        with self.__lock:
+            self.__liveview_streams = self.__liveview_streams + (frames,)
+
+    def remove_liveview_stream(self, frames):
+        with self.__lock:
+            streams = list(self.__liveview_streams)
+            streams.remove(frames)
+            self.__liveview_streams = tuple(streams)
+
+    def add_event_handler(self, msg_id, handler):
+        with self.__lock:
+            handlers = self.__event_handlers.get(msg_id, ())
+            self.__event_handlers[msg_id] = handlers + (handler,)
+            self.__event_ids = self.__event_ids | {msg_id}
+
+    def remove_event_handler(self, msg_id, handler):
+        with self.__lock:
+            handlers = list(self.__event_handlers.get(msg_id, ()))
+            if handler in handlers:
+                handlers.remove(handler)
+            if handlers:
+                self.__event_handlers[msg_id] = tuple(handlers)
+            else:
+                self.__event_handlers.pop(msg_id, None)
+                self.__event_ids = frozenset(self.__tracker.get_event_ids()) | set(self.__event_handlers)
+
+    def read_events(self):
+        if self.__event_pump:
+            # the event thread owns the subscriber socket
+            return
+        if not self.__event_lock.acquire(False):
+            # another thread is already reading events
+            return
+        num_events = 0
+        try:
+            while True:
+                self.check_status()
+                jstr = self.__socket.recv_event()
+                if not jstr:
+                    break
+                self.process_event(jstr)
+                num_events += 1
+        finally:
+            self.__event_lock.release()
+        if self.__metrics is not None:
+            # how far behind the subscriber socket was
+            self.__metrics.set_gauge("events_per_drain", num_events)
+
+    def check_status(self):
+        ok = self.__socket.check_status()
+        if not ok:
+            sys.exit()
+        if self.__event_pump and self.__event_pump.get_error() is not None:
+            raise RuntimeError("event thread stopped") from self.__event_pump.get_error()
+
+    def wait_for(self, predicate, timeout=None):
+        if timeout is None:
+            deadline = None
+        else:
+            deadline = time.time() + timeout
+        generation = None
+        while True:
+            self.check_status()
+            with self.__lock:
+                # the predicate is only re-evaluated if tracked state changed
+                if generation != self.__generation:
+                    generation = self.__generation
+                    if predicate():
+                        return True
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        return False
+                if self.__event_pump:
+                    # check_status raises once the event thread has failed
+                    if self.__event_pump.get_error() is None:
+                        self.__state_changed.wait(remaining)
+                    continue
+            self.__wait_for_change(remaining)
+
+    def __wait_for_change(self, remaining):
+        # blocks in the socket poll, waking up periodically to check status
+        poll_interval = 0.1
+        if remaining is not None:
+            poll_interval = min(poll_interval, remaining)
+        with self.__event_lock:
+            jstr = self.__socket.recv_event(int(poll_interval * 1000))
+            while jstr:
+                self.process_event(jstr)
+                jstr = self.__socket.recv_event()
@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class EventPump:
+    def __init__(self, socket, handler, poll_interval=100, on_failed=None):
+        self.__socket = socket
+        self.__handler = handler
+        self.__poll_interval = poll_interval
+        self.__on_failed = on_failed
+        self.__running = False
+        self.__thread = None
+        self.__error = None
+
+    def start(self):
+        if self.__thread:
+            return
+        self.__running = True
+        self.__thread = threading.Thread(target=self.__run, name="smartshooter-events")
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def stop(self):
+        self.__running = False
+        if self.__thread:
+            self.__thread.join()
+            self.__thread = None
+
+    def is_running(self):
+        return self.__thread is not None
+
+    def get_error(self):
+        # the exception that stopped the thread, if the socket failed
+        return self.__error
+
+    def __run(self):
+        try:
+            while self.__running:
+                jstr = self.__socket.recv_event(self.__poll_interval)
+                if jstr:
+                    try:
+                        self.__handler(jstr)
+                    except Exception:
+                        # a failing event handler or a malformed event mustn't
+                        # stop the events that keep the tracker up to date
+                        logger.exception("Error processing event")
+        except Exception as e:
+            logger.exception("Event thread stopped")
+            self.__error = e
+            if self.__on_failed is not None:
+                self.__on_failed()
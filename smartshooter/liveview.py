@@ -0,0 +1,79 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import re
+import binascii
+from . import codec
+
+LIVEVIEW_IMAGE_VALUE = re.compile(rb'\s*:\s*"')
+
+def decode_liveview_image(raw):
+    # Decodes the base64 JPEG in a LiveviewUpdated message straight from the
+    # received buffer, without first decoding the JSON into a python string.
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    needle = b'"CameraLiveviewImage"'
+    pos = raw.find(needle)
+    if pos >= 0:
+        # the value must be a string, not e.g. null followed by another key
+        match = LIVEVIEW_IMAGE_VALUE.match(raw, pos + len(needle))
+        if match is not None:
+            start = match.end()
+            end = raw.find(b'"', start)
+            if end > 0 and raw.find(b"\\", start, end) < 0:
+                return binascii.a2b_base64(memoryview(raw)[start:end])
+    # fall back to decoding the whole message, e.g. if "/" was escaped
+    msg = codec.loads(raw)
+    image = msg.get("CameraLiveviewImage")
+    if not isinstance(image, str):
+        return None
+    return binascii.a2b_base64(image)
+
+class LiveviewFrames:
+    # Keeps only the most recent undecoded frame for each camera, so a slow
+    # consumer skips frames instead of queueing them.
+    def __init__(self, cameras=None):
+        self.__cameras = None
+        if cameras is not None:
+            self.__cameras = frozenset(cameras)
+        self.__frames = dict()
+        self.__num_dropped = 0
+
+    def put(self, key, raw):
+        if self.__cameras is not None and key not in self.__cameras:
+            return False
+        if key in self.__frames:
+            self.__num_dropped += 1
+        self.__frames[key] = raw
+        return True
+
+    def has_frames(self):
+        return bool(self.__frames)
+
+    def take(self):
+        frames = self.__frames
+        self.__frames = dict()
+        return frames
+
+    def get_num_dropped(self):
+        return self.__num_dropped
@@ -0,0 +1,182 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import struct
+from multiprocessing import shared_memory
+
+# Shared memory layout, all little endian:
+#
+#   header:  magic, version, num_cameras, num_slots, slot_size, key_size
+#   cameras: num_cameras x (key, key length, number of frames written)
+#   slots:   num_cameras x num_slots x (frame seq, timestamp, length, data)
+#
+# A camera's key length is written after its key bytes, readers ignore the
+# camera until the length is set. A slot's frame seq is set to 0 while the
+# writer is updating it, readers copy the frame and then check the seq is
+# unchanged.
+
+MAGIC = b"SSLV"
+VERSION = 2
+HEADER = struct.Struct("<4sIIIII")
+KEY_LENGTH = struct.Struct("<I4x")
+CAMERA = struct.Struct("<Q")
+SLOT = struct.Struct("<QdI4x")
+
+class LiveviewRing:
+    def __init__(self, name=None, create=True, num_cameras=64, num_slots=3, slot_size=1 << 20, key_size=64):
+        if create:
+            size = HEADER.size
+            size += num_cameras * (key_size + KEY_LENGTH.size + CAMERA.size)
+            size += num_cameras * num_slots * (SLOT.size + slot_size)
+            self.__shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            HEADER.pack_into(self.__shm.buf, 0, MAGIC, VERSION, num_cameras, num_slots, slot_size, key_size)
+        else:
+            self.__shm = shared_memory.SharedMemory(name=name)
+            # the creating process owns the segment, stop python's resource
+            # tracker from unlinking it when this process exits
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(self.__shm._name, "shared_memory")
+            except (ImportError, AttributeError):
+                pass
+            magic, version, num_cameras, num_slots, slot_size, key_size = HEADER.unpack_from(self.__shm.buf, 0)
+            if magic != MAGIC or version != VERSION:
+                self.__shm.close()
+                raise ValueError("not a liveview ring: {}".format(name))
+        self.__is_owner = create
+        self.__num_cameras = num_cameras
+        self.__num_slots = num_slots
+        self.__slot_size = slot_size
+        self.__key_size = key_size
+        self.__camera_offset = HEADER.size
+        self.__slot_offset = self.__camera_offset + num_cameras * (key_size + KEY_LENGTH.size + CAMERA.size)
+        self.__indexes = dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_name(self):
+        return self.__shm.name
+
+    def close(self):
+        self.__shm.close()
+        if self.__is_owner:
+            self.__shm.unlink()
+
+    def __get_camera_offset(self, index):
+        return self.__camera_offset + index * (self.__key_size + KEY_LENGTH.size + CAMERA.size)
+
+    def __get_slot_offset(self, index, slot):
+        return self.__slot_offset + (index * self.__num_slots + slot) * (SLOT.size + self.__slot_size)
+
+    def __read_key(self, index):
+        offset = self.__get_camera_offset(index)
+        length = KEY_LENGTH.unpack_from(self.__shm.buf, offset + self.__key_size)[0]
+        if length == 0 or length > self.__key_size:
+            # not published yet
+            return None
+        return bytes(self.__shm.buf[offset:offset + length]).decode("utf-8")
+
+    def __refresh_indexes(self):
+        for index in range(len(self.__indexes), self.__num_cameras):
+            key = self.__read_key(index)
+            if not key:
+                break
+            self.__indexes[key] = index
+
+    def __add_camera(self, key):
+        index = len(self.__indexes)
+        if index >= self.__num_cameras:
+            return None
+        encoded = key.encode("utf-8")
+        if not encoded or len(encoded) > self.__key_size:
+            return None
+        offset = self.__get_camera_offset(index)
+        buf = self.__shm.buf
+        CAMERA.pack_into(buf, offset + self.__key_size + KEY_LENGTH.size, 0)
+        buf[offset:offset + len(encoded)] = encoded
+        # publish the key only once all of its bytes are in place
+        KEY_LENGTH.pack_into(buf, offset + self.__key_size, len(encoded))
+        self.__indexes[key] = index
+        return index
+
+    def get_camera_keys(self):
+        self.__refresh_indexes()
+        return list(self.__indexes)
+
+    def write(self, key, data, timestamp=None):
+        index = self.__indexes.get(key)
+        if index is None:
+            index = self.__add_camera(key)
+            if index is None:
+                return False
+        if len(data) > self.__slot_size:
+            return False
+        if timestamp is None:
+            timestamp = time.time()
+        buf = self.__shm.buf
+        camera_offset = self.__get_camera_offset(index) + self.__key_size + KEY_LENGTH.size
+        seq = CAMERA.unpack_from(buf, camera_offset)[0] + 1
+        slot_offset = self.__get_slot_offset(index, seq % self.__num_slots)
+        SLOT.pack_into(buf, slot_offset, 0, timestamp, len(data))
+        data_offset = slot_offset + SLOT.size
+        buf[data_offset:data_offset + len(data)] = data
+        SLOT.pack_into(buf, slot_offset, seq, timestamp, len(data))
+        CAMERA.pack_into(buf, camera_offset, seq)
+        return True
+
+    def read(self, key, retries=3):
+        # returns (seq, timestamp, data) for the newest frame of the camera
+        index = self.__indexes.get(key)
+        if index is None:
+            self.__refresh_indexes()
+            index = self.__indexes.get(key)
+            if index is None:
+                return None
+        buf = self.__shm.buf
+        camera_offset = self.__get_camera_offset(index) + self.__key_size + KEY_LENGTH.size
+        for attempt in range(retries):
+            seq = CAMERA.unpack_from(buf, camera_offset)[0]
+            if seq == 0:
+                return None
+            slot_offset = self.__get_slot_offset(index, seq % self.__num_slots)
+            slot_seq, timestamp, length = SLOT.unpack_from(buf, slot_offset)
+            if slot_seq != seq:
+                continue
+            data_offset = slot_offset + SLOT.size
+            data = bytes(buf[data_offset:data_offset + length])
+            if SLOT.unpack_from(buf, slot_offset)[0] == seq:
+                return seq, timestamp, data
+        return None
+
+    def read_all(self):
+        frames = dict()
+        for key in self.get_camera_keys():
+            frame = self.read(key)
+            if frame is not None:
+                frames[key] = frame
+        return frames
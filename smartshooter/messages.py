@@ -0,0 +1,448 @@
+# Generated by utils/smartshooter-genschema.py from external_api.json, do not edit.
+
+from .templates import encode_string
+from .templates import encode_strings
+from .templates import encode_int
+from .templates import encode_float
+from .templates import encode_bool
+from .templates import encode_value
+from .templates import encode_camera_selection
+from .templates import encode_photo_selection
+from .templates import encode_fields
+from .templates import decode_message
+
+REQUEST_FIELDS = {
+    "NetworkPing": (),
+    "SetOptions": ("FilenameExpression", "PhotoSessionName", "PhotoSessionNum", "UniqueTag", "Barcode", "DefaultStorage", "DefaultControlMode", "DefaultFocusMode", "DefaultLiveviewFPS", "DefaultVideoFPS", "AutoConnect", "AutoSynchroniseTime", "AutoScanBarcode", "FilterBarcodeScanning", "BarcodeCameraFilter", "ResetSequenceNumOnEdit", "ResetBatchNumOnEdit", "DownloadPath", "FallbackPath", "AllowSpacesInFilename"),
+    "SetSequenceNum": ("PhotoSequenceNum",),
+    "SetBatchNum": ("PhotoBatchNum",),
+    "RenameCamera": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "CameraName"),
+    "RenameNode": (),
+    "RenamePhoto": ("PhotoSelection", "PhotoKey", "PhotoKeys", "PhotoComputedName"),
+    "DetectCameras": (),
+    "Connect": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup"),
+    "Disconnect": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup"),
+    "Shoot": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "BulbTimer", "PhotoOrigin"),
+    "Autofocus": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup"),
+    "Identify": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup"),
+    "LiveviewFocus": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "CameraLiveviewFocusStep"),
+    "LiveviewPosition": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "CameraLiveviewPositionX", "CameraLiveviewPositionY"),
+    "EnableLiveview": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "Enable"),
+    "EnableLiveviewZoom": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "Enable"),
+    "EnableLiveviewDOF": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "Enable"),
+    "EnableVideo": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "Enable"),
+    "SetProperty": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "CameraPropertyType", "CameraPropertyValue"),
+    "IncrementProperty": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "CameraPropertyType", "CameraPropertyStep"),
+    "Download": ("PhotoSelection", "PhotoKey", "PhotoKeys"),
+    "Transfer": ("PhotoSelection", "PhotoKey", "PhotoKeys"),
+    "Reshoot": ("PhotoSelection", "PhotoKey", "PhotoKeys"),
+    "Delete": ("PhotoSelection", "PhotoKey", "PhotoKeys", "DeleteFiles"),
+    "Format": (),
+    "SyncClocks": ("CameraDateTimeOffset",),
+    "CheckClocks": (),
+    "Synchronise": (),
+    "GetCamera": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup"),
+    "TransferPhoto": (),
+    "License": (),
+    "LiveviewFPS": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "CameraLiveviewFPS", "CameraLiveviewVideoFPS"),
+    "SetShutterButton": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "CameraShutterButton"),
+    "RemoveNode": (),
+    "SyncBatchNum": (),
+    "SetCameraGroup": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup"),
+    "SetCameraTriggerIndex": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "CameraTriggerIndex"),
+    "ActivateLicense": ("ActivationCode",),
+    "DeactivateLicense": (),
+    "Shutdown": (),
+    "PowerZoomPosition": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "CameraPowerZoomPosition"),
+    "PowerZoomDirection": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "CameraPowerZoomDirection"),
+    "PowerZoomStop": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup"),
+    "EngageLatch": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup", "CameraLatchIndex"),
+    "ReleaseLatch": ("CameraLatchIndex",),
+    "CancelLatch": ("CameraLatchIndex",),
+    "EngageTrigger": ("CameraSelection", "CameraKey", "CameraKeys", "CameraGroup"),
+    "ReleaseTrigger": ("CameraTriggerInterval",),
+    "CancelTrigger": (),
+}
+
+def build_NetworkPing(seq_num, **fields):
+    return '{"msg_type":"Request","msg_id":"NetworkPing","msg_seq_num":' + str(seq_num) + encode_fields(fields) + "}"
+
+def build_SetOptions(seq_num, FilenameExpression=None, PhotoSessionName=None, PhotoSessionNum=None, UniqueTag=None, Barcode=None, DefaultStorage=None, DefaultControlMode=None, DefaultFocusMode=None, DefaultLiveviewFPS=None, DefaultVideoFPS=None, AutoConnect=None, AutoSynchroniseTime=None, AutoScanBarcode=None, FilterBarcodeScanning=None, BarcodeCameraFilter=None, ResetSequenceNumOnEdit=None, ResetBatchNumOnEdit=None, DownloadPath=None, FallbackPath=None, AllowSpacesInFilename=None):
+    msg = '{"msg_type":"Request","msg_id":"SetOptions","msg_seq_num":' + str(seq_num)
+    if FilenameExpression is not None:
+        msg += ',"FilenameExpression":' + encode_string(FilenameExpression)
+    if PhotoSessionName is not None:
+        msg += ',"PhotoSessionName":' + encode_string(PhotoSessionName)
+    if PhotoSessionNum is not None:
+        msg += ',"PhotoSessionNum":' + encode_int(PhotoSessionNum)
+    if UniqueTag is not None:
+        msg += ',"UniqueTag":' + encode_string(UniqueTag)
+    if Barcode is not None:
+        msg += ',"Barcode":' + encode_string(Barcode)
+    if DefaultStorage is not None:
+        msg += ',"DefaultStorage":' + encode_string(DefaultStorage)
+    if DefaultControlMode is not None:
+        msg += ',"DefaultControlMode":' + encode_string(DefaultControlMode)
+    if DefaultFocusMode is not None:
+        msg += ',"DefaultFocusMode":' + encode_string(DefaultFocusMode)
+    if DefaultLiveviewFPS is not None:
+        msg += ',"DefaultLiveviewFPS":' + encode_int(DefaultLiveviewFPS)
+    if DefaultVideoFPS is not None:
+        msg += ',"DefaultVideoFPS":' + encode_int(DefaultVideoFPS)
+    if AutoConnect is not None:
+        msg += ',"AutoConnect":' + encode_bool(AutoConnect)
+    if AutoSynchroniseTime is not None:
+        msg += ',"AutoSynchroniseTime":' + encode_bool(AutoSynchroniseTime)
+    if AutoScanBarcode is not None:
+        msg += ',"AutoScanBarcode":' + encode_bool(AutoScanBarcode)
+    if FilterBarcodeScanning is not None:
+        msg += ',"FilterBarcodeScanning":' + encode_value(FilterBarcodeScanning)
+    if BarcodeCameraFilter is not None:
+        msg += ',"BarcodeCameraFilter":' + encode_value(BarcodeCameraFilter)
+    if ResetSequenceNumOnEdit is not None:
+        msg += ',"ResetSequenceNumOnEdit":' + encode_value(ResetSequenceNumOnEdit)
+    if ResetBatchNumOnEdit is not None:
+        msg += ',"ResetBatchNumOnEdit":' + encode_value(ResetBatchNumOnEdit)
+    if DownloadPath is not None:
+        msg += ',"DownloadPath":' + encode_string(DownloadPath)
+    if FallbackPath is not None:
+        msg += ',"FallbackPath":' + encode_string(FallbackPath)
+    if AllowSpacesInFilename is not None:
+        msg += ',"AllowSpacesInFilename":' + encode_bool(AllowSpacesInFilename)
+    return msg + "}"
+
+def build_SetSequenceNum(seq_num, PhotoSequenceNum=None):
+    msg = '{"msg_type":"Request","msg_id":"SetSequenceNum","msg_seq_num":' + str(seq_num)
+    if PhotoSequenceNum is not None:
+        msg += ',"PhotoSequenceNum":' + encode_int(PhotoSequenceNum)
+    return msg + "}"
+
+def build_SetBatchNum(seq_num, PhotoBatchNum=None):
+    msg = '{"msg_type":"Request","msg_id":"SetBatchNum","msg_seq_num":' + str(seq_num)
+    if PhotoBatchNum is not None:
+        msg += ',"PhotoBatchNum":' + encode_int(PhotoBatchNum)
+    return msg + "}"
+
+def build_RenameCamera(seq_num, selection, CameraName=None):
+    msg = '{"msg_type":"Request","msg_id":"RenameCamera","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraName is not None:
+        msg += ',"CameraName":' + encode_string(CameraName)
+    return msg + "}"
+
+def build_RenameNode(seq_num, **fields):
+    return '{"msg_type":"Request","msg_id":"RenameNode","msg_seq_num":' + str(seq_num) + encode_fields(fields) + "}"
+
+def build_RenamePhoto(seq_num, selection, PhotoComputedName=None):
+    msg = '{"msg_type":"Request","msg_id":"RenamePhoto","msg_seq_num":' + str(seq_num) + encode_photo_selection(selection)
+    if PhotoComputedName is not None:
+        msg += ',"PhotoComputedName":' + encode_string(PhotoComputedName)
+    return msg + "}"
+
+def build_DetectCameras(seq_num):
+    msg = '{"msg_type":"Request","msg_id":"DetectCameras","msg_seq_num":' + str(seq_num)
+    return msg + "}"
+
+def build_Connect(seq_num, selection):
+    msg = '{"msg_type":"Request","msg_id":"Connect","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    return msg + "}"
+
+def build_Disconnect(seq_num, selection):
+    msg = '{"msg_type":"Request","msg_id":"Disconnect","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    return msg + "}"
+
+def build_Shoot(seq_num, selection, BulbTimer=None, PhotoOrigin=None):
+    msg = '{"msg_type":"Request","msg_id":"Shoot","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if BulbTimer is not None:
+        msg += ',"BulbTimer":' + encode_int(BulbTimer)
+    if PhotoOrigin is not None:
+        msg += ',"PhotoOrigin":' + encode_string(PhotoOrigin)
+    return msg + "}"
+
+def build_Autofocus(seq_num, selection):
+    msg = '{"msg_type":"Request","msg_id":"Autofocus","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    return msg + "}"
+
+def build_Identify(seq_num, selection):
+    msg = '{"msg_type":"Request","msg_id":"Identify","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    return msg + "}"
+
+def build_LiveviewFocus(seq_num, selection, CameraLiveviewFocusStep=None):
+    msg = '{"msg_type":"Request","msg_id":"LiveviewFocus","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraLiveviewFocusStep is not None:
+        msg += ',"CameraLiveviewFocusStep":' + encode_string(CameraLiveviewFocusStep)
+    return msg + "}"
+
+def build_LiveviewPosition(seq_num, selection, CameraLiveviewPositionX=None, CameraLiveviewPositionY=None):
+    msg = '{"msg_type":"Request","msg_id":"LiveviewPosition","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraLiveviewPositionX is not None:
+        msg += ',"CameraLiveviewPositionX":' + encode_value(CameraLiveviewPositionX)
+    if CameraLiveviewPositionY is not None:
+        msg += ',"CameraLiveviewPositionY":' + encode_value(CameraLiveviewPositionY)
+    return msg + "}"
+
+def build_EnableLiveview(seq_num, selection, Enable=None):
+    msg = '{"msg_type":"Request","msg_id":"EnableLiveview","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if Enable is not None:
+        msg += ',"Enable":' + encode_bool(Enable)
+    return msg + "}"
+
+def build_EnableLiveviewZoom(seq_num, selection, Enable=None):
+    msg = '{"msg_type":"Request","msg_id":"EnableLiveviewZoom","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if Enable is not None:
+        msg += ',"Enable":' + encode_bool(Enable)
+    return msg + "}"
+
+def build_EnableLiveviewDOF(seq_num, selection, Enable=None):
+    msg = '{"msg_type":"Request","msg_id":"EnableLiveviewDOF","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if Enable is not None:
+        msg += ',"Enable":' + encode_bool(Enable)
+    return msg + "}"
+
+def build_EnableVideo(seq_num, selection, Enable=None):
+    msg = '{"msg_type":"Request","msg_id":"EnableVideo","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if Enable is not None:
+        msg += ',"Enable":' + encode_bool(Enable)
+    return msg + "}"
+
+def build_SetProperty(seq_num, selection, CameraPropertyType=None, CameraPropertyValue=None):
+    msg = '{"msg_type":"Request","msg_id":"SetProperty","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraPropertyType is not None:
+        msg += ',"CameraPropertyType":' + encode_string(CameraPropertyType)
+    if CameraPropertyValue is not None:
+        msg += ',"CameraPropertyValue":' + encode_string(CameraPropertyValue)
+    return msg + "}"
+
+def build_IncrementProperty(seq_num, selection, CameraPropertyType=None, CameraPropertyStep=None):
+    msg = '{"msg_type":"Request","msg_id":"IncrementProperty","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraPropertyType is not None:
+        msg += ',"CameraPropertyType":' + encode_string(CameraPropertyType)
+    if CameraPropertyStep is not None:
+        msg += ',"CameraPropertyStep":' + encode_int(CameraPropertyStep)
+    return msg + "}"
+
+def build_Download(seq_num, selection):
+    msg = '{"msg_type":"Request","msg_id":"Download","msg_seq_num":' + str(seq_num) + encode_photo_selection(selection)
+    return msg + "}"
+
+def build_Transfer(seq_num, selection):
+    msg = '{"msg_type":"Request","msg_id":"Transfer","msg_seq_num":' + str(seq_num) + encode_photo_selection(selection)
+    return msg + "}"
+
+def build_Reshoot(seq_num, selection):
+    msg = '{"msg_type":"Request","msg_id":"Reshoot","msg_seq_num":' + str(seq_num) + encode_photo_selection(selection)
+    return msg + "}"
+
+def build_Delete(seq_num, selection, DeleteFiles=None):
+    msg = '{"msg_type":"Request","msg_id":"Delete","msg_seq_num":' + str(seq_num) + encode_photo_selection(selection)
+    if DeleteFiles is not None:
+        msg += ',"DeleteFiles":' + encode_bool(DeleteFiles)
+    return msg + "}"
+
+def build_Format(seq_num):
+    msg = '{"msg_type":"Request","msg_id":"Format","msg_seq_num":' + str(seq_num)
+    return msg + "}"
+
+def build_SyncClocks(seq_num, CameraDateTimeOffset=None):
+    msg = '{"msg_type":"Request","msg_id":"SyncClocks","msg_seq_num":' + str(seq_num)
+    if CameraDateTimeOffset is not None:
+        msg += ',"CameraDateTimeOffset":' + encode_int(CameraDateTimeOffset)
+    return msg + "}"
+
+def build_CheckClocks(seq_num):
+    msg = '{"msg_type":"Request","msg_id":"CheckClocks","msg_seq_num":' + str(seq_num)
+    return msg + "}"
+
+def build_Synchronise(seq_num):
+    msg = '{"msg_type":"Request","msg_id":"Synchronise","msg_seq_num":' + str(seq_num)
+    return msg + "}"
+
+def build_GetCamera(seq_num, selection):
+    msg = '{"msg_type":"Request","msg_id":"GetCamera","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    return msg + "}"
+
+def build_TransferPhoto(seq_num, **fields):
+    return '{"msg_type":"Request","msg_id":"TransferPhoto","msg_seq_num":' + str(seq_num) + encode_fields(fields) + "}"
+
+def build_License(seq_num, **fields):
+    return '{"msg_type":"Request","msg_id":"License","msg_seq_num":' + str(seq_num) + encode_fields(fields) + "}"
+
+def build_LiveviewFPS(seq_num, selection, CameraLiveviewFPS=None, CameraLiveviewVideoFPS=None):
+    msg = '{"msg_type":"Request","msg_id":"LiveviewFPS","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraLiveviewFPS is not None:
+        msg += ',"CameraLiveviewFPS":' + encode_int(CameraLiveviewFPS)
+    if CameraLiveviewVideoFPS is not None:
+        msg += ',"CameraLiveviewVideoFPS":' + encode_int(CameraLiveviewVideoFPS)
+    return msg + "}"
+
+def build_SetShutterButton(seq_num, selection, CameraShutterButton=None):
+    msg = '{"msg_type":"Request","msg_id":"SetShutterButton","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraShutterButton is not None:
+        msg += ',"CameraShutterButton":' + encode_string(CameraShutterButton)
+    return msg + "}"
+
+def build_RemoveNode(seq_num, **fields):
+    return '{"msg_type":"Request","msg_id":"RemoveNode","msg_seq_num":' + str(seq_num) + encode_fields(fields) + "}"
+
+def build_SyncBatchNum(seq_num):
+    msg = '{"msg_type":"Request","msg_id":"SyncBatchNum","msg_seq_num":' + str(seq_num)
+    return msg + "}"
+
+def build_SetCameraGroup(seq_num, selection, CameraGroup=None):
+    msg = '{"msg_type":"Request","msg_id":"SetCameraGroup","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraGroup is not None:
+        msg += ',"CameraGroup":' + encode_string(CameraGroup)
+    return msg + "}"
+
+def build_SetCameraTriggerIndex(seq_num, selection, CameraTriggerIndex=None):
+    msg = '{"msg_type":"Request","msg_id":"SetCameraTriggerIndex","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraTriggerIndex is not None:
+        msg += ',"CameraTriggerIndex":' + encode_string(CameraTriggerIndex)
+    return msg + "}"
+
+def build_ActivateLicense(seq_num, ActivationCode=None):
+    msg = '{"msg_type":"Request","msg_id":"ActivateLicense","msg_seq_num":' + str(seq_num)
+    if ActivationCode is not None:
+        msg += ',"ActivationCode":' + encode_string(ActivationCode)
+    return msg + "}"
+
+def build_DeactivateLicense(seq_num, **fields):
+    return '{"msg_type":"Request","msg_id":"DeactivateLicense","msg_seq_num":' + str(seq_num) + encode_fields(fields) + "}"
+
+def build_Shutdown(seq_num, **fields):
+    return '{"msg_type":"Request","msg_id":"Shutdown","msg_seq_num":' + str(seq_num) + encode_fields(fields) + "}"
+
+def build_PowerZoomPosition(seq_num, selection, CameraPowerZoomPosition=None):
+    msg = '{"msg_type":"Request","msg_id":"PowerZoomPosition","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraPowerZoomPosition is not None:
+        msg += ',"CameraPowerZoomPosition":' + encode_int(CameraPowerZoomPosition)
+    return msg + "}"
+
+def build_PowerZoomDirection(seq_num, selection, CameraPowerZoomDirection=None):
+    msg = '{"msg_type":"Request","msg_id":"PowerZoomDirection","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraPowerZoomDirection is not None:
+        msg += ',"CameraPowerZoomDirection":' + encode_string(CameraPowerZoomDirection)
+    return msg + "}"
+
+def build_PowerZoomStop(seq_num, selection):
+    msg = '{"msg_type":"Request","msg_id":"PowerZoomStop","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    return msg + "}"
+
+def build_EngageLatch(seq_num, selection, CameraLatchIndex=None):
+    msg = '{"msg_type":"Request","msg_id":"EngageLatch","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    if CameraLatchIndex is not None:
+        msg += ',"CameraLatchIndex":' + encode_int(CameraLatchIndex)
+    return msg + "}"
+
+def build_ReleaseLatch(seq_num, CameraLatchIndex=None):
+    msg = '{"msg_type":"Request","msg_id":"ReleaseLatch","msg_seq_num":' + str(seq_num)
+    if CameraLatchIndex is not None:
+        msg += ',"CameraLatchIndex":' + encode_int(CameraLatchIndex)
+    return msg + "}"
+
+def build_CancelLatch(seq_num, CameraLatchIndex=None):
+    msg = '{"msg_type":"Request","msg_id":"CancelLatch","msg_seq_num":' + str(seq_num)
+    if CameraLatchIndex is not None:
+        msg += ',"CameraLatchIndex":' + encode_int(CameraLatchIndex)
+    return msg + "}"
+
+def build_EngageTrigger(seq_num, selection):
+    msg = '{"msg_type":"Request","msg_id":"EngageTrigger","msg_seq_num":' + str(seq_num) + encode_camera_selection(selection)
+    return msg + "}"
+
+def build_ReleaseTrigger(seq_num, CameraTriggerInterval=None):
+    msg = '{"msg_type":"Request","msg_id":"ReleaseTrigger","msg_seq_num":' + str(seq_num)
+    if CameraTriggerInterval is not None:
+        msg += ',"CameraTriggerInterval":' + encode_int(CameraTriggerInterval)
+    return msg + "}"
+
+def build_CancelTrigger(seq_num):
+    msg = '{"msg_type":"Request","msg_id":"CancelTrigger","msg_seq_num":' + str(seq_num)
+    return msg + "}"
+
+def decode_OptionsUpdated(data):
+    return decode_message(data, "OptionsUpdated")
+
+def decode_CameraUpdated(data):
+    return decode_message(data, "CameraUpdated")
+
+def decode_NodeUpdated(data):
+    return decode_message(data, "NodeUpdated")
+
+def decode_PhotoUpdated(data):
+    return decode_message(data, "PhotoUpdated")
+
+def decode_LiveviewUpdated(data):
+    return decode_message(data, "LiveviewUpdated")
+
+def decode_Synchronise(data):
+    return decode_message(data, "Synchronise")
+
+def decode_GetCamera(data):
+    return decode_message(data, "GetCamera")
+
+def decode_RelayCustomText(data):
+    return decode_message(data, "RelayCustomText")
+
+BUILDERS = {
+    "NetworkPing": build_NetworkPing,
+    "SetOptions": build_SetOptions,
+    "SetSequenceNum": build_SetSequenceNum,
+    "SetBatchNum": build_SetBatchNum,
+    "RenameCamera": build_RenameCamera,
+    "RenameNode": build_RenameNode,
+    "RenamePhoto": build_RenamePhoto,
+    "DetectCameras": build_DetectCameras,
+    "Connect": build_Connect,
+    "Disconnect": build_Disconnect,
+    "Shoot": build_Shoot,
+    "Autofocus": build_Autofocus,
+    "Identify": build_Identify,
+    "LiveviewFocus": build_LiveviewFocus,
+    "LiveviewPosition": build_LiveviewPosition,
+    "EnableLiveview": build_EnableLiveview,
+    "EnableLiveviewZoom": build_EnableLiveviewZoom,
+    "EnableLiveviewDOF": build_EnableLiveviewDOF,
+    "EnableVideo": build_EnableVideo,
+    "SetProperty": build_SetProperty,
+    "IncrementProperty": build_IncrementProperty,
+    "Download": build_Download,
+    "Transfer": build_Transfer,
+    "Reshoot": build_Reshoot,
+    "Delete": build_Delete,
+    "Format": build_Format,
+    "SyncClocks": build_SyncClocks,
+    "CheckClocks": build_CheckClocks,
+    "Synchronise": build_Synchronise,
+    "GetCamera": build_GetCamera,
+    "TransferPhoto": build_TransferPhoto,
+    "License": build_License,
+    "LiveviewFPS": build_LiveviewFPS,
+    "SetShutterButton": build_SetShutterButton,
+    "RemoveNode": build_RemoveNode,
+    "SyncBatchNum": build_SyncBatchNum,
+    "SetCameraGroup": build_SetCameraGroup,
+    "SetCameraTriggerIndex": build_SetCameraTriggerIndex,
+    "ActivateLicense": build_ActivateLicense,
+    "DeactivateLicense": build_DeactivateLicense,
+    "Shutdown": build_Shutdown,
+    "PowerZoomPosition": build_PowerZoomPosition,
+    "PowerZoomDirection": build_PowerZoomDirection,
+    "PowerZoomStop": build_PowerZoomStop,
+    "EngageLatch": build_EngageLatch,
+    "ReleaseLatch": build_ReleaseLatch,
+    "CancelLatch": build_CancelLatch,
+    "EngageTrigger": build_EngageTrigger,
+    "ReleaseTrigger": build_ReleaseTrigger,
+    "CancelTrigger": build_CancelTrigger,
+}
+
+DECODERS = {
+    "OptionsUpdated": decode_OptionsUpdated,
+    "CameraUpdated": decode_CameraUpdated,
+    "NodeUpdated": decode_NodeUpdated,
+    "PhotoUpdated": decode_PhotoUpdated,
+    "LiveviewUpdated": decode_LiveviewUpdated,
+    "Synchronise": decode_Synchronise,
+    "GetCamera": decode_GetCamera,
+    "RelayCustomText": decode_RelayCustomText,
+}
@@ -0,0 +1,225 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import bisect
+import threading
+import http.server
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_STAGES = ("serialise", "rtt", "drain", "parse", "tracker")
+EVENT_STAGES = ("parse", "tracker")
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # the last count is for values above the largest bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def get_quantile(self, q):
+        # upper bound of the bucket holding the quantile, like Prometheus
+        if not self.count:
+            return None
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self):
+        mean = None
+        if self.count:
+            mean = self.sum / self.count
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": mean,
+            "p50": self.get_quantile(0.5),
+            "p90": self.get_quantile(0.9),
+            "p99": self.get_quantile(0.99),
+        }
+
+class Metrics:
+    # Collects timings for a Context. Nothing in the request or event paths
+    # refers to this unless a Metrics object was passed in, so there's no
+    # cost when it isn't used.
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.__buckets = tuple(buckets)
+        self.__lock = threading.Lock()
+        self.__start_time = time.time()
+        self.__requests = dict()
+        self.__events = dict()
+        self.__event_counts = dict()
+        self.__gauges = dict()
+
+    def reset(self):
+        with self.__lock:
+            self.__start_time = time.time()
+            self.__requests = dict()
+            self.__events = dict()
+            self.__event_counts = dict()
+
+    def observe_request(self, stage, msg_id, seconds):
+        with self.__lock:
+            key = (stage, msg_id)
+            histogram = self.__requests.get(key)
+            if histogram is None:
+                histogram = self.__requests[key] = Histogram(self.__buckets)
+            histogram.observe(seconds)
+
+    def observe_event(self, stage, msg_id, seconds):
+        with self.__lock:
+            key = (stage, msg_id)
+            histogram = self.__events.get(key)
+            if histogram is None:
+                histogram = self.__events[key] = Histogram(self.__buckets)
+            histogram.observe(seconds)
+
+    def count_event(self, msg_id):
+        with self.__lock:
+            self.__event_counts[msg_id] = self.__event_counts.get(msg_id, 0) + 1
+
+    def set_gauge(self, name, value):
+        with self.__lock:
+            self.__gauges[name] = value
+
+    def add_gauge(self, name, delta):
+        with self.__lock:
+            self.__gauges[name] = self.__gauges.get(name, 0) + delta
+
+    def get_stats(self):
+        with self.__lock:
+            elapsed = max(time.time() - self.__start_time, 1e-9)
+            requests = dict()
+            for (stage, msg_id), histogram in self.__requests.items():
+                requests.setdefault(msg_id, dict())[stage] = histogram.to_dict()
+            events = dict()
+            for msg_id, count in self.__event_counts.items():
+                events[msg_id] = {"count": count, "rate": count / elapsed}
+            for (stage, msg_id), histogram in self.__events.items():
+                events.setdefault(msg_id, {"count": 0, "rate": 0.0})[stage] = histogram.to_dict()
+            return {
+                "elapsed": elapsed,
+                "requests": requests,
+                "events": events,
+                "gauges": dict(self.__gauges),
+            }
+
+    def __format_histogram(self, lines, name, labels, histogram):
+        total = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            total += count
+            lines.append('{0}_bucket{{{1},le="{2}"}} {3}'.format(name, labels, bound, total))
+        lines.append('{0}_bucket{{{1},le="+Inf"}} {2}'.format(name, labels, histogram.count))
+        lines.append("{0}_sum{{{1}}} {2}".format(name, labels, histogram.sum))
+        lines.append("{0}_count{{{1}}} {2}".format(name, labels, histogram.count))
+
+    def to_prometheus(self):
+        # Prometheus text exposition format
+        lines = []
+        with self.__lock:
+            lines.append("# HELP smartshooter_request_seconds Time spent in each stage of a request")
+            lines.append("# TYPE smartshooter_request_seconds histogram")
+            for (stage, msg_id), histogram in sorted(self.__requests.items()):
+                labels = 'msg_id="{0}",stage="{1}"'.format(msg_id, stage)
+                self.__format_histogram(lines, "smartshooter_request_seconds", labels, histogram)
+            lines.append("# HELP smartshooter_event_seconds Time spent handling each event")
+            lines.append("# TYPE smartshooter_event_seconds histogram")
+            for (stage, msg_id), histogram in sorted(self.__events.items()):
+                labels = 'msg_id="{0}",stage="{1}"'.format(msg_id, stage)
+                self.__format_histogram(lines, "smartshooter_event_seconds", labels, histogram)
+            lines.append("# HELP smartshooter_events_total Events received from the publisher")
+            lines.append("# TYPE smartshooter_events_total counter")
+            for msg_id, count in sorted(self.__event_counts.items()):
+                lines.append('smartshooter_events_total{{msg_id="{0}"}} {1}'.format(msg_id, count))
+            lines.append("# HELP smartshooter_queue_depth Requests sent and awaiting a reply, and events read by the last drain")
+            lines.append("# TYPE smartshooter_queue_depth gauge")
+            for name, value in sorted(self.__gauges.items()):
+                lines.append('smartshooter_queue_depth{{queue="{0}"}} {1}'.format(name, value))
+        return "\n".join(lines) + "\n"
+
+def serve_metrics(metrics, port=9464, address="127.0.0.1"):
+    # serves /metrics from a daemon thread, call shutdown() on the result to stop
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer((address, port), Handler)
+    thread = threading.Thread(target=server.serve_forever, name="smartshooter-metrics")
+    thread.daemon = True
+    thread.start()
+    return server
+
+class TimedMSGBuilder:
+    # Wraps a MSGBuilder so building each message also records its
+    # serialise time.
+    def __init__(self, msgbuilder, metrics):
+        self.__msgbuilder = msgbuilder
+        self.__metrics = metrics
+
+    def __getattr__(self, name):
+        attr = getattr(self.__msgbuilder, name)
+        metrics = self.__metrics
+        if name == "build":
+            # the generic builder, which takes the msg_id as its first argument
+            def build(msg_id, *args, **fields):
+                start = time.perf_counter()
+                msg = attr(msg_id, *args, **fields)
+                metrics.observe_request("serialise", msg_id, time.perf_counter() - start)
+                return msg
+        elif name.startswith("build_"):
+            msg_id = name[len("build_"):]
+            def build(*args, **fields):
+                start = time.perf_counter()
+                msg = attr(*args, **fields)
+                metrics.observe_request("serialise", msg_id, time.perf_counter() - start)
+                return msg
+        else:
+            return attr
+        # later lookups find the wrapper without going through __getattr__
+        setattr(self, name, build)
+        return build
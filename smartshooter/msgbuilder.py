@@ -21,130 +21,118 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
-import json
-from .enums import CameraSelectionMode
-from .enums import PhotoSelectionMode
-from .selection import CameraSelection
-from .selection import PhotoSelection
+import threading
+import itertools
+from . import messages
+from . import validators
+from .validation import ValidatedMessages
+from .templates import encode_fields
 
 class MSGBuilder:
-    def __init__(self):
-        self.__seq_num = 0
-
-    def __create_msg(self, msg_id):
-        msg = {}
-        msg["msg_type"] = "Request"
-        msg["msg_id"] = msg_id
-        msg["msg_seq_num"] = self.__seq_num
-        self.__seq_num += 1
-        return msg
-
-    def __add_selection(self, msg, selection):
-        mode = selection.get_mode()
-        msg["CameraSelection"] = mode.name
-        if mode == CameraSelectionMode.Single:
-            msg["CameraKey"] = selection.get_key()
-        elif mode == CameraSelectionMode.Multiple:
-            msg["CameraKeys"] = selection.get_keys()
-        elif mode == CameraSelectionMode.Group:
-            msg["CameraGroup"] = selection.get_group()
+    # Requests are serialised by the builders generated into messages.py,
+    # which concatenate constant JSON text with the encoded fields.
+    def __init__(self, seq_nums=None, validate=False):
+        # next() on a count is atomic, so messages can be built from several
+        # threads, each remembering the last sequence number it was given
+        if seq_nums is None:
+            seq_nums = itertools.count()
+        self.__seq_nums = seq_nums
+        self.__local = threading.local()
+        # with validation, the generated builders are swapped for ones that
+        # check their fields first, so there's no cost when it's off
+        self.__messages = messages
+        if validate:
+            self.__messages = ValidatedMessages(messages, validators)
+
+    def __next_seq_num(self):
+        seq_num = self.__local.seq_num = next(self.__seq_nums)
+        return seq_num
+
+    def get_last_seq_num(self):
+        return self.__local.seq_num
+
+    def build(self, msg_id, selection=None, **fields):
+        # any request in external_api.json, with fields given by name
+        builder = self.__messages.BUILDERS.get(msg_id)
+        if builder is None:
+            raise ValueError("unknown request: {}".format(msg_id))
+        if selection is not None:
+            return builder(self.__next_seq_num(), selection, **fields)
+        return builder(self.__next_seq_num(), **fields)
 
     def build_SetConfig(self, key, value):
-        msg = self.__create_msg("SetConfig")
-        msg["ConfigKey"] = key
-        msg["ConfigValue"] = value
-        return json.dumps(msg)
+        # not in external_api.json, so there's no generated builder
+        fields = encode_fields({"ConfigKey": key, "ConfigValue": value})
+        return '{"msg_type":"Request","msg_id":"SetConfig","msg_seq_num":' + str(self.__next_seq_num()) + fields + "}"
 
     def build_Synchronise(self):
-        msg = self.__create_msg("Synchronise")
-        return json.dumps(msg)
+        return self.__messages.build_Synchronise(self.__next_seq_num())
+
+    def build_GetCamera(self, selection):
+        return self.__messages.build_GetCamera(self.__next_seq_num(), selection)
 
     def build_Connect(self, selection):
-        msg = self.__create_msg("Connect")
-        self.__add_selection(msg, selection)
-        return json.dumps(msg)
+        return self.__messages.build_Connect(self.__next_seq_num(), selection)
 
     def build_Disconnect(self, selection):
-        msg = self.__create_msg("Disconnect")
-        self.__add_selection(msg, selection)
-        return json.dumps(msg)
+        return self.__messages.build_Disconnect(self.__next_seq_num(), selection)
 
     def build_Shoot(self, selection, bulb_timer, photo_origin):
-        msg = self.__create_msg("Shoot")
-        self.__add_selection(msg, selection)
-        if bulb_timer:
-            msg["BulbTimer"] = bulb_timer
-        if photo_origin:
-            msg["PhotoOrigin"] = photo_origin
-        return json.dumps(msg)
+        return self.__messages.build_Shoot(self.__next_seq_num(), selection, bulb_timer or None, photo_origin or None)
+
+    def build_Download(self, selection):
+        return self.__messages.build_Download(self.__next_seq_num(), selection)
+
+    def build_Transfer(self, selection):
+        return self.__messages.build_Transfer(self.__next_seq_num(), selection)
+
+    def build_Delete(self, selection, delete_files):
+        return self.__messages.build_Delete(self.__next_seq_num(), selection, bool(delete_files))
 
     def build_Autofocus(self, selection):
-        msg = self.__create_msg("Autofocus")
-        self.__add_selection(msg, selection)
-        return json.dumps(msg)
+        return self.__messages.build_Autofocus(self.__next_seq_num(), selection)
 
     def build_SetProperty(self, selection, prop, value):
-        msg = self.__create_msg("SetProperty")
-        self.__add_selection(msg, selection)
-        msg["CameraPropertyType"] = prop.name
-        msg["CameraPropertyValue"] = value
-        return json.dumps(msg)
+        return self.__messages.build_SetProperty(self.__next_seq_num(), selection, prop, value)
 
     def build_SetShutterButton(self, selection, button):
-        msg = self.__create_msg("SetShutterButton")
-        self.__add_selection(msg, selection)
-        msg["CameraShutterButton"] = button.name
-        return json.dumps(msg)
+        return self.__messages.build_SetShutterButton(self.__next_seq_num(), selection, button)
 
     def build_EnableLiveview(self, selection, enable):
-        msg = self.__create_msg("EnableLiveview")
-        self.__add_selection(msg, selection)
-        msg["Enable"] = bool(enable)
-        return json.dumps(msg)
+        return self.__messages.build_EnableLiveview(self.__next_seq_num(), selection, bool(enable))
 
     def build_LiveviewFocus(self, selection, focus_step):
-        msg = self.__create_msg("LiveviewFocus")
-        self.__add_selection(msg, selection)
-        msg["CameraLiveviewFocusStep"] = focus_step
-        return json.dumps(msg)
+        return self.__messages.build_LiveviewFocus(self.__next_seq_num(), selection, focus_step)
 
     def build_PowerZoomPosition(self, selection, position):
-        msg = self.__create_msg("PowerZoomPosition")
-        self.__add_selection(msg, selection)
-        msg["CameraPowerZoomPosition"] = position
-        return json.dumps(msg)
+        return self.__messages.build_PowerZoomPosition(self.__next_seq_num(), selection, position)
 
     def build_PowerZoomStop(self, selection):
-        msg = self.__create_msg("PowerZoomStop")
-        self.__add_selection(msg, selection)
-        return json.dumps(msg)
+        return self.__messages.build_PowerZoomStop(self.__next_seq_num(), selection)
 
     def build_EngageLatch(self, selection, latch_index):
-        msg = self.__create_msg("EngageLatch")
-        self.__add_selection(msg, selection)
-        msg["CameraLatchIndex"] = latch_index
-        return json.dumps(msg)
+        return self.__messages.build_EngageLatch(self.__next_seq_num(), selection, latch_index)
 
     def build_ReleaseLatch(self, latch_index):
-        msg = self.__create_msg("ReleaseLatch")
-        msg["CameraLatchIndex"] = latch_index
-        return json.dumps(msg)
+        return self.__messages.build_ReleaseLatch(self.__next_seq_num(), latch_index)
 
     def build_CancelLatch(self, latch_index):
-        msg = self.__create_msg("CancelLatch")
-        msg["CameraLatchIndex"] = latch_index
-        return json.dumps(msg)
+        return self.__messages.build_CancelLatch(self.__next_seq_num(), latch_index)
 
     def build_EngageTrigger(self, selection):
-        msg = self.__create_msg("EngageTrigger")
-        self.__add_selection(msg, selection)
-        return json.dumps(msg)
+        return self.__messages.build_EngageTrigger(self.__next_seq_num(), selection)
 
     def build_ReleaseTrigger(self, trigger_interval):
-        msg = self.__create_msg("ReleaseTrigger")
-        msg["CameraTriggerInterval"] = trigger_interval
-        return json.dumps(msg)
+        return self.__messages.build_ReleaseTrigger(self.__next_seq_num(), trigger_interval)
 
     def build_CancelTrigger(self):
-        msg = self.__create_msg("CancelTrigger")
-        return json.dumps(msg)
+        return self.__messages.build_CancelTrigger(self.__next_seq_num())
+
+    def build_SyncClocks(self, offset):
+        return self.__messages.build_SyncClocks(self.__next_seq_num(), offset)
+
+    def build_CheckClocks(self):
+        return self.__messages.build_CheckClocks(self.__next_seq_num())
+
+    def build_NetworkPing(self, timestamp):
+        return self.__messages.build_NetworkPing(self.__next_seq_num(), NetworkTimestamp=timestamp)
@@ -0,0 +1,115 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import itertools
+import threading
+import zmq
+from .context import Context
+from .context import ZMQSocket
+from .context import DEFAULT_REQREP
+from .context import DEFAULT_PUBLISHER
+from .eventhub import EventHub
+from .msgbuilder import MSGBuilder
+from .statetracker import StateTracker
+
+class ContextPool:
+    # Hands out lightweight Context handles which share one zmq context, one
+    # event subscription and one state tracker. Request sockets are kept
+    # connected between handles, so getting a handle costs no handshake and
+    # no Synchronise once the pool is warm.
+    def __init__(self, reqrep=DEFAULT_REQREP, publisher=DEFAULT_PUBLISHER,
+                 max_idle_sockets=8, max_photos=None, max_photo_age=None, metrics=None):
+        self.__zmq_ctx = zmq.Context.instance()
+        self.__reqrep = reqrep
+        self.__max_idle_sockets = max_idle_sockets
+        self.__lock = threading.Lock()
+        self.__idle_sockets = []
+        self.__num_sockets = 0
+        # shared by all handles, so a stale reply can't match a newer request
+        self.__seq_nums = itertools.count()
+        self.__event_socket = ZMQSocket(None, publisher, self.__zmq_ctx)
+        tracker = StateTracker(max_photos, max_photo_age)
+        self.__hub = EventHub(self.__event_socket, tracker, True, metrics)
+        self.__is_closed = False
+
+    def context(self, validate=False):
+        return Context(pool=self, validate=validate)
+
+    def get_hub(self):
+        return self.__hub
+
+    def create_msgbuilder(self, validate=False):
+        return MSGBuilder(self.__seq_nums, validate)
+
+    def acquire_socket(self):
+        with self.__lock:
+            if self.__is_closed:
+                raise RuntimeError("ContextPool is closed")
+            if self.__idle_sockets:
+                return self.__idle_sockets.pop()
+            self.__num_sockets += 1
+        return ZMQSocket(self.__reqrep, None, self.__zmq_ctx)
+
+    def release_socket(self, socket):
+        with self.__lock:
+            if not self.__is_closed and len(self.__idle_sockets) < self.__max_idle_sockets:
+                self.__idle_sockets.append(socket)
+                return
+            self.__num_sockets -= 1
+        socket.close()
+
+    def get_num_sockets(self):
+        with self.__lock:
+            return self.__num_sockets
+
+    def get_num_idle_sockets(self):
+        with self.__lock:
+            return len(self.__idle_sockets)
+
+    def close(self):
+        with self.__lock:
+            self.__is_closed = True
+            sockets = self.__idle_sockets
+            self.__idle_sockets = []
+            self.__num_sockets -= len(sockets)
+        for socket in sockets:
+            socket.close()
+        self.__hub.stop()
+        self.__event_socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_default_pool():
+    # one pool per process, connected to the default endpoints
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ContextPool()
+        return _default_pool
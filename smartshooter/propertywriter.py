@@ -0,0 +1,160 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import threading
+from .selection import CameraSelection
+
+class PropertyWriter:
+    # Write-behind layer for Context.set_property. Writes are compared with
+    # the tracked camera state, or the last value sent if the tracker hasn't
+    # caught up with it yet, and dropped if they wouldn't change anything. A
+    # sent value stops counting once the tracked value changes, or after
+    # confirm_timeout seconds without a change, and isn't kept at all if the
+    # write was rejected. Writes
+    # within the window are coalesced to the latest value per camera and
+    # property before being sent. If a write made from the timer fails, it
+    # stays pending and the error is raised by the next call or close().
+    def __init__(self, context, window=0.05, confirm_timeout=1.0):
+        self.__context = context
+        self.__window = window
+        self.__confirm_timeout = confirm_timeout
+        self.__lock = threading.Lock()
+        self.__pending = dict()
+        self.__sent = dict()
+        self.__timer = None
+        self.__error = None
+        self.__num_requested = 0
+        self.__num_sent = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __raise_error(self):
+        with self.__lock:
+            error = self.__error
+            self.__error = None
+        if error is not None:
+            raise error
+
+    def __get_value(self, key, prop):
+        # the last value sent counts until the tracker updates the property,
+        # whether to the sent value or to another one the camera moved to
+        tracked = self.__context.get_camera_property(key, prop)
+        sent = self.__sent.get((key, prop))
+        if sent is None:
+            return tracked
+        value, tracked_before, sent_time = sent
+        if tracked != tracked_before or time.monotonic() - sent_time > self.__confirm_timeout:
+            del self.__sent[(key, prop)]
+            return tracked
+        return value
+
+    def set_property(self, prop, value, selection=None):
+        self.__raise_error()
+        cameras = self.__context.get_selected_cameras(selection)
+        with self.__lock:
+            for key in cameras:
+                self.__num_requested += 1
+                if self.__get_value(key, prop) == value:
+                    # also cancels a pending write that would change it
+                    self.__pending.pop((key, prop), None)
+                else:
+                    self.__pending[(key, prop)] = value
+            if not self.__pending or self.__timer is not None:
+                return
+            if self.__window > 0:
+                self.__timer = threading.Timer(self.__window, self.__flush_later)
+                self.__timer.daemon = True
+                self.__timer.start()
+                return
+        self.__flush()
+
+    def flush(self):
+        self.__raise_error()
+        self.__flush()
+
+    def __flush_later(self):
+        # runs on the timer thread, so errors are kept for the caller
+        try:
+            self.__flush()
+        except Exception as e:
+            with self.__lock:
+                self.__error = e
+
+    def __flush(self):
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+            pending = self.__pending
+            self.__pending = dict()
+        writes = dict()
+        for (key, prop), value in pending.items():
+            if (prop, value) not in writes:
+                writes[(prop, value)] = []
+            writes[(prop, value)].append(key)
+        writes = list(writes.items())
+        for index, ((prop, value), keys) in enumerate(writes):
+            selection = CameraSelection()
+            if len(keys) == 1:
+                selection.select_camera(keys[0])
+            else:
+                selection.select_cameras(keys)
+            tracked = [self.__context.get_camera_property(key, prop) for key in keys]
+            try:
+                reply = self.__context.set_property(prop, value, selection)
+            except BaseException:
+                self.__restore(writes[index:])
+                raise
+            sent_time = time.monotonic()
+            with self.__lock:
+                self.__num_sent += len(keys)
+                if reply is not None and not reply.get("msg_result", True):
+                    # rejected, so the camera still has the tracked value
+                    for key in keys:
+                        self.__sent.pop((key, prop), None)
+                    continue
+                for key, tracked_before in zip(keys, tracked):
+                    self.__sent[(key, prop)] = (value, tracked_before, sent_time)
+
+    def __restore(self, writes):
+        # puts back writes that weren't sent, unless newer ones are pending
+        with self.__lock:
+            for (prop, value), keys in writes:
+                for key in keys:
+                    self.__pending.setdefault((key, prop), value)
+
+    def close(self):
+        self.flush()
+
+    def get_num_pending(self):
+        with self.__lock:
+            return len(self.__pending)
+
+    def get_stats(self):
+        with self.__lock:
+            return {"requested": self.__num_requested, "sent": self.__num_sent}
@@ -0,0 +1,314 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import time
+import zlib
+import struct
+from . import codec
+from .statetracker import StateTracker
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# A recording starts with a magic number, a version byte and a compression
+# byte, followed by records that are only ever appended:
+#
+#   "B" stored_len raw_len num_frames <block>   frames, possibly compressed
+#   "I" len <json>                              index for the block before it
+#
+# A block holds frames as (timestamp, len, data). Its index entry gives the
+# block's offset, time range and the offsets of each msg_id's frames within
+# the block, so replays can skip blocks by time and msg_id without
+# decompressing them. A crash loses at most the block being filled.
+MAGIC = b"SSRC"
+VERSION = b"\x01"
+COMPRESSION_NONE = b"N"
+COMPRESSION_ZLIB = b"Z"
+COMPRESSION_ZSTD = b"S"
+HEADER_SIZE = len(MAGIC) + 2
+
+BLOCK_RECORD = b"B"
+INDEX_RECORD = b"I"
+block_header = struct.Struct("<III")
+index_header = struct.Struct("<I")
+frame_header = struct.Struct("<dI")
+
+compression_names = {
+    None: COMPRESSION_NONE,
+    "zlib": COMPRESSION_ZLIB,
+    "zstd": COMPRESSION_ZSTD,
+}
+
+def compress_block(compression, data):
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(data, 1)
+    if compression == COMPRESSION_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+def decompress_block(compression, data, raw_len):
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(data)
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstandard is needed to read this recording")
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=raw_len)
+    return data
+
+class Recorder:
+    def __init__(self, path, compression=None, block_size=1 << 18, flush_interval=1.0):
+        if compression not in compression_names:
+            raise ValueError("unknown compression: {}".format(compression))
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstandard is needed for zstd compression")
+        self.__compression = compression_names[compression]
+        self.__block_size = block_size
+        self.__flush_interval = flush_interval
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            # appending keeps the compression the file was created with
+            with open(path, "rb") as f:
+                header = f.read(HEADER_SIZE)
+            if header[:len(MAGIC)] != MAGIC:
+                raise ValueError("not a recording: {}".format(path))
+            self.__compression = header[-1:]
+        self.__file = open(path, "ab")
+        if not exists:
+            self.__file.write(MAGIC + VERSION + self.__compression)
+        self.__frames = []
+        self.__size = 0
+        self.__msg_ids = dict()
+        self.__first_time = None
+        self.__last_time = None
+        self.__last_flush = time.time()
+        self.__num_frames = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, data, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        msg_id = codec.peek_field(data, "msg_id") or ""
+        self.__msg_ids.setdefault(msg_id, []).append(self.__size)
+        self.__frames.append(frame_header.pack(timestamp, len(data)))
+        self.__frames.append(data)
+        self.__size += frame_header.size + len(data)
+        if self.__first_time is None:
+            self.__first_time = timestamp
+        self.__last_time = timestamp
+        self.__num_frames += 1
+        if self.__size >= self.__block_size or time.time() - self.__last_flush >= self.__flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.__last_flush = time.time()
+        if not self.__frames:
+            return
+        raw = b"".join(self.__frames)
+        stored = compress_block(self.__compression, raw)
+        offset = self.__file.tell()
+        index = {
+            "offset": offset,
+            "first": self.__first_time,
+            "last": self.__last_time,
+            "frames": self.__num_frames,
+            "msg_ids": self.__msg_ids,
+        }
+        index_data = codec.dumpb(index)
+        self.__file.write(BLOCK_RECORD + block_header.pack(len(stored), len(raw), self.__num_frames))
+        self.__file.write(stored)
+        self.__file.write(INDEX_RECORD + index_header.pack(len(index_data)) + index_data)
+        self.__file.flush()
+        self.__frames = []
+        self.__size = 0
+        self.__msg_ids = dict()
+        self.__first_time = None
+        self.__last_time = None
+        self.__num_frames = 0
+
+    def close(self):
+        if self.__file is not None:
+            self.flush()
+            self.__file.close()
+            self.__file = None
+
+class Recording:
+    def __init__(self, path):
+        self.__path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a recording: {}".format(path))
+        self.__compression = header[-1:]
+        self.__index = None
+
+    def get_index(self):
+        # only the record headers and index records are read
+        if self.__index is not None:
+            return self.__index
+        index = []
+        with open(self.__path, "rb") as f:
+            f.seek(HEADER_SIZE)
+            while True:
+                kind = f.read(1)
+                if kind == BLOCK_RECORD:
+                    header = f.read(block_header.size)
+                    if len(header) < block_header.size:
+                        break
+                    stored_len, raw_len, num_frames = block_header.unpack(header)
+                    f.seek(stored_len, os.SEEK_CUR)
+                elif kind == INDEX_RECORD:
+                    header = f.read(index_header.size)
+                    if len(header) < index_header.size:
+                        break
+                    data = f.read(index_header.unpack(header)[0])
+                    try:
+                        index.append(codec.loads(data))
+                    except ValueError:
+                        # truncated by a crash while writing
+                        break
+                else:
+                    break
+        self.__index = index
+        return index
+
+    def get_time_range(self):
+        index = self.get_index()
+        if not index:
+            return None, None
+        return index[0]["first"], index[-1]["last"]
+
+    def get_msg_id_counts(self):
+        counts = dict()
+        for entry in self.get_index():
+            for msg_id, offsets in entry["msg_ids"].items():
+                counts[msg_id] = counts.get(msg_id, 0) + len(offsets)
+        return counts
+
+    def frames(self, msg_ids=None, start=None, end=None):
+        # yields (timestamp, data) in recorded order
+        if msg_ids is not None:
+            msg_ids = frozenset(msg_ids)
+        with open(self.__path, "rb") as f:
+            for entry in self.get_index():
+                if start is not None and entry["last"] < start:
+                    continue
+                if end is not None and entry["first"] > end:
+                    break
+                if msg_ids is not None and msg_ids.isdisjoint(entry["msg_ids"]):
+                    continue
+                f.seek(entry["offset"])
+                if f.read(1) != BLOCK_RECORD:
+                    raise ValueError("corrupt recording index")
+                stored_len, raw_len, num_frames = block_header.unpack(f.read(block_header.size))
+                raw = decompress_block(self.__compression, f.read(stored_len), raw_len)
+                view = memoryview(raw)
+                if msg_ids is None:
+                    position = 0
+                    while position < len(raw):
+                        timestamp, length = frame_header.unpack_from(raw, position)
+                        position += frame_header.size
+                        if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                            yield timestamp, view[position:position + length]
+                        position += length
+                else:
+                    offsets = []
+                    for msg_id in msg_ids:
+                        offsets.extend(entry["msg_ids"].get(msg_id, ()))
+                    for position in sorted(offsets):
+                        timestamp, length = frame_header.unpack_from(raw, position)
+                        position += frame_header.size
+                        if (start is None or timestamp >= start) and (end is None or timestamp <= end):
+                            yield timestamp, view[position:position + length]
+
+def record(path, publisher="tcp://127.0.0.1:54543", compression=None, duration=None, is_running=None):
+    # records the publisher's raw stream until duration passes or
+    # is_running() returns False, returning the number of frames written
+    import zmq
+    sub_socket = zmq.Context.instance().socket(zmq.SUB)
+    sub_socket.setsockopt(zmq.SUBSCRIBE, b"")
+    sub_socket.connect(publisher)
+    deadline = None
+    if duration is not None:
+        deadline = time.time() + duration
+    num_frames = 0
+    try:
+        with Recorder(path, compression) as recorder:
+            while is_running is None or is_running():
+                if deadline is not None and time.time() >= deadline:
+                    break
+                if sub_socket.poll(100):
+                    recorder.write(sub_socket.recv())
+                    num_frames += 1
+                else:
+                    recorder.flush()
+    finally:
+        sub_socket.close(0)
+    return num_frames
+
+def replay(recording, sink, speed=1.0, msg_ids=None, start=None, end=None):
+    # calls sink(data) for each frame, keeping the recorded timing scaled by
+    # speed, or as fast as possible if speed is None or 0
+    first_time = None
+    start_clock = time.perf_counter()
+    num_frames = 0
+    for timestamp, data in recording.frames(msg_ids, start, end):
+        if speed:
+            if first_time is None:
+                first_time = timestamp
+            delay = (timestamp - first_time) / speed - (time.perf_counter() - start_clock)
+            if delay > 0:
+                time.sleep(delay)
+        sink(data)
+        num_frames += 1
+    return num_frames
+
+def replay_to_tracker(recording, tracker=None, speed=None, start=None, end=None):
+    # applies the recorded events to a tracker, without any sockets
+    if tracker is None:
+        tracker = StateTracker()
+        tracker.mark_synchronised()
+    msg_ids = tracker.get_event_ids()
+    def process(data):
+        tracker.process_event(codec.loads(data))
+    replay(recording, process, speed, msg_ids, start, end)
+    return tracker
+
+def replay_to_publisher(recording, publisher="tcp://127.0.0.1:54543", speed=1.0, msg_ids=None,
+                        start=None, end=None, connect_time=0.5):
+    import zmq
+    pub_socket = zmq.Context.instance().socket(zmq.PUB)
+    pub_socket.bind(publisher)
+    try:
+        # give subscribers time to connect, or the first frames are lost
+        time.sleep(connect_time)
+        return replay(recording, pub_socket.send, speed, msg_ids, start, end)
+    finally:
+        pub_socket.close(1000)
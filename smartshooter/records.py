@@ -0,0 +1,235 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import sys
+from collections.abc import MutableMapping
+from .enums import Property
+from .schema import CAMERA_INFO_FIELDS
+from .schema import CAMERA_PROPERTY_INFO_FIELDS
+from .schema import PHOTO_INFO_FIELDS
+from .schema import RANGED_FIELDS
+
+PROPERTY_INDEX = {prop.name: prop.value for prop in Property}
+PROPERTY_NAMES = [None] + [prop.name for prop in Property]
+RANGED = frozenset(RANGED_FIELDS)
+HEADER_FIELDS = frozenset(("msg_type", "msg_id", "msg_seq_num"))
+MISSING = object()
+
+class Record(MutableMapping):
+    # Fixed fields from the API definition are stored in slots, anything
+    # else (fields added by newer versions of Smart Shooter) goes in _extra.
+    __slots__ = ("_extra",)
+    FIELDS = frozenset()
+
+    def __getitem__(self, field):
+        if field in self.FIELDS:
+            try:
+                return getattr(self, field)
+            except AttributeError:
+                raise KeyError(field)
+        if self._extra is None:
+            raise KeyError(field)
+        return self._extra[field]
+
+    def get(self, field, default=None):
+        if field in self.FIELDS:
+            return getattr(self, field, default)
+        if self._extra is None:
+            return default
+        return self._extra.get(field, default)
+
+    def __setitem__(self, field, value):
+        if field in RANGED and type(value) is str:
+            value = sys.intern(value)
+        if field in self.FIELDS:
+            setattr(self, field, value)
+        else:
+            if self._extra is None:
+                self._extra = dict()
+            self._extra[field] = value
+
+    def update_fields(self, fields, skip=None):
+        # Applies an event's fields, skipping the one named skip, and returns
+        # True if any changed. This is the hot path for events, so it works on
+        # the slots directly rather than going through __getitem__/__setitem__.
+        changed = False
+        slots = self.FIELDS
+        for field, value in fields.items():
+            if field in slots:
+                if getattr(self, field, MISSING) != value:
+                    if field == skip:
+                        continue
+                    if field in RANGED and type(value) is str:
+                        value = sys.intern(value)
+                    setattr(self, field, value)
+                    changed = True
+            elif field != skip:
+                extra = self._extra
+                if extra is None:
+                    extra = self._extra = dict()
+                if field in HEADER_FIELDS:
+                    # the message header doesn't count as a change
+                    extra[field] = value
+                elif extra.get(field, MISSING) != value:
+                    extra[field] = value
+                    changed = True
+        return changed
+
+    def __delitem__(self, field):
+        if field in self.FIELDS:
+            try:
+                delattr(self, field)
+            except AttributeError:
+                raise KeyError(field)
+        elif self._extra is None:
+            raise KeyError(field)
+        else:
+            del self._extra[field]
+
+    def __iter__(self):
+        for field in self.__slots__:
+            if hasattr(self, field):
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for field in self)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self.to_dict())
+
+    def to_dict(self):
+        obj = dict()
+        for field, value in self.items():
+            if isinstance(value, (Record, PropertyTable)):
+                value = value.to_dict()
+            obj[field] = value
+        return obj
+
+class PropertyRecord(Record):
+    __slots__ = CAMERA_PROPERTY_INFO_FIELDS
+    FIELDS = frozenset(CAMERA_PROPERTY_INFO_FIELDS)
+
+    def __init__(self):
+        self._extra = None
+
+class PhotoRecord(Record):
+    __slots__ = PHOTO_INFO_FIELDS
+    FIELDS = frozenset(PHOTO_INFO_FIELDS)
+
+    def __init__(self):
+        self._extra = None
+
+class CameraRecord(Record):
+    __slots__ = CAMERA_INFO_FIELDS
+    FIELDS = frozenset(CAMERA_INFO_FIELDS)
+
+    def __init__(self):
+        self._extra = None
+        self.CameraPropertyInfo = PropertyTable()
+
+class PropertyTable(MutableMapping):
+    # Maps CameraPropertyType names (or Property enums) to PropertyRecords,
+    # stored in a list indexed by the Property enum value.
+    __slots__ = ("_records", "_extra")
+
+    def __init__(self):
+        self._records = [None] * len(PROPERTY_NAMES)
+        self._extra = None
+
+    def __getitem__(self, prop):
+        index = self.__index(prop)
+        if index is not None:
+            record = self._records[index]
+            if record is not None:
+                return record
+        elif self._extra is not None:
+            return self._extra[prop]
+        raise KeyError(prop)
+
+    def __setitem__(self, prop, record):
+        index = self.__index(prop)
+        if index is not None:
+            self._records[index] = record
+        else:
+            if self._extra is None:
+                self._extra = dict()
+            self._extra[prop] = record
+
+    def __delitem__(self, prop):
+        index = self.__index(prop)
+        if index is not None:
+            if self._records[index] is None:
+                raise KeyError(prop)
+            self._records[index] = None
+        elif self._extra is None:
+            raise KeyError(prop)
+        else:
+            del self._extra[prop]
+
+    def __contains__(self, prop):
+        index = self.__index(prop)
+        if index is not None:
+            return self._records[index] is not None
+        return self._extra is not None and prop in self._extra
+
+    def __iter__(self):
+        for index, record in enumerate(self._records):
+            if record is not None:
+                yield PROPERTY_NAMES[index]
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for prop in self)
+
+    def __repr__(self):
+        return "PropertyTable({!r})".format(self.to_dict())
+
+    def update_properties(self, propinfos):
+        # applies a CameraPropertyInfo list and returns True if any changed
+        changed = False
+        records = self._records
+        for propinfo in propinfos:
+            proptype = propinfo["CameraPropertyType"]
+            index = PROPERTY_INDEX.get(proptype)
+            if index is None:
+                if proptype not in self:
+                    self[proptype] = PropertyRecord()
+                record = self[proptype]
+            else:
+                record = records[index]
+                if record is None:
+                    record = records[index] = PropertyRecord()
+            if record.update_fields(propinfo):
+                changed = True
+        return changed
+
+    def __index(self, prop):
+        if isinstance(prop, Property):
+            return prop.value
+        return PROPERTY_INDEX.get(prop)
+
+    def to_dict(self):
+        return {prop: record.to_dict() for prop, record in self.items()}
@@ -0,0 +1,294 @@
+# Generated by utils/smartshooter-genschema.py from external_api.json, do not edit.
+
+HEADER_FIELDS = (
+    "msg_type",
+    "msg_id",
+    "msg_seq_num",
+)
+
+CAMERA_INFO_FIELDS = (
+    "CameraSelection",
+    "CameraKey",
+    "CameraKeys",
+    "CameraGroup",
+    "CameraStatus",
+    "CameraName",
+    "CameraTriggerIndex",
+    "CameraSerialNumber",
+    "CameraMake",
+    "CameraModel",
+    "CameraNumCards",
+    "PhotoBatchNum",
+    "CameraDateTimeOffset",
+    "CameraAutofocusIsSupported",
+    "CameraIsFocused",
+    "CameraLiveviewIsSupported",
+    "CameraLiveviewZoomIsSupported",
+    "CameraLiveviewDOFIsSupported",
+    "CameraLiveviewFocusIsSupported",
+    "CameraLiveviewIsEnabled",
+    "CameraLiveviewZoomIsEnabled",
+    "CameraLiveviewDOFIsEnabled",
+    "CameraLiveviewNumFrames",
+    "CameraLiveviewSensorWidth",
+    "CameraLiveviewSensorHeight",
+    "CameraLiveviewSensorRegionLeft",
+    "CameraLiveviewSensorRegionBottom",
+    "CameraLiveviewSensorRegionRight",
+    "CameraLiveviewSensorRegionTop",
+    "CameraLiveviewAFRegionLeft",
+    "CameraLiveviewAFRegionBottom",
+    "CameraLiveviewAFRegionRight",
+    "CameraLiveviewAFRegionTop",
+    "CameraVideoIsSupported",
+    "CameraVideoIsEnabled",
+    "CameraVideoElapsedTime",
+    "CameraBulbIsSupported",
+    "CameraBulbIsEnabled",
+    "CameraPowersource",
+    "CameraBatterylevel",
+    "CameraDownloadRate",
+    "CameraNumPhotosTaken",
+    "CameraNumPhotosFailed",
+    "CameraNumDownloadsComplete",
+    "CameraNumDownloadsFailed",
+    "CameraNumAutofocus",
+    "CameraPowerZoomPosition",
+    "CameraPowerZoomTarget",
+    "CameraPropertyInfo",
+    "NodeKey",
+)
+
+CAMERA_PROPERTY_INFO_FIELDS = (
+    "CameraPropertyType",
+    "CameraPropertyValue",
+    "CameraPropertyIsWriteable",
+    "CameraPropertyRange",
+)
+
+PHOTO_INFO_FIELDS = (
+    "PhotoSelection",
+    "PhotoKey",
+    "PhotoKeys",
+    "PhotoLocation",
+    "PhotoUUID",
+    "PhotoName",
+    "PhotoFilename",
+    "PhotoOriginalName",
+    "PhotoComputedName",
+    "PhotoDateCaptured",
+    "PhotoOrigin",
+    "PhotoFormat",
+    "PhotoOrientation",
+    "PhotoWidth",
+    "PhotoHeight",
+    "PhotoAperture",
+    "PhotoShutterSpeed",
+    "PhotoISO",
+    "PhotoFocalLength",
+    "PhotoFilesize",
+    "PhotoIsImage",
+    "PhotoIsHidden",
+    "PhotoIsScanned",
+    "PhotoHash",
+    "PhotoBarcode",
+    "PhotoSequenceNum",
+    "PhotoBatchNum",
+    "PhotoSessionNum",
+    "PhotoSessionName",
+    "CameraKey",
+    "NodeKey",
+)
+
+CAMERA_PROPERTY_TYPES = (
+    "Aperture",
+    "ShutterSpeed",
+    "ISO",
+    "Exposure",
+    "Quality",
+    "ProgramMode",
+    "MeteringMode",
+    "FocusMode",
+    "DriveMode",
+    "WhiteBalance",
+    "ColourTemperature",
+    "Storage",
+    "MirrorLockup",
+    "PixelShiftMode",
+    "ControlMode",
+)
+
+RANGED_FIELDS = (
+    "CameraLiveviewFocusStep",
+    "CameraPowerZoomDirection",
+    "CameraPowersource",
+    "CameraPropertyType",
+    "CameraSelection",
+    "CameraShutterButton",
+    "CameraStatus",
+    "DefaultControlMode",
+    "DefaultFocusMode",
+    "DefaultStorage",
+    "PhotoFormat",
+    "PhotoLocation",
+    "PhotoOrientation",
+    "PhotoSelection",
+    "msg_type",
+)
+
+FIELD_TYPES = {
+    "ActivationCode": "string",
+    "AllowSpacesInFilename": "boolean",
+    "AutoConnect": "boolean",
+    "AutoScanBarcode": "boolean",
+    "AutoSynchroniseTime": "boolean",
+    "Barcode": "string",
+    "BulbTimer": "int64",
+    "CameraAutofocusIsSupported": "boolean",
+    "CameraBatterylevel": "int32",
+    "CameraBulbIsEnabled": "boolean",
+    "CameraBulbIsSupported": "boolean",
+    "CameraDateTimeOffset": "int64",
+    "CameraDownloadRate": "float",
+    "CameraGroup": "string",
+    "CameraIsFocused": "boolean",
+    "CameraKey": "string",
+    "CameraKeys": "string[]",
+    "CameraLatchIndex": "int32",
+    "CameraLiveviewAFRegionBottom": "float",
+    "CameraLiveviewAFRegionLeft": "float",
+    "CameraLiveviewAFRegionRight": "float",
+    "CameraLiveviewAFRegionTop": "float",
+    "CameraLiveviewDOFIsEnabled": "boolean",
+    "CameraLiveviewDOFIsSupported": "boolean",
+    "CameraLiveviewFPS": "int32",
+    "CameraLiveviewFocusIsSupported": "boolean",
+    "CameraLiveviewFocusStep": "string",
+    "CameraLiveviewImage": "string",
+    "CameraLiveviewIsEnabled": "boolean",
+    "CameraLiveviewIsSupported": "boolean",
+    "CameraLiveviewNumFrames": "uint32",
+    "CameraLiveviewSensorHeight": "int32",
+    "CameraLiveviewSensorRegionBottom": "float",
+    "CameraLiveviewSensorRegionLeft": "float",
+    "CameraLiveviewSensorRegionRight": "float",
+    "CameraLiveviewSensorRegionTop": "float",
+    "CameraLiveviewSensorWidth": "int32",
+    "CameraLiveviewVideoFPS": "int32",
+    "CameraLiveviewZoomIsEnabled": "boolean",
+    "CameraLiveviewZoomIsSupported": "boolean",
+    "CameraMake": "string",
+    "CameraMirrorLockupIsEnabled": "boolean",
+    "CameraMirrorLockupIsSupported": "boolean",
+    "CameraModel": "string",
+    "CameraName": "string",
+    "CameraNumAutofocus": "int32",
+    "CameraNumCards": "int32",
+    "CameraNumDownloadsComplete": "int32",
+    "CameraNumDownloadsFailed": "int32",
+    "CameraNumPhotosFailed": "int32",
+    "CameraNumPhotosTaken": "int32",
+    "CameraPowerZoomDirection": "string",
+    "CameraPowerZoomPosition": "int32",
+    "CameraPowerZoomTarget": "int32",
+    "CameraPowersource": "string",
+    "CameraPropertyIsWriteable": "boolean",
+    "CameraPropertyRange": "string[]",
+    "CameraPropertyStep": "int32",
+    "CameraPropertyType": "string",
+    "CameraPropertyValue": "string",
+    "CameraSelection": "string",
+    "CameraSerialNumber": "string",
+    "CameraShutterButton": "string",
+    "CameraStatus": "string",
+    "CameraTriggerIndex": "string",
+    "CameraTriggerInterval": "int32",
+    "CameraVideoElapsedTime": "int64",
+    "CameraVideoIsEnabled": "boolean",
+    "CameraVideoIsSupported": "boolean",
+    "CustomText": "string",
+    "DefaultControlMode": "string",
+    "DefaultFocusMode": "string",
+    "DefaultLiveviewFPS": "int32",
+    "DefaultStorage": "string",
+    "DefaultVideoFPS": "int32",
+    "DeleteFiles": "boolean",
+    "DownloadPath": "string",
+    "Enable": "boolean",
+    "FallbackPath": "string",
+    "FilenameExpression": "string",
+    "License": "string",
+    "NetworkAddress": "string",
+    "NetworkEndpoint": "string",
+    "NetworkPort": "int32",
+    "NetworkTimestamp": "uint64",
+    "NetworkVersion": "string",
+    "NodeEndpoint": "string",
+    "NodeIsLiveviewConsumer": "boolean",
+    "NodeIsMaster": "boolean",
+    "NodeKey": "string",
+    "NodeKeys": "string[]",
+    "NodeName": "string",
+    "NodePlatform": "string",
+    "NodeSelection": "string",
+    "NodeSyncLocal": "boolean",
+    "NodeSyncVersion": "uint32",
+    "NodeTransferMode": "float",
+    "NodeVersion": "string",
+    "PhotoAperture": "string",
+    "PhotoBarcode": "string",
+    "PhotoBatchNum": "int32",
+    "PhotoComputedName": "string",
+    "PhotoDateCaptured": "string",
+    "PhotoFilename": "string",
+    "PhotoFilesize": "uint64",
+    "PhotoFocalLength": "string",
+    "PhotoFormat": "string",
+    "PhotoHash": "string",
+    "PhotoHeight": "int32",
+    "PhotoISO": "string",
+    "PhotoIsHidden": "boolean",
+    "PhotoIsImage": "boolean",
+    "PhotoIsScanned": "boolean",
+    "PhotoKey": "string",
+    "PhotoKeys": "string[]",
+    "PhotoLocation": "string",
+    "PhotoName": "string",
+    "PhotoOrientation": "string",
+    "PhotoOrigin": "string",
+    "PhotoOriginalName": "string",
+    "PhotoSelection": "string",
+    "PhotoSequenceNum": "int32",
+    "PhotoSessionName": "string",
+    "PhotoSessionNum": "int32",
+    "PhotoShutterSpeed": "string",
+    "PhotoUUID": "string",
+    "PhotoWidth": "int32",
+    "TransferData": "data",
+    "TransferOffset": "uint32",
+    "TransferSize": "uint32",
+    "UniqueTag": "string",
+    "msg_id": "string",
+    "msg_result": "boolean",
+    "msg_seq_num": "uint32",
+    "msg_type": "string",
+    "msg_user_id": "uint32",
+}
+
+FIELD_RANGES = {
+    "CameraLiveviewFocusStep": ("Near1", "Near2", "Near3", "Far1", "Far2", "Far3"),
+    "CameraPowerZoomDirection": ("Tele1", "Tele2", "Tele3", "Wide1", "Wide2", "Wide3"),
+    "CameraPowersource": ("AC", "Battery", "Unknown"),
+    "CameraPropertyType": ("Aperture", "ShutterSpeed", "ISO", "Exposure", "Quality", "ProgramMode", "MeteringMode", "FocusMode", "DriveMode", "WhiteBalance", "ColourTemperature", "Storage", "MirrorLockup", "PixelShiftMode", "ControlMode"),
+    "CameraSelection": ("All", "Single", "Group", "Multiple"),
+    "CameraShutterButton": ("Off", "Half", "Full"),
+    "CameraStatus": ("Absent", "Lost", "Disconnected", "Ready", "Busy", "Error"),
+    "DefaultControlMode": ("Camera", "App", "Both"),
+    "DefaultFocusMode": ("Not set", "AF Single", "AF Continuous", "AF Auto", "MF"),
+    "DefaultStorage": ("Disk", "Card", "Both"),
+    "PhotoFormat": ("JPEG", "PNG", "Raw", "TGA", "TIFF", "Unknown"),
+    "PhotoLocation": ("Orphaned", "Deleted", "Camera", "Local Disk"),
+    "PhotoOrientation": ("None", "Rotate270", "Rotate180", "Rotate90", "FlipY", "InverseTranspose", "FlipX", "Transpose", "Unknown"),
+    "PhotoSelection": ("All", "Single", "Multiple"),
+    "msg_type": ("Request", "Response", "Event"),
+}
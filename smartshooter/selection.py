@@ -79,7 +79,7 @@ class PhotoSelection:
         self.__keys = None
 
     def select_photos(self, keys):
-        self.__mode = PhotoelectionMode.Multiple
+        self.__mode = PhotoSelectionMode.Multiple
         self.__key = None
         self.__keys = keys
 
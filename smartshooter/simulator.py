@@ -0,0 +1,435 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import time
+import datetime
+import json
+import heapq
+import uuid
+import base64
+import argparse
+import threading
+import itertools
+import zmq
+from . import schema
+
+PROPERTY_RANGES = {
+    "Aperture": ["2.8", "4", "5.6", "8", "11", "16"],
+    "ShutterSpeed": ["1/1000", "1/500", "1/250", "1/125", "1/60", "1/30"],
+    "ISO": ["100", "200", "400", "800", "1600", "3200"],
+    "Exposure": ["-1", "-2/3", "-1/3", "0", "+1/3", "+2/3", "+1"],
+}
+
+def default_value(name):
+    # a plausible empty value for a field, based on its type in the schema
+    field_type = schema.FIELD_TYPES.get(name)
+    if name in schema.FIELD_RANGES:
+        return schema.FIELD_RANGES[name][0]
+    if field_type in ("int32", "uint32", "int64", "uint64"):
+        return 0
+    if field_type == "float":
+        return 0.0
+    if field_type == "boolean":
+        return False
+    if field_type == "string[]":
+        return []
+    if field_type == "string":
+        return ""
+    return None
+
+def make_record(field_names):
+    record = {}
+    for name in field_names:
+        if name not in schema.HEADER_FIELDS:
+            record[name] = default_value(name)
+    return record
+
+class Simulator:
+    # A stand-in for Smart Shooter's external API, for testing and
+    # benchmarking without cameras. Requests are answered on a ROUTER socket
+    # and events go out on a PUB socket, all from one thread. Camera and
+    # photo records have every field from the generated schema.
+    def __init__(self, reqrep="tcp://127.0.0.1:54544", publisher="tcp://127.0.0.1:54543",
+                 num_cameras=4, num_groups=1, latency=0.0, capture_time=0.05,
+                 download_time=0.1, photo_size=8000000, liveview_fps=10.0,
+                 liveview_size=50000, num_photos=0, auto_download=True):
+        self.__reqrep = reqrep
+        self.__publisher = publisher
+        self.__latency = latency
+        self.__capture_time = capture_time
+        self.__download_time = download_time
+        self.__photo_size = photo_size
+        self.__auto_download = auto_download
+        self.__liveview_interval = 1.0 / liveview_fps if liveview_fps else None
+        image = base64.b64encode(os.urandom(liveview_size)).decode("ascii")
+        self.__liveview_image = image
+        self.__cameras = dict()
+        for index in range(num_cameras):
+            camera = self.__make_camera(index, num_groups)
+            self.__cameras[camera["CameraKey"]] = camera
+        self.__photos = dict()
+        keys = list(self.__cameras)
+        # without auto download, photos stay on the cameras until requested
+        location = "Local Disk" if auto_download else "Camera"
+        for index in range(num_photos):
+            camera = self.__cameras[keys[index % len(keys)]]
+            # the counters have to agree with the photos for a delta sync
+            camera["CameraNumPhotosTaken"] += 1
+            if auto_download:
+                camera["CameraNumDownloadsComplete"] += 1
+            self.__add_photo(camera, location, "api")
+        self.__timers = []
+        self.__timer_ids = itertools.count()
+        self.__calls = []
+        self.__calls_lock = threading.Lock()
+        self.__running = False
+        self.__thread = None
+        self.__num_requests = 0
+        self.__num_events = 0
+        self.__event_seq_nums = itertools.count(1)
+        self.__handlers = {
+            "Synchronise": self.__handle_Synchronise,
+            "GetCamera": self.__handle_GetCamera,
+            "Connect": self.__handle_Connect,
+            "Disconnect": self.__handle_Disconnect,
+            "Shoot": self.__handle_Shoot,
+            "SetProperty": self.__handle_SetProperty,
+            "EnableLiveview": self.__handle_EnableLiveview,
+            "NetworkPing": self.__handle_NetworkPing,
+            "Download": self.__handle_Download,
+            "Transfer": self.__handle_Transfer,
+            "Delete": self.__handle_Delete,
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __make_camera(self, index, num_groups):
+        camera = make_record(schema.CAMERA_INFO_FIELDS)
+        camera["CameraKey"] = "sim-{:04d}".format(index)
+        camera["CameraName"] = "Camera {}".format(index)
+        camera["CameraSerialNumber"] = "{:012d}".format(index)
+        camera["CameraMake"] = "Simulated"
+        camera["CameraModel"] = "Simulator"
+        camera["CameraGroup"] = "Group {}".format(index % max(1, num_groups))
+        camera["CameraStatus"] = "Ready"
+        camera["CameraPowersource"] = "AC"
+        camera["CameraBatterylevel"] = 100
+        camera["CameraLiveviewIsSupported"] = True
+        camera["CameraAutofocusIsSupported"] = True
+        camera["CameraPropertyInfo"] = [self.__make_property(name) for name in schema.CAMERA_PROPERTY_TYPES]
+        return camera
+
+    def __make_property(self, name):
+        prop = make_record(schema.CAMERA_PROPERTY_INFO_FIELDS)
+        values = PROPERTY_RANGES.get(name, ["1", "2", "3"])
+        prop["CameraPropertyType"] = name
+        prop["CameraPropertyValue"] = values[0]
+        prop["CameraPropertyRange"] = list(values)
+        prop["CameraPropertyIsWriteable"] = True
+        return prop
+
+    def __add_photo(self, camera, location, origin):
+        photo = make_record(schema.PHOTO_INFO_FIELDS)
+        photo["PhotoKey"] = uuid.uuid4().hex
+        photo["PhotoUUID"] = photo["PhotoKey"]
+        photo["PhotoSelection"] = "Single"
+        photo["PhotoLocation"] = location
+        photo["PhotoOrigin"] = origin
+        photo["PhotoFormat"] = "JPEG"
+        photo["PhotoIsImage"] = True
+        photo["PhotoFilesize"] = self.__photo_size
+        photo["PhotoOriginalName"] = "IMG_{:04d}.JPG".format(len(self.__photos) % 10000)
+        photo["CameraKey"] = camera["CameraKey"]
+        self.__photos[photo["PhotoKey"]] = photo
+        return photo
+
+    def get_camera_keys(self):
+        return list(self.__cameras)
+
+    def get_num_requests(self):
+        return self.__num_requests
+
+    def get_num_events(self):
+        return self.__num_events
+
+    def start(self):
+        if self.__thread:
+            return
+        self.__running = True
+        ready = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, args=(ready,), name="smartshooter-simulator")
+        self.__thread.daemon = True
+        self.__thread.start()
+        ready.wait()
+
+    def stop(self):
+        self.__running = False
+        if self.__thread:
+            self.__thread.join()
+            self.__thread = None
+
+    def call(self, func, *args):
+        # runs func on the simulator thread, which owns the sockets
+        with self.__calls_lock:
+            self.__calls.append((func, args))
+
+    def publish_events(self, count, msg_id="CameraUpdated"):
+        # publishes a burst of events, e.g. to measure event ingestion
+        self.call(self.__publish_burst, count, msg_id)
+
+    def __publish_burst(self, count, msg_id):
+        keys = list(self.__cameras)
+        for index in range(count):
+            camera = self.__cameras[keys[index % len(keys)]]
+            if msg_id == "CameraUpdated":
+                camera["CameraNumAutofocus"] += 1
+            self.__publish_camera(camera, msg_id)
+
+    def __schedule(self, delay, func, *args):
+        heapq.heappush(self.__timers, (time.perf_counter() + delay, next(self.__timer_ids), func, args))
+
+    def __run(self, ready):
+        zmq_ctx = zmq.Context.instance()
+        self.__router = zmq_ctx.socket(zmq.ROUTER)
+        self.__router.bind(self.__reqrep)
+        self.__pub = zmq_ctx.socket(zmq.PUB)
+        self.__pub.bind(self.__publisher)
+        ready.set()
+        try:
+            while self.__running:
+                timeout = 5
+                if self.__timers:
+                    delay = self.__timers[0][0] - time.perf_counter()
+                    timeout = max(0, min(timeout, delay * 1000))
+                if self.__router.poll(timeout):
+                    while self.__router.poll(0):
+                        self.__handle_request(self.__router.recv_multipart())
+                now = time.perf_counter()
+                while self.__timers and self.__timers[0][0] <= now:
+                    due, timer_id, func, args = heapq.heappop(self.__timers)
+                    func(*args)
+                if self.__calls:
+                    with self.__calls_lock:
+                        calls = self.__calls
+                        self.__calls = []
+                    for func, args in calls:
+                        func(*args)
+        finally:
+            self.__router.close(0)
+            self.__pub.close(0)
+
+    def __handle_request(self, frames):
+        self.__num_requests += 1
+        request = json.loads(frames[-1])
+        reply = {}
+        reply["msg_type"] = "Response"
+        reply["msg_id"] = request.get("msg_id")
+        reply["msg_seq_num"] = request.get("msg_seq_num", 0)
+        reply["msg_result"] = True
+        handler = self.__handlers.get(request.get("msg_id"))
+        events = []
+        if handler is not None:
+            events = handler(request, reply) or []
+        data = frames[:-1] + [json.dumps(reply).encode("utf-8")]
+        if self.__latency:
+            self.__schedule(self.__latency, self.__router.send_multipart, data)
+        else:
+            self.__router.send_multipart(data)
+        for delay, func, args in events:
+            self.__schedule(self.__latency + delay, func, *args)
+
+    def __select_cameras(self, request):
+        mode = request.get("CameraSelection", "All")
+        if mode == "Single":
+            keys = [request.get("CameraKey")]
+        elif mode == "Multiple":
+            keys = request.get("CameraKeys", [])
+        elif mode == "Group":
+            group = request.get("CameraGroup")
+            keys = [key for key, camera in self.__cameras.items() if camera["CameraGroup"] == group]
+        else:
+            keys = list(self.__cameras)
+        return [self.__cameras[key] for key in keys if key in self.__cameras]
+
+    def __select_photos(self, request):
+        mode = request.get("PhotoSelection", "All")
+        if mode == "Single":
+            keys = [request.get("PhotoKey")]
+        elif mode == "Multiple":
+            keys = request.get("PhotoKeys", [])
+        else:
+            keys = list(self.__photos)
+        return [self.__photos[key] for key in keys if key in self.__photos]
+
+    def __publish(self, msg_id, record):
+        msg = {}
+        msg["msg_type"] = "Event"
+        msg["msg_id"] = msg_id
+        msg["msg_seq_num"] = next(self.__event_seq_nums)
+        msg.update(record)
+        self.__pub.send(json.dumps(msg).encode("utf-8"))
+        self.__num_events += 1
+
+    def __publish_camera(self, camera, msg_id="CameraUpdated"):
+        self.__publish(msg_id, camera)
+
+    def __set_status(self, camera, status):
+        camera["CameraStatus"] = status
+        self.__publish_camera(camera)
+
+    def __handle_Synchronise(self, request, reply):
+        reply["CameraInfo"] = list(self.__cameras.values())
+        reply["PhotoInfo"] = list(self.__photos.values())
+
+    def __handle_GetCamera(self, request, reply):
+        reply["CameraInfo"] = self.__select_cameras(request)
+
+    def __handle_Connect(self, request, reply):
+        return [(0, self.__set_status, (camera, "Ready")) for camera in self.__select_cameras(request)]
+
+    def __handle_Disconnect(self, request, reply):
+        return [(0, self.__set_status, (camera, "Disconnected")) for camera in self.__select_cameras(request)]
+
+    def __handle_NetworkPing(self, request, reply):
+        reply["NetworkTimestamp"] = int(time.time() * 1000)
+
+    def __handle_Download(self, request, reply):
+        # each camera downloads its photos one after another
+        events = []
+        queued = dict()
+        for photo in self.__select_photos(request):
+            if photo["PhotoLocation"] != "Camera":
+                continue
+            camera = self.__cameras[photo["CameraKey"]]
+            queued[camera["CameraKey"]] = queued.get(camera["CameraKey"], 0) + 1
+            events.append((queued[camera["CameraKey"]] * self.__download_time, self.__download, (camera, photo)))
+        return events
+
+    def __handle_Transfer(self, request, reply):
+        events = []
+        for index, photo in enumerate(self.__select_photos(request)):
+            events.append(((index + 1) * self.__download_time, self.__publish, ("PhotoUpdated", photo)))
+        return events
+
+    def __handle_Delete(self, request, reply):
+        return [(0, self.__delete, (photo,)) for photo in self.__select_photos(request)]
+
+    def __delete(self, photo):
+        photo["PhotoLocation"] = "Deleted"
+        self.__publish("PhotoUpdated", photo)
+
+    def __handle_SetProperty(self, request, reply):
+        cameras = self.__select_cameras(request)
+        for camera in cameras:
+            for prop in camera["CameraPropertyInfo"]:
+                if prop["CameraPropertyType"] == request.get("CameraPropertyType"):
+                    prop["CameraPropertyValue"] = request.get("CameraPropertyValue")
+        return [(0, self.__publish_camera, (camera,)) for camera in cameras]
+
+    def __handle_EnableLiveview(self, request, reply):
+        enable = bool(request.get("Enable"))
+        events = []
+        for camera in self.__select_cameras(request):
+            was_enabled = camera["CameraLiveviewIsEnabled"]
+            camera["CameraLiveviewIsEnabled"] = enable
+            events.append((0, self.__publish_camera, (camera,)))
+            if enable and not was_enabled and self.__liveview_interval:
+                events.append((self.__liveview_interval, self.__send_liveview, (camera,)))
+        return events
+
+    def __send_liveview(self, camera):
+        if not camera["CameraLiveviewIsEnabled"] or camera["CameraStatus"] not in ("Ready", "Busy"):
+            return
+        camera["CameraLiveviewNumFrames"] += 1
+        self.__publish("LiveviewUpdated", {"CameraKey": camera["CameraKey"],
+                                           "CameraLiveviewImage": self.__liveview_image})
+        # just the frame count, rather than the whole camera on every frame
+        self.__publish("CameraUpdated", {"CameraKey": camera["CameraKey"],
+                                         "CameraLiveviewNumFrames": camera["CameraLiveviewNumFrames"]})
+        self.__schedule(self.__liveview_interval, self.__send_liveview, camera)
+
+    def __handle_Shoot(self, request, reply):
+        origin = request.get("PhotoOrigin", "")
+        events = []
+        for camera in self.__select_cameras(request):
+            if camera["CameraStatus"] != "Ready":
+                continue
+            events.append((0, self.__set_status, (camera, "Busy")))
+            events.append((self.__capture_time, self.__capture, (camera, origin)))
+        return events
+
+    def __capture(self, camera, origin):
+        camera["CameraNumPhotosTaken"] += 1
+        photo = self.__add_photo(camera, "Camera", origin)
+        photo["PhotoDateCaptured"] = datetime.datetime.now().isoformat(timespec="milliseconds")
+        self.__publish("PhotoUpdated", photo)
+        self.__set_status(camera, "Ready")
+        if self.__auto_download:
+            self.__schedule(self.__download_time, self.__download, camera, photo)
+
+    def __download(self, camera, photo):
+        photo["PhotoLocation"] = "Local Disk"
+        photo["PhotoFilename"] = os.path.join("photos", photo["PhotoOriginalName"])
+        camera["CameraNumDownloadsComplete"] += 1
+        if self.__download_time:
+            camera["CameraDownloadRate"] = self.__photo_size / 1e6 / self.__download_time
+        self.__publish("PhotoUpdated", photo)
+        self.__publish_camera(camera)
+
+def main():
+    parser = argparse.ArgumentParser("smartshooter.simulator")
+    parser.add_argument("-p", "--publisher",
+                        default="tcp://127.0.0.1:54543",
+                        metavar="ENDPOINT",
+                        help="specify ZMQ address to publish events on")
+    parser.add_argument("-r", "--reqrep",
+                        default="tcp://127.0.0.1:54544",
+                        metavar="ENDPOINT",
+                        help="specify ZMQ address to serve requests on")
+    parser.add_argument("-n", "--cameras", type=int, default=4,
+                        help="number of simulated cameras")
+    parser.add_argument("-g", "--groups", type=int, default=1,
+                        help="number of camera groups")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="delay in seconds before replying to each request")
+    parser.add_argument("--liveview-fps", type=float, default=10.0,
+                        help="live view frame rate for each camera")
+    args = parser.parse_args()
+
+    simulator = Simulator(args.reqrep, args.publisher, args.cameras, args.groups,
+                          args.latency, liveview_fps=args.liveview_fps)
+    simulator.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import zlib
+import tempfile
+from . import codec
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Snapshot files start with a magic number and a format byte, followed by
+# either msgpack data or zlib compressed JSON when msgpack isn't installed.
+MAGIC = b"SSNP"
+FORMAT_MSGPACK = b"M"
+FORMAT_JSON_ZLIB = b"Z"
+
+def encode_snapshot(snapshot):
+    if msgpack is not None:
+        return MAGIC + FORMAT_MSGPACK + msgpack.packb(snapshot, use_bin_type=True)
+    return MAGIC + FORMAT_JSON_ZLIB + zlib.compress(codec.dumpb(snapshot), 1)
+
+def decode_snapshot(data):
+    if not data.startswith(MAGIC):
+        raise ValueError("not a snapshot file")
+    data_format = data[len(MAGIC):len(MAGIC) + 1]
+    payload = memoryview(data)[len(MAGIC) + 1:]
+    if data_format == FORMAT_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack is needed to read this snapshot")
+        return msgpack.unpackb(payload, raw=False)
+    if data_format == FORMAT_JSON_ZLIB:
+        return codec.loads(zlib.decompress(payload))
+    raise ValueError("unknown snapshot format: {!r}".format(data_format))
+
+def save_snapshot(path, snapshot):
+    # write to a temporary file first, so a crash never leaves a partial
+    # snapshot behind
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(encode_snapshot(snapshot))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_snapshot(path):
+    with open(path, "rb") as f:
+        return decode_snapshot(f.read())
@@ -21,16 +21,44 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
+import time
+from collections import OrderedDict
 from .enums import CameraSelectionMode
 from .enums import PhotoSelectionMode
 from .selection import CameraSelection
 from .selection import PhotoSelection
+from .records import CameraRecord
+from .records import PhotoRecord
+
+CONNECTED_STATUSES = ["Ready", "Busy"]
+
+# if none of these change for any camera, the photo list is still current
+PHOTO_COUNTER_FIELDS = [
+    "CameraNumPhotosTaken",
+    "CameraNumPhotosFailed",
+    "CameraNumDownloadsComplete",
+    "CameraNumDownloadsFailed",
+]
+
+SNAPSHOT_VERSION = 1
 
 class StateTracker:
-    def __init__(self):
+    def __init__(self, max_photos=None, max_photo_age=None):
         self.__is_synchronised = False
         self.__cameras = dict()
-        self.__photos = dict()
+        # ordered by last update, so the least recently updated photo is first
+        self.__photos = OrderedDict()
+        self.__photo_times = dict()
+        self.__max_photos = max_photos
+        self.__max_photo_age = max_photo_age
+        # secondary indexes, each an insertion ordered dict used as a set
+        self.__index_keys = dict()
+        self.__by_group = dict()
+        self.__by_status = dict()
+        self.__connected = dict()
+        self.__connected_by_group = dict()
+        self.__liveview = dict()
+        self.__liveview_by_group = dict()
 
     def is_synchronised(self):
         return self.__is_synchronised
@@ -38,46 +66,216 @@ class StateTracker:
     def invalidate(self):
         self.__is_synchronised = False
 
+    def mark_synchronised(self):
+        self.__is_synchronised = True
+
     def __read_Synchronise(self, msg):
+        # a full reply replaces everything, so cameras and photos that have
+        # gone (or only came from an old snapshot) are dropped
         self.__is_synchronised = True
         cameras = msg["CameraInfo"]
+        self.retain_cameras([camera["CameraKey"] for camera in cameras])
         for camera in cameras:
             self.__read_CameraUpdated(camera)
         photos = msg["PhotoInfo"]
+        keys = set(photo["PhotoKey"] for photo in photos)
+        for key in [key for key in self.__photos if key not in keys]:
+            del self.__photos[key]
+            del self.__photo_times[key]
         for photo in photos:
             self.__read_PhotoUpdated(photo)
 
+    def retain_cameras(self, keys):
+        # removes cameras not in keys, e.g. after a GetCamera reply for all
+        # cameras, and returns the keys that were removed
+        keys = set(keys)
+        removed = [key for key in self.__cameras if key not in keys]
+        for key in removed:
+            del self.__cameras[key]
+            index_key = self.__index_keys.pop(key, None)
+            if index_key is not None:
+                self.__remove_from_index(key, index_key)
+        return removed
+
     def __read_CameraUpdated(self, msg):
+        changed = False
         key = msg["CameraKey"]
         if key not in self.__cameras:
-            self.__cameras[key] = dict()
-            self.__cameras[key]["CameraPropertyInfo"] = dict()
+            self.__cameras[key] = CameraRecord()
+            changed = True
         obj = self.__cameras[key]
-        for key, value in msg.items():
-            if key != "CameraPropertyInfo":
-                obj[key] = value
+        if obj.update_fields(msg, "CameraPropertyInfo"):
+            changed = True
+        propinfos = msg.get("CameraPropertyInfo")
+        if propinfos and obj.CameraPropertyInfo.update_properties(propinfos):
+            changed = True
+        if changed:
+            self.__update_index(key, obj)
+        return changed
+
+    def __update_index(self, key, obj):
+        group = obj.get("CameraGroup")
+        status = obj.get("CameraStatus")
+        is_connected = status in CONNECTED_STATUSES
+        is_liveview = is_connected and bool(obj.get("CameraLiveviewIsEnabled"))
+        index_key = (group, status, is_connected, is_liveview)
+        old_index_key = self.__index_keys.get(key)
+        if index_key == old_index_key:
+            return
+        self.__index_keys[key] = index_key
+        if old_index_key is None:
+            old_group, old_status, was_connected, was_liveview = None, None, False, False
+        else:
+            old_group, old_status, was_connected, was_liveview = old_index_key
+        # only indexes whose membership changed are touched, so e.g. a
+        # Ready/Busy flip doesn't move the camera to the end of the others
+        regrouped = old_index_key is None or group != old_group
+        if regrouped:
+            if old_index_key is not None:
+                self.__remove_from_bucket(self.__by_group, old_group, key)
+            self.__add_to_bucket(self.__by_group, group, key)
+        if old_index_key is None or status != old_status:
+            if old_index_key is not None:
+                self.__remove_from_bucket(self.__by_status, old_status, key)
+            self.__add_to_bucket(self.__by_status, status, key)
+        if is_connected != was_connected:
+            if is_connected:
+                self.__connected[key] = None
+            else:
+                self.__connected.pop(key, None)
+        if regrouped or is_connected != was_connected:
+            if was_connected:
+                self.__remove_from_bucket(self.__connected_by_group, old_group, key)
+            if is_connected:
+                self.__add_to_bucket(self.__connected_by_group, group, key)
+        if is_liveview != was_liveview:
+            if is_liveview:
+                self.__liveview[key] = None
             else:
-                for propinfo in value:
-                    proptype = propinfo["CameraPropertyType"]
-                    if proptype not in obj["CameraPropertyInfo"]:
-                        obj["CameraPropertyInfo"][proptype] = dict()
-                    obj["CameraPropertyInfo"][proptype].update(propinfo)
+                self.__liveview.pop(key, None)
+        if regrouped or is_liveview != was_liveview:
+            if was_liveview:
+                self.__remove_from_bucket(self.__liveview_by_group, old_group, key)
+            if is_liveview:
+                self.__add_to_bucket(self.__liveview_by_group, group, key)
+
+    def __remove_from_index(self, key, index_key):
+        group, status, is_connected, is_liveview = index_key
+        self.__remove_from_bucket(self.__by_group, group, key)
+        self.__remove_from_bucket(self.__by_status, status, key)
+        if is_connected:
+            self.__connected.pop(key, None)
+            self.__remove_from_bucket(self.__connected_by_group, group, key)
+        if is_liveview:
+            self.__liveview.pop(key, None)
+            self.__remove_from_bucket(self.__liveview_by_group, group, key)
+
+    def __add_to_bucket(self, index, bucket, key):
+        if bucket not in index:
+            index[bucket] = dict()
+        index[bucket][key] = None
+
+    def __remove_from_bucket(self, index, bucket, key):
+        keys = index.get(bucket)
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del index[bucket]
 
     def __read_PhotoUpdated(self, msg):
         key = msg["PhotoKey"]
         if key not in self.__photos:
-            self.__photos[key] = dict()
-        obj = self.__photos[key]
-        for key, value in msg.items():
-            obj[key] = value
+            self.__photos[key] = PhotoRecord()
+        else:
+            self.__photos.move_to_end(key)
+        self.__photos[key].update_fields(msg)
+        self.__photo_times[key] = time.monotonic()
+        self.__evict_photos()
+        return True
+
+    def __evict_photos(self):
+        if self.__max_photos is not None:
+            while len(self.__photos) > self.__max_photos:
+                self.__remove_oldest_photo()
+        if self.__max_photo_age is not None:
+            cutoff = time.monotonic() - self.__max_photo_age
+            while self.__photos:
+                key = next(iter(self.__photos))
+                if self.__photo_times[key] >= cutoff:
+                    break
+                self.__remove_oldest_photo()
+
+    def __remove_oldest_photo(self):
+        key, _ = self.__photos.popitem(last=False)
+        del self.__photo_times[key]
+
+    def set_photo_limits(self, max_photos=None, max_photo_age=None):
+        self.__max_photos = max_photos
+        self.__max_photo_age = max_photo_age
+        self.__evict_photos()
+
+    def get_num_photos(self):
+        return len(self.__photos)
+
+    def __read_GetCamera(self, msg):
+        for camera in msg.get("CameraInfo", []):
+            self.__read_CameraUpdated(camera)
 
     def process_reply(self, msg):
-        if msg["msg_id"] == "Synchronise":
+        msg_id = msg["msg_id"]
+        if msg_id == "Synchronise":
             self.__read_Synchronise(msg)
+        elif msg_id == "GetCamera":
+            self.__read_GetCamera(msg)
+
+    def get_photo_counters(self):
+        counters = dict()
+        for key, camera in self.__cameras.items():
+            counters[key] = tuple(camera.get(field) for field in PHOTO_COUNTER_FIELDS)
+        return counters
+
+    def photos_match_counters(self):
+        # Smart Shooter's counters restart from zero, so after a restart they
+        # can match old ones by chance. Tracked photos from a camera that
+        # outnumber the photos it has taken must be from before the restart.
+        num_photos = dict()
+        for photo in self.__photos.values():
+            key = photo.get("CameraKey")
+            if key:
+                num_photos[key] = num_photos.get(key, 0) + 1
+        for key, count in num_photos.items():
+            camera = self.__cameras.get(key)
+            if camera is None or count > (camera.get("CameraNumPhotosTaken") or 0):
+                return False
+        return True
+
+    def get_snapshot(self):
+        cameras = []
+        for camera in self.__cameras.values():
+            obj = camera.to_dict()
+            obj["CameraPropertyInfo"] = list(obj["CameraPropertyInfo"].values())
+            cameras.append(obj)
+        photos = [photo.to_dict() for photo in self.__photos.values()]
+        return {"version": SNAPSHOT_VERSION, "CameraInfo": cameras, "PhotoInfo": photos}
+
+    def load_snapshot(self, snapshot):
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError("unsupported snapshot version: {}".format(snapshot.get("version")))
+        for camera in snapshot["CameraInfo"]:
+            self.__read_CameraUpdated(camera)
+        for photo in snapshot["PhotoInfo"]:
+            self.__read_PhotoUpdated(photo)
+
+    def get_event_ids(self):
+        return ["CameraUpdated", "PhotoUpdated"]
 
     def process_event(self, msg):
-        if msg["msg_id"] == "CameraUpdated":
-            self.__read_CameraUpdated(msg)
+        msg_id = msg["msg_id"]
+        if msg_id == "CameraUpdated":
+            return self.__read_CameraUpdated(msg)
+        elif msg_id == "PhotoUpdated":
+            return self.__read_PhotoUpdated(msg)
+        return False
 
     def get_camera_list(self):
         return list(self.__cameras)
@@ -98,13 +296,9 @@ class StateTracker:
         elif mode == CameraSelectionMode.Single:
             return [selection.get_key()]
         elif mode == CameraSelectionMode.Multiple:
-            return [selection.get_keys()]
+            return list(selection.get_keys())
         elif mode == CameraSelectionMode.Group:
-            selected_cameras = []
-            for key, value in self.__cameras.items():
-                if value["CameraGroup"] == selection.get_group():
-                    selected_cameras.append(key)
-            return selected_cameras
+            return list(self.__by_group.get(selection.get_group(), ()))
         return []
 
     def get_selected_photos(self, selection):
@@ -114,41 +308,81 @@ class StateTracker:
         elif mode == PhotoSelectionMode.Single:
             return [selection.get_key()]
         elif mode == PhotoSelectionMode.Multiple:
-            return [selection.get_keys()]
+            return list(selection.get_keys())
         return []
 
-    def __is_camera_connected(self, key):
-        camera = self.__cameras[key]
-        status = camera["CameraStatus"]
-        return status in ["Ready", "Busy"]
+    def get_cameras_with_status(self, status):
+        return list(self.__by_status.get(status, ()))
+
+    def get_camera_groups(self):
+        return list(self.__by_group)
+
+    def __is_selection_in(self, selection, keys, keys_by_group):
+        mode = selection.get_mode()
+        if mode == CameraSelectionMode.All:
+            return len(keys) == len(self.__cameras)
+        elif mode == CameraSelectionMode.Single:
+            return selection.get_key() in keys
+        elif mode == CameraSelectionMode.Multiple:
+            for key in selection.get_keys():
+                if key not in keys:
+                    return False
+            return True
+        elif mode == CameraSelectionMode.Group:
+            group = selection.get_group()
+            num_selected = len(self.__by_group.get(group, ()))
+            return len(keys_by_group.get(group, ())) == num_selected
+        return False
+
+    def is_selection_connected(self, selection):
+        return self.__is_selection_in(selection, self.__connected, self.__connected_by_group)
+
+    def is_selection_liveview_enabled(self, selection):
+        return self.__is_selection_in(selection, self.__liveview, self.__liveview_by_group)
 
     def __get_active_camera(self, selection):
+        # returns the first connected camera in the selection. The connected
+        # indexes are in order of connection and a Ready/Busy flip doesn't
+        # touch them, so the camera doesn't change as cameras go busy and back.
         mode = selection.get_mode()
         if mode == CameraSelectionMode.All:
-            for key in self.__cameras:
-                if self.__is_camera_connected(key):
-                    return key
+            return next(iter(self.__connected), None)
         elif mode == CameraSelectionMode.Single:
             return selection.get_key()
         elif mode == CameraSelectionMode.Multiple:
             for key in selection.get_keys():
-                if self.__is_camera_connected(key):
+                if key in self.__connected:
                     return key
         elif mode == CameraSelectionMode.Group:
-            for key, value in self.__cameras.items():
-                if self.__is_camera_connected(key):
-                    if value["CameraGroup"] == selection.get_group():
-                        return key
+            return next(iter(self.__connected_by_group.get(selection.get_group(), ())), None)
         return None
 
     def get_property(self, selection, prop):
         key = self.__get_active_camera(selection)
         camera = self.__cameras[key]
-        propinfo = camera["CameraPropertyInfo"][prop.name]
+        propinfo = camera["CameraPropertyInfo"][prop]
         return propinfo["CameraPropertyValue"]
 
+    def get_camera_property(self, key, prop):
+        camera = self.__cameras.get(key)
+        if camera is None:
+            return None
+        propinfo = camera["CameraPropertyInfo"].get(prop)
+        if propinfo is None:
+            return None
+        return propinfo.get("CameraPropertyValue")
+
+    def get_camera_property_range(self, key, prop):
+        camera = self.__cameras.get(key)
+        if camera is None:
+            return None
+        propinfo = camera["CameraPropertyInfo"].get(prop)
+        if propinfo is None:
+            return None
+        return propinfo.get("CameraPropertyRange")
+
     def get_property_range(self, selection, prop):
         key = self.__get_active_camera(selection)
         camera = self.__cameras[key]
-        propinfo = camera["CameraPropertyInfo"][prop.name]
+        propinfo = camera["CameraPropertyInfo"][prop]
         return propinfo["CameraPropertyRange"]
@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+from json.encoder import encode_basestring
+from . import codec
+from .enums import CameraSelectionMode
+from .enums import PhotoSelectionMode
+
+# Helpers for the generated builders in messages.py. Each one returns a JSON
+# fragment as a string, so a request is built by concatenating constant
+# text with the encoded fields, without building a dict first.
+
+def encode_string(value):
+    if type(value) is not str:
+        # enums are sent by name, _name_ is much quicker to get than name
+        value = getattr(value, "_name_", value)
+        if not isinstance(value, str):
+            return codec.dumps(value)
+    return encode_basestring(value)
+
+def encode_strings(values):
+    return "[" + ",".join([encode_string(value) for value in values]) + "]"
+
+def encode_int(value):
+    if type(value) is int:
+        return str(value)
+    return codec.dumps(value)
+
+def encode_float(value):
+    if type(value) is float or type(value) is int:
+        return repr(value)
+    return codec.dumps(value)
+
+def encode_bool(value):
+    if value:
+        return "true"
+    return "false"
+
+def encode_value(value):
+    return codec.dumps(value)
+
+# looking up enum members on the class is slow, so compare against these
+CAMERA_ALL = CameraSelectionMode.All
+CAMERA_SINGLE = CameraSelectionMode.Single
+CAMERA_MULTIPLE = CameraSelectionMode.Multiple
+PHOTO_ALL = PhotoSelectionMode.All
+PHOTO_SINGLE = PhotoSelectionMode.Single
+
+def encode_camera_selection(selection):
+    mode = selection.get_mode()
+    if mode is CAMERA_ALL:
+        return ',"CameraSelection":"All"'
+    if mode is CAMERA_SINGLE:
+        return ',"CameraSelection":"Single","CameraKey":' + encode_string(selection.get_key())
+    if mode is CAMERA_MULTIPLE:
+        return ',"CameraSelection":"Multiple","CameraKeys":' + encode_strings(selection.get_keys())
+    return ',"CameraSelection":"Group","CameraGroup":' + encode_string(selection.get_group())
+
+def encode_photo_selection(selection):
+    mode = selection.get_mode()
+    if mode is PHOTO_ALL:
+        return ',"PhotoSelection":"All"'
+    if mode is PHOTO_SINGLE:
+        return ',"PhotoSelection":"Single","PhotoKey":' + encode_string(selection.get_key())
+    return ',"PhotoSelection":"Multiple","PhotoKeys":' + encode_strings(selection.get_keys())
+
+def encode_fields(fields):
+    # for messages whose fields external_api.json doesn't describe
+    return "".join(["," + encode_basestring(name) + ":" + codec.dumps(value) for name, value in fields.items()])
+
+def decode_message(data, msg_id):
+    msg = codec.loads(data)
+    if msg.get("msg_id") != msg_id:
+        raise ValueError("expected {} message, got {}".format(msg_id, msg.get("msg_id")))
+    return msg
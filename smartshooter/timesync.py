@@ -0,0 +1,266 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import uuid
+import asyncio
+import datetime
+
+# asyncio.sleep can overshoot by a millisecond or more, so the last part of
+# the wait before each dispatch is spent polling the clock instead
+SPIN_TIME = 0.002
+
+# formats of PhotoDateCaptured other than ISO 8601, most precise first
+CAPTURE_TIME_FORMATS = ["%Y:%m:%d %H:%M:%S.%f", "%Y:%m:%d %H:%M:%S"]
+
+class ClockEstimate:
+    # NTP style estimate from the ping with the shortest round trip, since
+    # that one has the least queueing delay in it. offset is remote minus
+    # local clock, and is None if the node doesn't report its own time.
+    __slots__ = ("offset", "latency", "rtt", "num_samples")
+
+    def __init__(self, offset, latency, rtt, num_samples):
+        self.offset = offset
+        self.latency = latency
+        self.rtt = rtt
+        self.num_samples = num_samples
+
+    def to_dict(self):
+        return {
+            "offset": self.offset,
+            "latency": self.latency,
+            "rtt": self.rtt,
+            "num_samples": self.num_samples,
+        }
+
+async def estimate_clock(context, num_samples=8):
+    samples = []
+    for i in range(num_samples):
+        sent, received, reply = await context.ping()
+        rtt = received - sent
+        offset = None
+        remote = reply.get("NetworkTimestamp")
+        # a node that just echoes our timestamp says nothing about its clock
+        if remote is not None and remote != int(sent * 1000):
+            offset = remote / 1000.0 - (sent + received) / 2
+        samples.append((rtt, offset))
+    rtt, offset = min(samples, key=lambda sample: sample[0])
+    return ClockEstimate(offset, rtt / 2, rtt, num_samples)
+
+def parse_capture_time(value):
+    # returns PhotoDateCaptured as seconds since the epoch, taking it to be in
+    # this machine's timezone, or None if it can't be read
+    if not value:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        pass
+    for fmt in CAPTURE_TIME_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            pass
+    return None
+
+def get_relative_times(times):
+    if not times:
+        return dict()
+    first = min(times.values())
+    return {camera: value - first for camera, value in times.items()}
+
+class ShootReport:
+    def __init__(self, photo_origin, target_time, cameras):
+        self.photo_origin = photo_origin
+        self.target_time = target_time
+        self.dispatch_times = dict()
+        self.replies = dict()
+        self.busy_times = dict()
+        self.photo_times = dict()
+        self.capture_times = dict()
+        self.cameras = list(cameras)
+
+    def is_complete(self):
+        return all(camera in self.photo_times for camera in self.cameras)
+
+    def get_skew(self):
+        # arrival skew: when each camera's busy (or photo) event arrived here,
+        # less the node's one-way latency. It measures the events, not the
+        # camera shutters, see get_capture_skew for those.
+        times = dict(self.busy_times)
+        for camera, photo_time in self.photo_times.items():
+            times.setdefault(camera, photo_time)
+        return get_relative_times(times)
+
+    def get_max_skew(self):
+        skew = self.get_skew()
+        if not skew:
+            return None
+        return max(skew.values())
+
+    def get_capture_skew(self):
+        # capture skew: the cameras' own PhotoDateCaptured, moved onto the
+        # local clock with each node's offset. Only as good as the cameras'
+        # clocks (see SyncClocks) and the precision of PhotoDateCaptured.
+        return get_relative_times(self.capture_times)
+
+    def get_max_capture_skew(self):
+        skew = self.get_capture_skew()
+        if not skew:
+            return None
+        return max(skew.values())
+
+    def to_dict(self):
+        skew = self.get_skew()
+        capture_skew = self.get_capture_skew()
+        cameras = []
+        for camera in self.cameras:
+            node, key = camera
+            cameras.append({
+                "node": node,
+                "CameraKey": key,
+                "busy_time": self.busy_times.get(camera),
+                "photo_time": self.photo_times.get(camera),
+                "arrival_skew": skew.get(camera),
+                "capture_time": self.capture_times.get(camera),
+                "capture_skew": capture_skew.get(camera),
+            })
+        return {
+            "PhotoOrigin": self.photo_origin,
+            "target_time": self.target_time,
+            "dispatch_times": dict(self.dispatch_times),
+            "max_arrival_skew": self.get_max_skew(),
+            "max_capture_skew": self.get_max_capture_skew(),
+            "cameras": cameras,
+        }
+
+class ShootScheduler:
+    # Fires Shoot on every node of a ClusterContext so that the requests
+    # arrive at the same moment, by sending to the nodes furthest away first.
+    # Dispatch is aligned by measured latency. Node clock offsets are used to
+    # put the cameras' PhotoDateCaptured onto the local clock for the report.
+    # Capture times are from time.time(), all other times are from
+    # time.perf_counter().
+    def __init__(self, cluster, num_samples=8):
+        self.__cluster = cluster
+        self.__num_samples = num_samples
+        self.__estimates = dict()
+
+    async def calibrate(self):
+        names = self.__cluster.get_node_names()
+        contexts = [self.__cluster.get_node_context(name) for name in names]
+        estimates = await asyncio.gather(*[estimate_clock(context, self.__num_samples) for context in contexts],
+                                         return_exceptions=True)
+        for name, estimate in zip(names, estimates):
+            if isinstance(estimate, ClockEstimate):
+                self.__estimates[name] = estimate
+        return self.get_estimates()
+
+    def get_estimates(self):
+        return {name: estimate.to_dict() for name, estimate in self.__estimates.items()}
+
+    def __get_latency(self, name):
+        estimate = self.__estimates.get(name)
+        if estimate is None:
+            return 0.0
+        return estimate.latency
+
+    def __get_offset(self, name):
+        estimate = self.__estimates.get(name)
+        if estimate is None:
+            return None
+        return estimate.offset
+
+    async def shoot(self, delay=0.5, bulb_timer=None, timeout=10.0):
+        if not self.__estimates:
+            await self.calibrate()
+        cluster = self.__cluster
+        selections = cluster.get_node_selections()
+        cameras = []
+        for name, selection in selections.items():
+            context = cluster.get_node_context(name)
+            cameras.extend((name, key) for key in context.get_selected_cameras(selection))
+        photo_origin = "api-" + uuid.uuid4().hex[:12]
+        report = ShootReport(photo_origin, time.perf_counter() + delay, cameras)
+        selected = frozenset(cameras)
+        done = asyncio.Event()
+
+        def on_camera_updated(name, event):
+            camera = (name, event.get("CameraKey"))
+            if camera in selected and camera not in report.busy_times and event.get("CameraStatus") == "Busy":
+                report.busy_times[camera] = time.perf_counter() - self.__get_latency(name)
+
+        def on_photo_updated(name, event):
+            camera = (name, event.get("CameraKey"))
+            if event.get("PhotoOrigin", photo_origin) != photo_origin:
+                return
+            if camera in selected and camera not in report.capture_times:
+                captured = parse_capture_time(event.get("PhotoDateCaptured"))
+                offset = self.__get_offset(name)
+                if captured is not None and offset is not None:
+                    report.capture_times[camera] = captured - offset
+            if camera in selected and camera not in report.photo_times:
+                report.photo_times[camera] = time.perf_counter() - self.__get_latency(name)
+                if report.is_complete():
+                    done.set()
+
+        cluster.add_event_handler("CameraUpdated", on_camera_updated)
+        cluster.add_event_handler("PhotoUpdated", on_photo_updated)
+        tasks = dict()
+        try:
+            order = sorted(selections, key=self.__get_latency, reverse=True)
+            for name in order:
+                dispatch_time = report.target_time - self.__get_latency(name)
+                remaining = dispatch_time - time.perf_counter()
+                if remaining > SPIN_TIME:
+                    await asyncio.sleep(remaining - SPIN_TIME)
+                while time.perf_counter() < dispatch_time:
+                    pass
+                context = cluster.get_node_context(name)
+                report.dispatch_times[name] = time.perf_counter()
+                # the request is sent in the task's first step, which runs on
+                # this yield, before waiting for the next node
+                tasks[name] = asyncio.ensure_future(context.shoot(bulb_timer, photo_origin, selections[name]))
+                await asyncio.sleep(0)
+            if tasks:
+                await asyncio.wait(tasks.values(), timeout=timeout)
+            for name, task in tasks.items():
+                if not task.done():
+                    task.cancel()
+                    report.replies[name] = asyncio.TimeoutError()
+                elif task.cancelled():
+                    report.replies[name] = asyncio.CancelledError()
+                else:
+                    report.replies[name] = task.exception() or task.result()
+            if cameras and not report.is_complete():
+                try:
+                    await asyncio.wait_for(done.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+            cluster.remove_event_handler("CameraUpdated", on_camera_updated)
+            cluster.remove_event_handler("PhotoUpdated", on_photo_updated)
+        return report
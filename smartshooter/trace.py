@@ -0,0 +1,181 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import json
+import time
+import threading
+
+class ShootTrace:
+    # Follows one Shoot request through to the photos arriving on disk.
+    # Each selected camera gets timestamps for the trigger being acknowledged,
+    # the camera going busy, the photo appearing and the photo being
+    # downloaded. Times are from time.time().
+    def __init__(self, seq_num, photo_origin, cameras, timeout=60.0):
+        self.__lock = threading.Lock()
+        self.__done = threading.Event()
+        self.__context = None
+        self.__seq_num = seq_num
+        self.__photo_origin = photo_origin
+        self.__request_time = time.time()
+        self.__deadline = self.__request_time + timeout
+        self.__ack_time = None
+        self.__result = None
+        self.__cameras = dict()
+        for key in cameras:
+            self.__cameras[key] = {"busy": None, "created": None, "downloaded": None, "PhotoKey": None}
+        self.__trace_id = os.urandom(16).hex()
+        self.__timer = None
+
+    def attach(self, context):
+        # handlers are added before the request is sent, so early events
+        # aren't missed, and removed by a timer at the deadline even if no
+        # more events arrive
+        self.__context = context
+        context.add_event_handler("CameraUpdated", self.__on_camera_updated)
+        context.add_event_handler("PhotoUpdated", self.__on_photo_updated)
+        self.__timer = threading.Timer(max(0, self.__deadline - time.time()), self.detach)
+        self.__timer.daemon = True
+        self.__timer.start()
+
+    def detach(self):
+        with self.__lock:
+            context = self.__context
+            self.__context = None
+            timer = self.__timer
+            self.__timer = None
+        if timer is not None:
+            timer.cancel()
+        if context is not None:
+            context.remove_event_handler("CameraUpdated", self.__on_camera_updated)
+            context.remove_event_handler("PhotoUpdated", self.__on_photo_updated)
+        self.__done.set()
+
+    def set_reply(self, reply):
+        # reply is None if the request was queued in a batch
+        if reply is not None:
+            with self.__lock:
+                self.__ack_time = time.time()
+                self.__result = reply.get("msg_result")
+        if self.__result is False or not self.__cameras:
+            self.detach()
+
+    def __on_camera_updated(self, event):
+        now = time.time()
+        with self.__lock:
+            camera = self.__cameras.get(event.get("CameraKey"))
+            if camera is not None and camera["busy"] is None and event.get("CameraStatus") == "Busy":
+                camera["busy"] = now
+        self.__check_finished(now)
+
+    def __on_photo_updated(self, event):
+        now = time.time()
+        with self.__lock:
+            camera = self.__cameras.get(event.get("CameraKey"))
+            if camera is not None and event.get("PhotoOrigin", self.__photo_origin) == self.__photo_origin:
+                if camera["PhotoKey"] is None:
+                    camera["PhotoKey"] = event.get("PhotoKey")
+                    camera["created"] = now
+                if camera["PhotoKey"] == event.get("PhotoKey") and camera["downloaded"] is None:
+                    if event.get("PhotoLocation") == "Local Disk":
+                        camera["downloaded"] = now
+        self.__check_finished(now)
+
+    def __check_finished(self, now):
+        if self.is_complete() or now > self.__deadline:
+            self.detach()
+
+    def is_complete(self):
+        with self.__lock:
+            return all(camera["downloaded"] is not None for camera in self.__cameras.values())
+
+    def wait(self, timeout=None):
+        # returns True once every camera's photo has been downloaded. Waits
+        # through the context, which reads events if there's no event thread.
+        if timeout is None:
+            timeout = max(0, self.__deadline - time.time())
+        with self.__lock:
+            context = self.__context
+        if context is not None:
+            context.wait_for(lambda: self.__done.is_set() or self.is_complete(), timeout)
+        if not self.__done.is_set() and time.time() > self.__deadline:
+            self.detach()
+        return self.is_complete()
+
+    def get_seq_num(self):
+        return self.__seq_num
+
+    def get_photo_origin(self):
+        return self.__photo_origin
+
+    def to_dict(self):
+        with self.__lock:
+            cameras = dict()
+            for key, camera in self.__cameras.items():
+                cameras[key] = dict(camera)
+            return {
+                "trace_id": self.__trace_id,
+                "msg_seq_num": self.__seq_num,
+                "PhotoOrigin": self.__photo_origin,
+                "msg_result": self.__result,
+                "request": self.__request_time,
+                "ack": self.__ack_time,
+                "cameras": cameras,
+            }
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    def to_spans(self):
+        # OpenTelemetry style spans: one for the Shoot request, one per camera
+        # beneath it, and the trigger/capture/download stages beneath those
+        trace = self.to_dict()
+        spans = []
+        def add_span(name, parent_id, start, end, attributes):
+            if start is None:
+                return None
+            span_id = os.urandom(8).hex()
+            spans.append({
+                "traceId": self.__trace_id,
+                "spanId": span_id,
+                "parentSpanId": parent_id,
+                "name": name,
+                "startTimeUnixNano": int(start * 1e9),
+                "endTimeUnixNano": int(end * 1e9) if end is not None else None,
+                "attributes": attributes,
+            })
+            return span_id
+        ends = [trace["ack"]]
+        for camera in trace["cameras"].values():
+            ends.extend([camera["busy"], camera["created"], camera["downloaded"]])
+        ends = [end for end in ends if end is not None]
+        root_id = add_span("Shoot", None, trace["request"], max(ends) if ends else None,
+                           {"msg_seq_num": trace["msg_seq_num"], "PhotoOrigin": trace["PhotoOrigin"],
+                            "msg_result": trace["msg_result"]})
+        for key, camera in trace["cameras"].items():
+            attributes = {"CameraKey": key, "PhotoKey": camera["PhotoKey"]}
+            camera_id = add_span("Camera", root_id, trace["request"], camera["downloaded"], attributes)
+            add_span("trigger", camera_id, trace["request"], trace["ack"], attributes)
+            add_span("capture", camera_id, camera["busy"] or trace["ack"], camera["created"], attributes)
+            add_span("download", camera_id, camera["created"], camera["downloaded"], attributes)
+        return spans
@@ -0,0 +1,323 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import math
+import time
+import threading
+from collections import defaultdict
+from .selection import PhotoSelection
+
+# the PhotoLocation that shows a request has finished with a photo
+TARGET_LOCATIONS = {
+    "Download": "Local Disk",
+    "Transfer": "Local Disk",
+    "Delete": "Deleted",
+}
+
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+FAILED = "failed"
+
+class PhotoTransfer:
+    __slots__ = ("key", "node", "camera", "size", "state", "attempts", "sent", "finished", "error")
+
+    def __init__(self, key, node, camera, size):
+        self.key = key
+        self.node = node
+        self.camera = camera
+        self.size = size
+        self.state = PENDING
+        self.attempts = 0
+        self.sent = None
+        self.finished = None
+        self.error = None
+
+class NodeThroughput:
+    __slots__ = ("num_in_flight", "num_done", "num_bytes", "first_sent")
+
+    def __init__(self):
+        self.num_in_flight = 0
+        self.num_done = 0
+        self.num_bytes = 0
+        self.first_sent = None
+
+    def get_rate(self, now):
+        # photos per second since the first request to this node
+        if not self.num_done or now <= self.first_sent:
+            return None
+        return self.num_done / (now - self.first_sent)
+
+class TransferReport:
+    def __init__(self, msg_id, transfers, start, end):
+        self.msg_id = msg_id
+        self.start = start
+        self.end = end
+        self.num_photos = len(transfers)
+        self.num_done = 0
+        self.num_skipped = 0
+        self.num_retries = 0
+        self.num_bytes = 0
+        self.failed = dict()
+        for transfer in transfers:
+            if transfer.attempts > 1:
+                self.num_retries += transfer.attempts - 1
+            if transfer.state is DONE:
+                if transfer.attempts:
+                    self.num_done += 1
+                    self.num_bytes += transfer.size
+                else:
+                    self.num_skipped += 1
+            elif transfer.state is FAILED:
+                self.failed[transfer.key] = transfer.error
+
+    def get_mb_per_sec(self):
+        elapsed = self.end - self.start
+        if elapsed <= 0:
+            return 0.0
+        return self.num_bytes / 1e6 / elapsed
+
+    def is_complete(self):
+        return self.num_done + self.num_skipped == self.num_photos
+
+    def to_dict(self):
+        return {
+            "msg_id": self.msg_id,
+            "num_photos": self.num_photos,
+            "num_done": self.num_done,
+            "num_skipped": self.num_skipped,
+            "num_failed": len(self.failed),
+            "num_retries": self.num_retries,
+            "num_bytes": self.num_bytes,
+            "elapsed": self.end - self.start,
+            "mb_per_sec": self.get_mb_per_sec(),
+            "failed": dict(self.failed),
+        }
+
+class TransferManager:
+    # Downloads, transfers or deletes a set of photos through a Context and
+    # follows each one through PhotoUpdated until its PhotoLocation shows it's
+    # done. Photos are sent in batches sized to give each node (NodeKey) about
+    # batch_time seconds of work at its measured rate, with no more than
+    # max_per_node photos in flight per node and max_per_camera per camera.
+    # Photos that fail or time out are sent again up to retries times.
+    # Times are from time.time().
+    def __init__(self, context, max_per_node=8, max_per_camera=2, batch_time=1.0,
+                 retries=2, timeout=60.0, progress=None):
+        self.__context = context
+        self.__max_per_node = max_per_node
+        self.__max_per_camera = max_per_camera
+        self.__batch_time = batch_time
+        self.__retries = retries
+        self.__timeout = timeout
+        self.__progress = progress
+        self.__changed = threading.Condition()
+        self.__num_changes = 0
+        self.__msg_id = None
+        self.__target = None
+        self.__start = None
+        self.__transfers = dict()
+        self.__nodes = defaultdict(NodeThroughput)
+        self.__cameras = defaultdict(int)
+
+    def download(self, keys):
+        return self.run("Download", keys)
+
+    def transfer(self, keys):
+        return self.run("Transfer", keys)
+
+    def delete(self, keys, delete_files=False):
+        return self.run("Delete", keys, DeleteFiles=delete_files)
+
+    def run(self, msg_id, keys, **fields):
+        # blocks until every photo is done or has failed, and returns a
+        # TransferReport
+        if msg_id not in TARGET_LOCATIONS:
+            raise ValueError("unsupported transfer request: {}".format(msg_id))
+        with self.__changed:
+            self.__msg_id = msg_id
+            self.__target = TARGET_LOCATIONS[msg_id]
+            self.__start = time.time()
+            self.__transfers = dict()
+            self.__nodes = defaultdict(NodeThroughput)
+            self.__cameras = defaultdict(int)
+            for key in keys:
+                self.__transfers[key] = self.__make_transfer(key)
+        context = self.__context
+        context.add_event_handler("PhotoUpdated", self.__on_photo_updated)
+        try:
+            while True:
+                now = time.time()
+                with self.__changed:
+                    self.__expire(now)
+                    batches = self.__next_batches(now)
+                    deadline = self.__next_deadline()
+                    seen = self.__num_changes
+                if not batches and deadline is None:
+                    break
+                for batch in batches:
+                    self.__send(batch, fields)
+                if self.__progress is not None:
+                    self.__progress(self.get_progress())
+                if deadline is not None:
+                    self.__wait(seen, max(0, deadline - time.time()))
+        finally:
+            context.remove_event_handler("PhotoUpdated", self.__on_photo_updated)
+        return self.get_report()
+
+    def get_report(self):
+        with self.__changed:
+            return TransferReport(self.__msg_id, list(self.__transfers.values()),
+                                  self.__start, time.time())
+
+    def get_progress(self):
+        return self.get_report().to_dict()
+
+    def __make_transfer(self, key):
+        # photos already where the request would put them are skipped
+        try:
+            info = self.__context.get_photo_info(key)
+        except KeyError:
+            return PhotoTransfer(key, None, None, 0)
+        transfer = PhotoTransfer(key, info.get("NodeKey"), info.get("CameraKey"), info.get("PhotoFilesize") or 0)
+        if self.__msg_id != "Transfer" and info.get("PhotoLocation") == self.__target:
+            transfer.state = DONE
+            transfer.finished = self.__start
+        return transfer
+
+    def __get_batch_size(self, node, now):
+        # enough photos to keep the node busy for batch_time seconds, starting
+        # with single photos until its rate is known
+        rate = node.get_rate(now)
+        if rate is None:
+            return 1
+        return max(1, int(math.ceil(rate * self.__batch_time)))
+
+    def __next_batches(self, now):
+        pending = defaultdict(list)
+        for transfer in self.__transfers.values():
+            if transfer.state is PENDING:
+                pending[transfer.node].append(transfer)
+        batches = []
+        for name, transfers in pending.items():
+            node = self.__nodes[name]
+            free = self.__max_per_node - node.num_in_flight
+            if free <= 0:
+                continue
+            batch_size = self.__get_batch_size(node, now)
+            batch = []
+            for transfer in transfers:
+                if free == 0:
+                    break
+                camera = transfer.camera
+                if camera is not None and self.__cameras[camera] >= self.__max_per_camera:
+                    continue
+                self.__begin(transfer, node, now)
+                batch.append(transfer)
+                free -= 1
+                if len(batch) == batch_size:
+                    batches.append(batch)
+                    batch = []
+            if batch:
+                batches.append(batch)
+        return batches
+
+    def __next_deadline(self):
+        deadline = None
+        for transfer in self.__transfers.values():
+            if transfer.state is IN_FLIGHT:
+                timeout = transfer.sent + self.__timeout
+                if deadline is None or timeout < deadline:
+                    deadline = timeout
+        return deadline
+
+    def __begin(self, transfer, node, now):
+        transfer.state = IN_FLIGHT
+        transfer.attempts += 1
+        transfer.sent = now
+        node.num_in_flight += 1
+        if node.first_sent is None:
+            node.first_sent = now
+        if transfer.camera is not None:
+            self.__cameras[transfer.camera] += 1
+
+    def __end(self, transfer, state, now):
+        transfer.state = state
+        transfer.finished = now
+        self.__nodes[transfer.node].num_in_flight -= 1
+        if transfer.camera is not None:
+            self.__cameras[transfer.camera] -= 1
+        self.__num_changes += 1
+        self.__changed.notify_all()
+
+    def __fail(self, transfer, error, now):
+        self.__end(transfer, FAILED, now)
+        transfer.error = error
+        if transfer.attempts <= self.__retries:
+            transfer.state = PENDING
+
+    def __expire(self, now):
+        for transfer in self.__transfers.values():
+            if transfer.state is IN_FLIGHT and now - transfer.sent >= self.__timeout:
+                self.__fail(transfer, "timed out", now)
+
+    def __send(self, batch, fields):
+        selection = PhotoSelection()
+        selection.select_photos([transfer.key for transfer in batch])
+        try:
+            reply = self.__context.request(self.__msg_id, selection, **fields)
+        except Exception as e:
+            error = e
+        else:
+            # reply is None if the request was queued in a batch
+            if reply is None or reply.get("msg_result", True):
+                return
+            error = "{} failed".format(self.__msg_id)
+        now = time.time()
+        with self.__changed:
+            for transfer in batch:
+                if transfer.state is IN_FLIGHT:
+                    self.__fail(transfer, error, now)
+
+    def __on_photo_updated(self, event):
+        now = time.time()
+        with self.__changed:
+            transfer = self.__transfers.get(event.get("PhotoKey"))
+            if transfer is None or transfer.state is not IN_FLIGHT:
+                return
+            if event.get("PhotoLocation") != self.__target:
+                return
+            transfer.size = event.get("PhotoFilesize") or transfer.size
+            node = self.__nodes[transfer.node]
+            node.num_done += 1
+            node.num_bytes += transfer.size
+            self.__end(transfer, DONE, now)
+
+    def __wait(self, seen, timeout):
+        def has_changed():
+            return self.__num_changes != seen
+        if self.__context.has_event_thread():
+            with self.__changed:
+                self.__changed.wait_for(has_changed, timeout)
+        else:
+            self.__context.wait_for(has_changed, timeout)
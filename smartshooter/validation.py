@@ -0,0 +1,146 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+from . import schema
+from .enums import CameraSelectionMode
+from .enums import PhotoSelectionMode
+from .selection import CameraSelection
+from .selection import PhotoSelection
+
+# Checks used by the validators generated into validators.py. They raise
+# ValidationError on the client instead of waiting for Smart Shooter to
+# reply with msg_result false.
+
+class ValidationError(ValueError):
+    pass
+
+def fail(name, value, expected):
+    raise ValidationError("{}: expected {}, got {!r}".format(name, expected, value))
+
+def check_int(name, value, low, high, expected):
+    if type(value) is not int or value < low or value > high:
+        fail(name, value, expected)
+
+def check_int32(name, value):
+    check_int(name, value, -(1 << 31), (1 << 31) - 1, "int32")
+
+def check_uint32(name, value):
+    check_int(name, value, 0, (1 << 32) - 1, "uint32")
+
+def check_int64(name, value):
+    check_int(name, value, -(1 << 63), (1 << 63) - 1, "int64")
+
+def check_uint64(name, value):
+    check_int(name, value, 0, (1 << 64) - 1, "uint64")
+
+def check_float(name, value):
+    if type(value) is not float and type(value) is not int:
+        fail(name, value, "float")
+
+def check_bool(name, value):
+    if type(value) is not bool:
+        fail(name, value, "boolean")
+
+def check_string(name, value):
+    if type(value) is not str:
+        fail(name, value, "string")
+
+def check_strings(name, value):
+    if not isinstance(value, (list, tuple)) or not all(type(item) is str for item in value):
+        fail(name, value, "string[]")
+
+def check_data(name, value):
+    if not isinstance(value, (str, bytes)):
+        fail(name, value, "data")
+
+def check_object(name, value):
+    if not isinstance(value, dict):
+        fail(name, value, "object")
+
+def check_ranged(name, value, valid):
+    # enums are sent by name, so check the name against the range
+    value = getattr(value, "_name_", value)
+    if value not in valid:
+        fail(name, value, "one of " + ", ".join(sorted(valid)))
+
+def check_camera_selection(selection):
+    if not isinstance(selection, CameraSelection):
+        fail("CameraSelection", selection, "CameraSelection")
+    mode = selection.get_mode()
+    if mode == CameraSelectionMode.Single:
+        check_string("CameraKey", selection.get_key())
+    elif mode == CameraSelectionMode.Multiple:
+        check_strings("CameraKeys", selection.get_keys())
+    elif mode == CameraSelectionMode.Group:
+        check_string("CameraGroup", selection.get_group())
+
+def check_photo_selection(selection):
+    if not isinstance(selection, PhotoSelection):
+        fail("PhotoSelection", selection, "PhotoSelection")
+    mode = selection.get_mode()
+    if mode == PhotoSelectionMode.Single:
+        check_string("PhotoKey", selection.get_key())
+    elif mode == PhotoSelectionMode.Multiple:
+        check_strings("PhotoKeys", selection.get_keys())
+
+type_checks = {
+    "int32": check_int32,
+    "uint32": check_uint32,
+    "int64": check_int64,
+    "uint64": check_uint64,
+    "float": check_float,
+    "boolean": check_bool,
+    "string": check_string,
+    "string[]": check_strings,
+    "data": check_data,
+}
+
+def check_fields(fields):
+    # for messages whose fields external_api.json doesn't describe
+    for name, value in fields.items():
+        if name in schema.FIELD_RANGES:
+            check_ranged(name, value, schema.FIELD_RANGES[name])
+        else:
+            type_checks.get(schema.FIELD_TYPES.get(name), check_object)(name, value)
+
+def check_property_value(prop, value, valid):
+    # valid is the camera's CameraPropertyRange, not known until synchronised
+    if valid and value not in valid:
+        fail(getattr(prop, "_name_", prop), value, "one of " + ", ".join(valid))
+
+class ValidatedMessages:
+    # Looks like the messages module, but every builder checks its fields
+    # before building the request.
+    def __init__(self, messages, validators):
+        for msg_id, build in messages.BUILDERS.items():
+            validate = validators.VALIDATORS[msg_id]
+            setattr(self, "build_" + msg_id, self.__wrap(build, validate))
+        self.BUILDERS = {msg_id: getattr(self, "build_" + msg_id) for msg_id in messages.BUILDERS}
+        self.REQUEST_FIELDS = messages.REQUEST_FIELDS
+
+    @staticmethod
+    def __wrap(build, validate):
+        def build_validated(seq_num, *args, **kwargs):
+            validate(*args, **kwargs)
+            return build(seq_num, *args, **kwargs)
+        return build_validated
@@ -0,0 +1,321 @@
+# Generated by utils/smartshooter-genschema.py from external_api.json, do not edit.
+
+from .validation import check_fields
+from .validation import check_ranged
+from .validation import check_camera_selection
+from .validation import check_photo_selection
+from .validation import check_object
+from .validation import check_bool
+from .validation import check_data
+from .validation import check_float
+from .validation import check_int32
+from .validation import check_int64
+from .validation import check_string
+from .validation import check_strings
+from .validation import check_uint32
+from .validation import check_uint64
+
+RANGE_CameraLiveviewFocusStep = frozenset(("Near1", "Near2", "Near3", "Far1", "Far2", "Far3"))
+RANGE_CameraPowerZoomDirection = frozenset(("Tele1", "Tele2", "Tele3", "Wide1", "Wide2", "Wide3"))
+RANGE_CameraPropertyType = frozenset(("Aperture", "ShutterSpeed", "ISO", "Exposure", "Quality", "ProgramMode", "MeteringMode", "FocusMode", "DriveMode", "WhiteBalance", "ColourTemperature", "Storage", "MirrorLockup", "PixelShiftMode", "ControlMode"))
+RANGE_CameraShutterButton = frozenset(("Off", "Half", "Full"))
+RANGE_DefaultControlMode = frozenset(("Camera", "App", "Both"))
+RANGE_DefaultFocusMode = frozenset(("Not set", "AF Single", "AF Continuous", "AF Auto", "MF"))
+RANGE_DefaultStorage = frozenset(("Disk", "Card", "Both"))
+
+def validate_NetworkPing(**fields):
+    check_fields(fields)
+
+def validate_SetOptions(FilenameExpression=None, PhotoSessionName=None, PhotoSessionNum=None, UniqueTag=None, Barcode=None, DefaultStorage=None, DefaultControlMode=None, DefaultFocusMode=None, DefaultLiveviewFPS=None, DefaultVideoFPS=None, AutoConnect=None, AutoSynchroniseTime=None, AutoScanBarcode=None, FilterBarcodeScanning=None, BarcodeCameraFilter=None, ResetSequenceNumOnEdit=None, ResetBatchNumOnEdit=None, DownloadPath=None, FallbackPath=None, AllowSpacesInFilename=None):
+    if FilenameExpression is not None:
+        check_string("FilenameExpression", FilenameExpression)
+    if PhotoSessionName is not None:
+        check_string("PhotoSessionName", PhotoSessionName)
+    if PhotoSessionNum is not None:
+        check_int32("PhotoSessionNum", PhotoSessionNum)
+    if UniqueTag is not None:
+        check_string("UniqueTag", UniqueTag)
+    if Barcode is not None:
+        check_string("Barcode", Barcode)
+    if DefaultStorage is not None:
+        check_ranged("DefaultStorage", DefaultStorage, RANGE_DefaultStorage)
+    if DefaultControlMode is not None:
+        check_ranged("DefaultControlMode", DefaultControlMode, RANGE_DefaultControlMode)
+    if DefaultFocusMode is not None:
+        check_ranged("DefaultFocusMode", DefaultFocusMode, RANGE_DefaultFocusMode)
+    if DefaultLiveviewFPS is not None:
+        check_int32("DefaultLiveviewFPS", DefaultLiveviewFPS)
+    if DefaultVideoFPS is not None:
+        check_int32("DefaultVideoFPS", DefaultVideoFPS)
+    if AutoConnect is not None:
+        check_bool("AutoConnect", AutoConnect)
+    if AutoSynchroniseTime is not None:
+        check_bool("AutoSynchroniseTime", AutoSynchroniseTime)
+    if AutoScanBarcode is not None:
+        check_bool("AutoScanBarcode", AutoScanBarcode)
+    if FilterBarcodeScanning is not None:
+        check_object("FilterBarcodeScanning", FilterBarcodeScanning)
+    if BarcodeCameraFilter is not None:
+        check_object("BarcodeCameraFilter", BarcodeCameraFilter)
+    if ResetSequenceNumOnEdit is not None:
+        check_object("ResetSequenceNumOnEdit", ResetSequenceNumOnEdit)
+    if ResetBatchNumOnEdit is not None:
+        check_object("ResetBatchNumOnEdit", ResetBatchNumOnEdit)
+    if DownloadPath is not None:
+        check_string("DownloadPath", DownloadPath)
+    if FallbackPath is not None:
+        check_string("FallbackPath", FallbackPath)
+    if AllowSpacesInFilename is not None:
+        check_bool("AllowSpacesInFilename", AllowSpacesInFilename)
+
+def validate_SetSequenceNum(PhotoSequenceNum=None):
+    if PhotoSequenceNum is not None:
+        check_int32("PhotoSequenceNum", PhotoSequenceNum)
+
+def validate_SetBatchNum(PhotoBatchNum=None):
+    if PhotoBatchNum is not None:
+        check_int32("PhotoBatchNum", PhotoBatchNum)
+
+def validate_RenameCamera(selection, CameraName=None):
+    check_camera_selection(selection)
+    if CameraName is not None:
+        check_string("CameraName", CameraName)
+
+def validate_RenameNode(**fields):
+    check_fields(fields)
+
+def validate_RenamePhoto(selection, PhotoComputedName=None):
+    check_photo_selection(selection)
+    if PhotoComputedName is not None:
+        check_string("PhotoComputedName", PhotoComputedName)
+
+def validate_DetectCameras():
+    pass
+
+def validate_Connect(selection):
+    check_camera_selection(selection)
+
+def validate_Disconnect(selection):
+    check_camera_selection(selection)
+
+def validate_Shoot(selection, BulbTimer=None, PhotoOrigin=None):
+    check_camera_selection(selection)
+    if BulbTimer is not None:
+        check_int64("BulbTimer", BulbTimer)
+    if PhotoOrigin is not None:
+        check_string("PhotoOrigin", PhotoOrigin)
+
+def validate_Autofocus(selection):
+    check_camera_selection(selection)
+
+def validate_Identify(selection):
+    check_camera_selection(selection)
+
+def validate_LiveviewFocus(selection, CameraLiveviewFocusStep=None):
+    check_camera_selection(selection)
+    if CameraLiveviewFocusStep is not None:
+        check_ranged("CameraLiveviewFocusStep", CameraLiveviewFocusStep, RANGE_CameraLiveviewFocusStep)
+
+def validate_LiveviewPosition(selection, CameraLiveviewPositionX=None, CameraLiveviewPositionY=None):
+    check_camera_selection(selection)
+    if CameraLiveviewPositionX is not None:
+        check_object("CameraLiveviewPositionX", CameraLiveviewPositionX)
+    if CameraLiveviewPositionY is not None:
+        check_object("CameraLiveviewPositionY", CameraLiveviewPositionY)
+
+def validate_EnableLiveview(selection, Enable=None):
+    check_camera_selection(selection)
+    if Enable is not None:
+        check_bool("Enable", Enable)
+
+def validate_EnableLiveviewZoom(selection, Enable=None):
+    check_camera_selection(selection)
+    if Enable is not None:
+        check_bool("Enable", Enable)
+
+def validate_EnableLiveviewDOF(selection, Enable=None):
+    check_camera_selection(selection)
+    if Enable is not None:
+        check_bool("Enable", Enable)
+
+def validate_EnableVideo(selection, Enable=None):
+    check_camera_selection(selection)
+    if Enable is not None:
+        check_bool("Enable", Enable)
+
+def validate_SetProperty(selection, CameraPropertyType=None, CameraPropertyValue=None):
+    check_camera_selection(selection)
+    if CameraPropertyType is not None:
+        check_ranged("CameraPropertyType", CameraPropertyType, RANGE_CameraPropertyType)
+    if CameraPropertyValue is not None:
+        check_string("CameraPropertyValue", CameraPropertyValue)
+
+def validate_IncrementProperty(selection, CameraPropertyType=None, CameraPropertyStep=None):
+    check_camera_selection(selection)
+    if CameraPropertyType is not None:
+        check_ranged("CameraPropertyType", CameraPropertyType, RANGE_CameraPropertyType)
+    if CameraPropertyStep is not None:
+        check_int32("CameraPropertyStep", CameraPropertyStep)
+
+def validate_Download(selection):
+    check_photo_selection(selection)
+
+def validate_Transfer(selection):
+    check_photo_selection(selection)
+
+def validate_Reshoot(selection):
+    check_photo_selection(selection)
+
+def validate_Delete(selection, DeleteFiles=None):
+    check_photo_selection(selection)
+    if DeleteFiles is not None:
+        check_bool("DeleteFiles", DeleteFiles)
+
+def validate_Format():
+    pass
+
+def validate_SyncClocks(CameraDateTimeOffset=None):
+    if CameraDateTimeOffset is not None:
+        check_int64("CameraDateTimeOffset", CameraDateTimeOffset)
+
+def validate_CheckClocks():
+    pass
+
+def validate_Synchronise():
+    pass
+
+def validate_GetCamera(selection):
+    check_camera_selection(selection)
+
+def validate_TransferPhoto(**fields):
+    check_fields(fields)
+
+def validate_License(**fields):
+    check_fields(fields)
+
+def validate_LiveviewFPS(selection, CameraLiveviewFPS=None, CameraLiveviewVideoFPS=None):
+    check_camera_selection(selection)
+    if CameraLiveviewFPS is not None:
+        check_int32("CameraLiveviewFPS", CameraLiveviewFPS)
+    if CameraLiveviewVideoFPS is not None:
+        check_int32("CameraLiveviewVideoFPS", CameraLiveviewVideoFPS)
+
+def validate_SetShutterButton(selection, CameraShutterButton=None):
+    check_camera_selection(selection)
+    if CameraShutterButton is not None:
+        check_ranged("CameraShutterButton", CameraShutterButton, RANGE_CameraShutterButton)
+
+def validate_RemoveNode(**fields):
+    check_fields(fields)
+
+def validate_SyncBatchNum():
+    pass
+
+def validate_SetCameraGroup(selection, CameraGroup=None):
+    check_camera_selection(selection)
+    if CameraGroup is not None:
+        check_string("CameraGroup", CameraGroup)
+
+def validate_SetCameraTriggerIndex(selection, CameraTriggerIndex=None):
+    check_camera_selection(selection)
+    if CameraTriggerIndex is not None:
+        check_string("CameraTriggerIndex", CameraTriggerIndex)
+
+def validate_ActivateLicense(ActivationCode=None):
+    if ActivationCode is not None:
+        check_string("ActivationCode", ActivationCode)
+
+def validate_DeactivateLicense(**fields):
+    check_fields(fields)
+
+def validate_Shutdown(**fields):
+    check_fields(fields)
+
+def validate_PowerZoomPosition(selection, CameraPowerZoomPosition=None):
+    check_camera_selection(selection)
+    if CameraPowerZoomPosition is not None:
+        check_int32("CameraPowerZoomPosition", CameraPowerZoomPosition)
+
+def validate_PowerZoomDirection(selection, CameraPowerZoomDirection=None):
+    check_camera_selection(selection)
+    if CameraPowerZoomDirection is not None:
+        check_ranged("CameraPowerZoomDirection", CameraPowerZoomDirection, RANGE_CameraPowerZoomDirection)
+
+def validate_PowerZoomStop(selection):
+    check_camera_selection(selection)
+
+def validate_EngageLatch(selection, CameraLatchIndex=None):
+    check_camera_selection(selection)
+    if CameraLatchIndex is not None:
+        check_int32("CameraLatchIndex", CameraLatchIndex)
+
+def validate_ReleaseLatch(CameraLatchIndex=None):
+    if CameraLatchIndex is not None:
+        check_int32("CameraLatchIndex", CameraLatchIndex)
+
+def validate_CancelLatch(CameraLatchIndex=None):
+    if CameraLatchIndex is not None:
+        check_int32("CameraLatchIndex", CameraLatchIndex)
+
+def validate_EngageTrigger(selection):
+    check_camera_selection(selection)
+
+def validate_ReleaseTrigger(CameraTriggerInterval=None):
+    if CameraTriggerInterval is not None:
+        check_int32("CameraTriggerInterval", CameraTriggerInterval)
+
+def validate_CancelTrigger():
+    pass
+
+VALIDATORS = {
+    "NetworkPing": validate_NetworkPing,
+    "SetOptions": validate_SetOptions,
+    "SetSequenceNum": validate_SetSequenceNum,
+    "SetBatchNum": validate_SetBatchNum,
+    "RenameCamera": validate_RenameCamera,
+    "RenameNode": validate_RenameNode,
+    "RenamePhoto": validate_RenamePhoto,
+    "DetectCameras": validate_DetectCameras,
+    "Connect": validate_Connect,
+    "Disconnect": validate_Disconnect,
+    "Shoot": validate_Shoot,
+    "Autofocus": validate_Autofocus,
+    "Identify": validate_Identify,
+    "LiveviewFocus": validate_LiveviewFocus,
+    "LiveviewPosition": validate_LiveviewPosition,
+    "EnableLiveview": validate_EnableLiveview,
+    "EnableLiveviewZoom": validate_EnableLiveviewZoom,
+    "EnableLiveviewDOF": validate_EnableLiveviewDOF,
+    "EnableVideo": validate_EnableVideo,
+    "SetProperty": validate_SetProperty,
+    "IncrementProperty": validate_IncrementProperty,
+    "Download": validate_Download,
+    "Transfer": validate_Transfer,
+    "Reshoot": validate_Reshoot,
+    "Delete": validate_Delete,
+    "Format": validate_Format,
+    "SyncClocks": validate_SyncClocks,
+    "CheckClocks": validate_CheckClocks,
+    "Synchronise": validate_Synchronise,
+    "GetCamera": validate_GetCamera,
+    "TransferPhoto": validate_TransferPhoto,
+    "License": validate_License,
+    "LiveviewFPS": validate_LiveviewFPS,
+    "SetShutterButton": validate_SetShutterButton,
+    "RemoveNode": validate_RemoveNode,
+    "SyncBatchNum": validate_SyncBatchNum,
+    "SetCameraGroup": validate_SetCameraGroup,
+    "SetCameraTriggerIndex": validate_SetCameraTriggerIndex,
+    "ActivateLicense": validate_ActivateLicense,
+    "DeactivateLicense": validate_DeactivateLicense,
+    "Shutdown": validate_Shutdown,
+    "PowerZoomPosition": validate_PowerZoomPosition,
+    "PowerZoomDirection": validate_PowerZoomDirection,
+    "PowerZoomStop": validate_PowerZoomStop,
+    "EngageLatch": validate_EngageLatch,
+    "ReleaseLatch": validate_ReleaseLatch,
+    "CancelLatch": validate_CancelLatch,
+    "EngageTrigger": validate_EngageTrigger,
+    "ReleaseTrigger": validate_ReleaseTrigger,
+    "CancelTrigger": validate_CancelTrigger,
+}
@@ -0,0 +1,73 @@
+#
+# Copyright (c) 2019-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from smartshooter.statetracker import StateTracker
+from smartshooter.selection import CameraSelection
+from smartshooter.enums import Property
+
+def camera_updated(seq_num, key="cam1", **fields):
+    msg = {"msg_type": "Event", "msg_id": "CameraUpdated", "msg_seq_num": seq_num, "CameraKey": key}
+    msg.update(fields)
+    return msg
+
+def iso_info(value):
+    return [{"CameraPropertyType": "ISO", "CameraPropertyValue": value}]
+
+class TestCameraUpdated(unittest.TestCase):
+    def test_header_only_change_is_not_a_change(self):
+        tracker = StateTracker()
+        self.assertTrue(tracker.process_event(camera_updated(1, CameraStatus="Ready")))
+        self.assertFalse(tracker.process_event(camera_updated(2, CameraStatus="Ready")))
+        self.assertEqual(tracker.get_camera_info("cam1")["msg_seq_num"], 2)
+        self.assertTrue(tracker.process_event(camera_updated(3, CameraStatus="Busy")))
+
+class TestActiveCamera(unittest.TestCase):
+    def setUp(self):
+        self.tracker = StateTracker()
+        self.tracker.process_event(camera_updated(1, "cam1", CameraStatus="Ready", CameraGroup="A",
+                                                  CameraPropertyInfo=iso_info("100")))
+        self.tracker.process_event(camera_updated(2, "cam2", CameraStatus="Ready", CameraGroup="A",
+                                                  CameraPropertyInfo=iso_info("200")))
+
+    def test_busy_camera_stays_active(self):
+        selection = CameraSelection()
+        group = CameraSelection()
+        group.select_camera_group("A")
+        self.tracker.process_event(camera_updated(3, "cam1", CameraStatus="Busy"))
+        self.tracker.process_event(camera_updated(4, "cam1", CameraStatus="Ready"))
+        self.assertEqual(self.tracker.get_property(selection, Property.ISO), "100")
+        self.assertEqual(self.tracker.get_property(group, Property.ISO), "100")
+
+    def test_disconnected_camera_is_skipped(self):
+        selection = CameraSelection()
+        self.tracker.process_event(camera_updated(3, "cam1", CameraStatus="Disconnected"))
+        self.assertEqual(self.tracker.get_property(selection, Property.ISO), "200")
+
+if __name__ == "__main__":
+    unittest.main()
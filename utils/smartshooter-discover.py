@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2015-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from smartshooter.discovery import Discovery
+from smartshooter.discovery import DEFAULT_DISCOVERY_PORT
+
+def main():
+    parser = argparse.ArgumentParser("smartshooter-discover.py")
+    parser.add_argument("-u", "--udp-port",
+                        type=int,
+                        default=DEFAULT_DISCOVERY_PORT,
+                        metavar="PORT",
+                        help="specify UDP port for NetworkDiscovery messages (0 to disable)")
+    parser.add_argument("-p", "--publisher",
+                        action="append",
+                        default=[],
+                        metavar="ENDPOINT",
+                        help="also listen for NetworkPing messages from this publisher (can be given multiple times)")
+    parser.add_argument("-t", "--time",
+                        type=float,
+                        default=5.0,
+                        metavar="SECS",
+                        help="how long to listen for before listing nodes")
+    args = parser.parse_args()
+
+    with Discovery(args.udp_port, args.publisher) as discovery:
+        time.sleep(args.time)
+        nodes = discovery.get_nodes()
+
+    nodes.sort(key=lambda node: (node["rtt"] is None, node["rtt"]))
+    for node in nodes:
+        rtt = "-"
+        if node["rtt"] is not None:
+            rtt = "{:.1f}ms".format(node["rtt"] * 1000)
+        print("{}, {}, {}, {}".format(node["NetworkAddress"],
+                                      node["reqrep"],
+                                      node["publisher"],
+                                      rtt))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2015-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import json
+import argparse
+
+selection_fields = {
+    "[CAMERA SELECTION FIELDS]": ["CameraSelection", "CameraKey", "CameraKeys", "CameraGroup"],
+    "[PHOTO SELECTION FIELDS]": ["PhotoSelection", "PhotoKey", "PhotoKeys"],
+}
+
+header_fields = ["msg_type", "msg_id", "msg_seq_num"]
+
+def load_api(path):
+    with open(path) as f:
+        api = json.load(f)
+    return api["messages"], {field["name"]: field for field in api["fields"]}
+
+def expand_fields(fields, names):
+    expanded = []
+    for name in names:
+        if name in selection_fields:
+            subfields = selection_fields[name]
+        elif name.startswith("[") and name.endswith(" FIELDS]"):
+            subfields = expand_fields(fields, fields[name[1:-8]]["fields"])
+        else:
+            subfields = [name[:-2] if name.endswith("[]") else name]
+        for subfield in subfields:
+            if subfield not in expanded:
+                expanded.append(subfield)
+    return expanded
+
+def format_tuple(name, values):
+    lines = ["{} = (".format(name)]
+    for value in values:
+        lines.append("    {},".format(json.dumps(value)))
+    lines.append(")")
+    return "\n".join(lines)
+
+def format_dict(name, items):
+    lines = ["{} = {{".format(name)]
+    for key, value in items:
+        if isinstance(value, list):
+            value = "(" + ", ".join(json.dumps(v) for v in value) + ("," if len(value) == 1 else "") + ")"
+        else:
+            value = json.dumps(value)
+        lines.append("    {}: {},".format(json.dumps(key), value))
+    lines.append("}")
+    return "\n".join(lines)
+
+def generate(fields):
+    ranged_fields = sorted(name for name, field in fields.items()
+                           if field["type"] == "string" and "range" in field)
+    sections = [
+        "# Generated by utils/smartshooter-genschema.py from external_api.json, do not edit.",
+        format_tuple("HEADER_FIELDS", header_fields),
+        # the header changes with every message, so records keep it out of
+        # their slots where it would count as a field change
+        format_tuple("CAMERA_INFO_FIELDS", expand_fields(fields, fields["CameraInfo"]["fields"])),
+        format_tuple("CAMERA_PROPERTY_INFO_FIELDS", expand_fields(fields, fields["CameraPropertyInfo"]["fields"])),
+        format_tuple("PHOTO_INFO_FIELDS", expand_fields(fields, fields["PhotoInfo"]["fields"])),
+        format_tuple("CAMERA_PROPERTY_TYPES", fields["CameraPropertyType"]["range"]),
+        format_tuple("RANGED_FIELDS", ranged_fields),
+        format_dict("FIELD_TYPES", sorted((name, field["type"]) for name, field in fields.items()
+                                          if field["type"] != "object")),
+        format_dict("FIELD_RANGES", sorted((name, field["range"]) for name, field in fields.items()
+                                           if "range" in field)),
+    ]
+    return "\n\n".join(sections) + "\n"
+
+encoders = {
+    "string": "encode_string",
+    "data": "encode_string",
+    "string[]": "encode_strings",
+    "int32": "encode_int",
+    "uint32": "encode_int",
+    "int64": "encode_int",
+    "uint64": "encode_int",
+    "float": "encode_float",
+    "boolean": "encode_bool",
+}
+
+def resolve_field(fields, name):
+    # a few names in external_api.json have stray spaces
+    if name not in fields and name.replace(" ", "") in fields:
+        return name.replace(" ", "")
+    return name
+
+def generate_builder(msg_id, fields):
+    definition = fields.get(msg_id)
+    header = '{{"msg_type":"Request","msg_id":"{}","msg_seq_num":'.format(msg_id)
+    if definition is None or "request_fields" not in definition:
+        return "\n".join([
+            "def build_{}(seq_num, **fields):".format(msg_id),
+            "    return '{}' + str(seq_num) + encode_fields(fields) + \"}}\"".format(header),
+        ])
+    names = definition["request_fields"]
+    params = ["seq_num"]
+    lines = ["    msg = '{}' + str(seq_num)".format(header)]
+    if "[CAMERA SELECTION FIELDS]" in names:
+        params.append("selection")
+        lines[0] += " + encode_camera_selection(selection)"
+    elif "[PHOTO SELECTION FIELDS]" in names:
+        params.append("selection")
+        lines[0] += " + encode_photo_selection(selection)"
+    for name in expand_fields(fields, [name for name in names if name not in selection_fields]):
+        name = resolve_field(fields, name)
+        field_type = fields[name]["type"] if name in fields else "object"
+        params.append("{}=None".format(name))
+        lines.append("    if {} is not None:".format(name))
+        lines.append("        msg += ',\"{}\":' + {}({})".format(name, encoders.get(field_type, "encode_value"), name))
+    lines.append("    return msg + \"}\"")
+    return "\n".join(["def build_{}({}):".format(msg_id, ", ".join(params))] + lines)
+
+checks = {
+    "string": "check_string",
+    "data": "check_data",
+    "string[]": "check_strings",
+    "int32": "check_int32",
+    "uint32": "check_uint32",
+    "int64": "check_int64",
+    "uint64": "check_uint64",
+    "float": "check_float",
+    "boolean": "check_bool",
+}
+
+def generate_validator(msg_id, fields, ranges_used):
+    definition = fields.get(msg_id)
+    if definition is None or "request_fields" not in definition:
+        return "\n".join([
+            "def validate_{}(**fields):".format(msg_id),
+            "    check_fields(fields)",
+        ])
+    names = definition["request_fields"]
+    params = []
+    lines = []
+    if "[CAMERA SELECTION FIELDS]" in names:
+        params.append("selection")
+        lines.append("    check_camera_selection(selection)")
+    elif "[PHOTO SELECTION FIELDS]" in names:
+        params.append("selection")
+        lines.append("    check_photo_selection(selection)")
+    for name in expand_fields(fields, [name for name in names if name not in selection_fields]):
+        name = resolve_field(fields, name)
+        field = fields.get(name, {"type": "object"})
+        params.append("{}=None".format(name))
+        lines.append("    if {} is not None:".format(name))
+        if "range" in field:
+            ranges_used.add(name)
+            lines.append("        check_ranged(\"{0}\", {0}, RANGE_{0})".format(name))
+        else:
+            lines.append("        {}(\"{}\", {})".format(checks.get(field["type"], "check_object"), name, name))
+    if not lines:
+        lines.append("    pass")
+    return "\n".join(["def validate_{}({}):".format(msg_id, ", ".join(params))] + lines)
+
+def generate_validators(messages, fields):
+    requests = [msg["msg_id"] for msg in messages if msg["msg_type"] == "request"]
+    ranges_used = set()
+    validators = [generate_validator(msg_id, fields, ranges_used) for msg_id in requests]
+    imports = ["check_fields", "check_ranged", "check_camera_selection", "check_photo_selection", "check_object"]
+    imports.extend(sorted(set(checks.values())))
+    sections = [
+        "# Generated by utils/smartshooter-genschema.py from external_api.json, do not edit.",
+        "\n".join("from .validation import {}".format(name) for name in imports),
+        "\n".join("RANGE_{} = frozenset({})".format(name, json.dumps(fields[name]["range"]).replace("[", "(").replace("]", ")"))
+                  for name in sorted(ranges_used)),
+    ]
+    sections.extend(validators)
+    entries = ["    {}: validate_{},".format(json.dumps(msg_id), msg_id) for msg_id in requests]
+    sections.append("\n".join(["VALIDATORS = {"] + entries + ["}"]))
+    return "\n\n".join(sections) + "\n"
+
+def generate_messages(messages, fields):
+    requests = [msg["msg_id"] for msg in messages if msg["msg_type"] == "request"]
+    decoded = []
+    for msg in messages:
+        definition = fields.get(msg["msg_id"], {})
+        if msg["msg_type"] == "event" or "response_fields" in definition:
+            decoded.append(msg["msg_id"])
+    request_fields = []
+    for msg_id in requests:
+        names = fields.get(msg_id, {}).get("request_fields", [])
+        request_fields.append((msg_id, [resolve_field(fields, name) for name in expand_fields(fields, names)]))
+    sections = [
+        "# Generated by utils/smartshooter-genschema.py from external_api.json, do not edit.",
+        "\n".join([
+            "from .templates import encode_string",
+            "from .templates import encode_strings",
+            "from .templates import encode_int",
+            "from .templates import encode_float",
+            "from .templates import encode_bool",
+            "from .templates import encode_value",
+            "from .templates import encode_camera_selection",
+            "from .templates import encode_photo_selection",
+            "from .templates import encode_fields",
+            "from .templates import decode_message",
+        ]),
+        format_dict("REQUEST_FIELDS", request_fields),
+    ]
+    sections.extend(generate_builder(msg_id, fields) for msg_id in requests)
+    for msg_id in decoded:
+        sections.append("\n".join([
+            "def decode_{}(data):".format(msg_id),
+            "    return decode_message(data, \"{}\")".format(msg_id),
+        ]))
+    builders = ["    {}: build_{},".format(json.dumps(msg_id), msg_id) for msg_id in requests]
+    sections.append("\n".join(["BUILDERS = {"] + builders + ["}"]))
+    decoders = ["    {}: decode_{},".format(json.dumps(msg_id), msg_id) for msg_id in decoded]
+    sections.append("\n".join(["DECODERS = {"] + decoders + ["}"]))
+    return "\n\n".join(sections) + "\n"
+
+def main():
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    parser = argparse.ArgumentParser("smartshooter-genschema.py")
+    parser.add_argument("-i", "--input",
+                        default=os.path.join(root, "external_api.json"),
+                        metavar="FILE",
+                        help="specify path of the External API definition")
+    parser.add_argument("-o", "--output",
+                        default=os.path.join(root, "smartshooter", "schema.py"),
+                        metavar="FILE",
+                        help="specify path of the generated python module")
+    parser.add_argument("-m", "--messages",
+                        default=os.path.join(root, "smartshooter", "messages.py"),
+                        metavar="FILE",
+                        help="specify path of the generated message builders")
+    parser.add_argument("-v", "--validators",
+                        default=os.path.join(root, "smartshooter", "validators.py"),
+                        metavar="FILE",
+                        help="specify path of the generated message validators")
+    args = parser.parse_args()
+
+    messages, fields = load_api(args.input)
+    with open(args.output, "w") as f:
+        f.write(generate(fields))
+    with open(args.messages, "w") as f:
+        f.write(generate_messages(messages, fields))
+    with open(args.validators, "w") as f:
+        f.write(generate_validators(messages, fields))
+
+if __name__ == "__main__":
+    main()
@@ -22,11 +22,16 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
-import json
+import os
+import sys
 import datetime
 import argparse
 import zmq
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from smartshooter.codec import peek_field
+
 def main():
     parser = argparse.ArgumentParser("smartshooter-listen.py")
     parser.add_argument("-q", "--quiet",
@@ -37,6 +42,10 @@ def main():
                         action="store_true",
                         default=False,
                         help="filter out ping messages")
+    parser.add_argument("-f", "--filter",
+                        action="append",
+                        metavar="MSG_ID",
+                        help="only show messages with this msg_id (can be given multiple times)")
     parser.add_argument("-p", "--publisher",
                         default="tcp://127.0.0.1:54543",
                         metavar="ENDPOINT",
@@ -51,13 +60,15 @@ def main():
 
     while (True):
         raw = sub_socket.recv()
-        str_msg = raw.decode("utf-8")
-        json_msg = json.loads(str_msg)
-        if args.nopings and json_msg["msg_id"] == "NetworkPing":
+        # only the msg_id is needed, so avoid decoding the whole JSON message
+        msg_id = peek_field(raw, "msg_id")
+        if args.nopings and msg_id == "NetworkPing":
+            continue
+        if args.filter and msg_id not in args.filter:
             continue
-        print("{0}: {1}".format(datetime.datetime.now(), json_msg["msg_id"]))
+        print("{0}: {1}".format(datetime.datetime.now(), msg_id))
         if not args.quiet:
-            print(str_msg)
+            print(raw.decode("utf-8"))
 
 if __name__ == "__main__":
     main()
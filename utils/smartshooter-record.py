@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2015-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from smartshooter.recording import record
+
+def main():
+    parser = argparse.ArgumentParser("smartshooter-record.py")
+    parser.add_argument("-p", "--publisher",
+                        default="tcp://127.0.0.1:54543",
+                        metavar="ENDPOINT",
+                        help="specify ZMQ address of Smart Shooter publisher")
+    parser.add_argument("-c", "--compression",
+                        choices=["zlib", "zstd"],
+                        help="compress recorded blocks")
+    parser.add_argument("-d", "--duration",
+                        type=float,
+                        metavar="SECS",
+                        help="stop recording after this many seconds")
+    parser.add_argument("output",
+                        metavar="FILE",
+                        help="recording to write, appended to if it already exists")
+    args = parser.parse_args()
+
+    try:
+        num_frames = record(args.output, args.publisher, args.compression, args.duration)
+    except KeyboardInterrupt:
+        return
+    print("{}: {} messages recorded".format(args.output, num_frames))
+
+if __name__ == "__main__":
+    main()
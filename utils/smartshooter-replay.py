@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2015-2026, Kuvacode Oy. All rights reserved.
+#
+# The MIT License (MIT)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from smartshooter.recording import Recording
+from smartshooter.recording import replay_to_publisher
+from smartshooter.recording import replay_to_tracker
+
+def main():
+    parser = argparse.ArgumentParser("smartshooter-replay.py")
+    parser.add_argument("-p", "--publisher",
+                        default="tcp://127.0.0.1:54543",
+                        metavar="ENDPOINT",
+                        help="specify ZMQ address to publish the recording on")
+    parser.add_argument("-s", "--speed",
+                        type=float,
+                        default=1.0,
+                        help="playback speed, 0 for as fast as possible")
+    parser.add_argument("-f", "--filter",
+                        action="append",
+                        metavar="MSG_ID",
+                        help="only replay messages with this msg_id (can be given multiple times)")
+    parser.add_argument("-t", "--tracker",
+                        action="store_true",
+                        default=False,
+                        help="replay into a state tracker instead of publishing, and report the rate")
+    parser.add_argument("input",
+                        metavar="FILE",
+                        help="recording to play back")
+    args = parser.parse_args()
+
+    recording = Recording(args.input)
+    first, last = recording.get_time_range()
+    counts = recording.get_msg_id_counts()
+    print("{}: {} messages over {:.1f} seconds".format(args.input, sum(counts.values()), (last or 0) - (first or 0)))
+    if args.tracker:
+        start = time.perf_counter()
+        tracker = replay_to_tracker(recording, speed=args.speed)
+        elapsed = time.perf_counter() - start
+        num_events = sum(counts.get(msg_id, 0) for msg_id in tracker.get_event_ids())
+        print("{} events in {:.3f} seconds, {:.0f} events/sec, {} cameras, {} photos".format(
+            num_events, elapsed, num_events / max(elapsed, 1e-9),
+            len(tracker.get_camera_list()), len(tracker.get_photo_list())))
+    else:
+        num_frames = replay_to_publisher(recording, args.publisher, args.speed, args.filter)
+        print("{} messages published".format(num_frames))
+
+if __name__ == "__main__":
+    main()